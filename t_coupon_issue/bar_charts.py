@@ -0,0 +1,206 @@
+"""Horizontal bar charts for svg/ generated from a data table.
+
+svg/s1.svg used to be written by hand: every class repeated the same
+font-family, and every bar's position and every value/multiplier
+position was computed by hand. Here a chart is only data:
+
+    's1': {
+        'title': '벤치마크 결과: 구성별 TPS 비교',
+        'max': 30000, 'step': 5000,
+        'target': {'value': 11400, 'label': '목표: 3.4x'},
+        'bars': [
+            {'label': 'AS-IS (인덱스 9개)', 'value': 3353, 'note': '(1.0x)', 'color': '#FF5630'},
+            {'label': 'PK Only (참고)', 'value': 28557, 'note': '(8.5x)', 'style': 'reference'},
+            ...
+        ],
+    }
+
+A bar's 'text' defaults to its value with thousands separators.
+'style' may be 'highlight' (outlined, bold label, ★) or 'reference'
+(dashed grey). A note that would run past the right edge goes under
+the value instead.
+
+The element templates and the stylesheet are built once per process.
+The stylesheet is shared by every chart and lists the font family once.
+Each chart still carries its own copy because Confluence shows the
+files as <img>, and an <img> does not load external stylesheets. Filling
+a chart is string formatting only, so a batch of charts takes
+milliseconds.
+
+    python bar_charts.py [charts.json ...] [-o ../svg] [--only s1]
+
+Without files, the built-in CHARTS are rendered.
+"""
+import argparse
+import os
+from html import escape
+
+from profiling import span
+from text_metrics import chart_metrics
+
+OUT_DIR = '/tmp/agent_c_svg'
+
+FONT = "-apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif"
+COLORS = ('#0052CC', '#36B37E', '#FFAB00', '#FF5630', '#6554C0', '#00B8D9')
+
+# ── Geometry (px in the viewBox) ──
+VIEW_W = 800
+PLOT_X = 200            # bars start here; labels end 5 px left of it
+PLOT_R = 760
+PLOT_TOP = 40
+ROW_PITCH = 48
+BAR_H = 30
+BAR_TOP = 18            # first bar below PLOT_TOP
+SCALE = 0.925           # displayed size / viewBox size
+VALUE_FS = 11
+NOTE_FS = 11
+GAP = 6
+
+# ── Templates ──
+STYLE = (
+    '<style>'
+    f'text {{ font-family: {FONT}; }} '
+    '.title { font-size: 16px; font-weight: 700; fill: #172B4D; } '
+    '.label { font-size: 13px; fill: #172B4D; } '
+    '.label.hl { font-weight: 700; } '
+    '.label.ref { fill: #6B778C; } '
+    f'.value {{ font-size: {VALUE_FS}px; font-weight: 700; fill: #172B4D; }} '
+    f'.note {{ font-size: {NOTE_FS}px; fill: #6B778C; }} '
+    '.note.under { font-size: 10px; } '
+    '.axis-label { font-size: 10px; fill: #6B778C; } '
+    '.target-label { font-size: 11px; font-weight: 600; fill: #6554C0; } '
+    '.star { font-family: sans-serif; font-size: 13px; fill: #006644; } '
+    '.gridline { stroke: #EBECF0; stroke-width: 1; } '
+    '.axis { stroke: #DFE1E6; stroke-width: 1; } '
+    '.bar { opacity: 0.9; } '
+    '.bar.hl { stroke: #006644; stroke-width: 2.5; } '
+    '.bar.ref { fill: #DFE1E6; opacity: 0.7; stroke: #B3BAC5; stroke-width: 1.5; stroke-dasharray: 6,3; } '
+    '.target { stroke: #6554C0; stroke-width: 1.5; stroke-dasharray: 5,4; }'
+    '</style>'
+)
+HEAD = ('<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {vw} {vh}" width="{w}" height="{h}">'
+        '{style}<text x="{cx}" y="24" text-anchor="middle" class="title">{title}</text>')
+GRID = ('<line x1="{x}" y1="{y0}" x2="{x}" y2="{y1}" class="gridline"/>'
+        '<text x="{x}" y="{ty}" text-anchor="middle" class="axis-label">{text}</text>')
+AXES = ('<line x1="{x0}" y1="{y1}" x2="{x1}" y2="{y1}" class="axis"/>'
+        '<line x1="{x0}" y1="{y0}" x2="{x0}" y2="{y1}" class="axis"/>')
+LABEL = '<text x="{x}" y="{y}" text-anchor="end" class="label{cls}">{text}</text>'
+BAR = '<rect x="{x}" y="{y}" width="{w}" height="{h}" rx="3" class="bar{cls}"{fill}/>'
+STAR = '<text x="{x}" y="{y}" class="star">★</text>'
+VALUE = '<text x="{x}" y="{y}" class="value">{text}</text>'
+NOTE = '<text x="{x}" y="{y}" class="note{cls}">{text}</text>'
+TARGET = ('<line x1="{x}" y1="{y0}" x2="{x}" y2="{y1}" class="target"/>'
+          '<text x="{tx}" y="{ty}" class="target-label">{text}</text>')
+TAIL = '</svg>\n'
+
+STYLE_CLASSES = {'highlight': ' hl', 'reference': ' ref'}
+
+# ── Built-in charts ──
+CHARTS = {
+    's1': {
+        'title': '벤치마크 결과: 구성별 TPS 비교',
+        'max': 30000,
+        'step': 5000,
+        'target': {'value': 11400, 'label': '목표: 3.4x'},
+        'bars': [
+            {'label': 'AS-IS (인덱스 9개)', 'value': 3353, 'note': '(1.0x)', 'color': '#FF5630'},
+            {'label': 'P1 후 (인덱스 3개)', 'value': 10060, 'text': '~10,060', 'note': '(~3.0x)',
+             'color': '#FFAB00'},
+            {'label': 'P0+P1 (3개 + 튜닝)', 'value': 11400, 'text': '~11,400', 'note': '(~3.4x)',
+             'color': '#36B37E', 'style': 'highlight'},
+            {'label': 'PK Only (참고)', 'value': 28557, 'note': '(8.5x)', 'style': 'reference'},
+        ],
+    },
+}
+
+
+def _num(v):
+    """Compact float formatting for coordinates."""
+    return f'{v:.1f}'.rstrip('0').rstrip('.')
+
+
+def render_svg(chart):
+    """SVG document for one chart definition."""
+    bars = chart['bars']
+    top = chart.get('max') or max(b['value'] for b in bars)
+    step = chart.get('step') or top / 5
+    scale = (PLOT_R - PLOT_X) / top
+    bottom = PLOT_TOP + len(bars) * ROW_PITCH + 8
+    view_h = bottom + 40
+    metrics = chart_metrics()
+
+    def px(value):
+        return PLOT_X + value * scale
+
+    out = [HEAD.format(vw=VIEW_W, vh=view_h, w=_num(VIEW_W * SCALE), h=_num(view_h * SCALE), style=STYLE,
+                       cx=VIEW_W // 2, title=escape(chart['title'], quote=False))]
+
+    n_ticks = int(round(top / step))
+    for i in range(n_ticks + 1):
+        v = step * i
+        out.append(GRID.format(x=_num(px(v)), y0=PLOT_TOP, y1=bottom, ty=bottom + 18, text=f'{v:,.0f}'))
+    out.append(AXES.format(x0=PLOT_X, x1=PLOT_R, y0=PLOT_TOP, y1=bottom))
+
+    for i, bar in enumerate(bars):
+        y = PLOT_TOP + BAR_TOP + i * ROW_PITCH
+        cls = STYLE_CLASSES.get(bar.get('style'), '')
+        end = px(bar['value'])
+        color = bar.get('color') or COLORS[i % len(COLORS)]
+        fill = '' if bar.get('style') == 'reference' else f' fill="{color}"'
+        text = bar.get('text') or f"{bar['value']:,}"
+
+        out.append(LABEL.format(x=PLOT_X - 5, y=y + 17, cls=cls, text=escape(bar['label'], quote=False)))
+        out.append(BAR.format(x=PLOT_X, y=y, w=_num(end - PLOT_X), h=BAR_H, cls=cls, fill=fill))
+        if bar.get('style') == 'highlight':
+            out.append(STAR.format(x=_num(end - 17), y=y + 18))
+        value_x = end + GAP
+        out.append(VALUE.format(x=_num(value_x), y=y + 20, text=escape(text, quote=False)))
+
+        note = bar.get('note')
+        if note:
+            note_x = value_x + metrics.width(text, VALUE_FS) + GAP / 2
+            if note_x + metrics.width(note, NOTE_FS) > VIEW_W - 10:
+                out.append(NOTE.format(x=_num(value_x), y=y + 32, cls=' under', text=escape(note, quote=False)))
+            else:
+                out.append(NOTE.format(x=_num(note_x), y=y + 20, cls='', text=escape(note, quote=False)))
+
+    target = chart.get('target')
+    if target:
+        x = px(target['value'])
+        out.append(TARGET.format(x=_num(x), y0=PLOT_TOP + 2, y1=bottom - 2, tx=_num(x + 3.2),
+                                 ty=PLOT_TOP + 12, text=escape(target.get('label', ''), quote=False)))
+    out.append(TAIL)
+    return ''.join(out)
+
+
+def render_all(charts, out_dir=OUT_DIR):
+    """Write each chart as out_dir/<name>.svg; returns the paths written."""
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    with span('bar_charts.render', charts=len(charts)):
+        for name, chart in charts.items():
+            path = os.path.join(out_dir, f'{name}.svg')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(render_svg(chart))
+            paths.append(path)
+    return paths
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate the svg/ bar charts from data tables.')
+    parser.add_argument('tables', nargs='*', help='JSON/YAML files of {name: chart} (default: built-in CHARTS)')
+    parser.add_argument('-o', '--output', default=OUT_DIR, help='output directory')
+    parser.add_argument('--only', action='append', metavar='NAME', help='render only these charts (repeatable)')
+    args = parser.parse_args()
+
+    charts = {}
+    if args.tables:
+        from render_all import load_plan
+        for path in args.tables:
+            charts.update(load_plan(path))
+    else:
+        charts = CHARTS
+    if args.only:
+        charts = {name: charts[name] for name in args.only}
+    for path in render_all(charts, args.output):
+        print(f"OK: {path}")
@@ -0,0 +1,241 @@
+"""Benchmarks for the chart renderers on synthetic plans.
+
+Generators build Gantt plans (10 to 10,000 tasks, 5 to 50 roles) and
+milestone plans (1 to 500 milestones). Each case is timed per stage:
+
+  load        plan -> JSON -> plan, normalized (what a plan file costs)
+  build_rows  lane packing (Gantt only)
+  draw        build_figure(): the artists, before any output
+  savefig     export_figure() to SVG
+  svg_backend gantt_svg.render_svg() end to end (Gantt only)
+  svg_stream  the same with stream=True (Gantt only)
+  role_load   role x week load matrix behind the load histogram (Gantt only)
+
+plus the artist count, output bytes and the peak traced memory of one
+extra, tracemalloc'ed run. Stage times are the best of --repeat runs.
+The cold import time of each chart module is recorded alongside.
+Results go to a JSON file that --compare diffs against a run from
+another commit.
+
+    python bench.py [--full] [--repeat 3] [-o bench.json] [--compare base.json]
+"""
+import argparse
+import bisect
+import gc
+import json
+import os
+import platform
+import random
+import subprocess
+import tempfile
+import time
+import tracemalloc
+
+import milestone_timeline
+import timeline_gantt
+from export import export_figure
+from plan_info import import_times
+from theme import setup_matplotlib
+
+OUT_PATH = '/tmp/agent_c_bench.json'
+
+# Stages timed alongside the matplotlib chart but not part of its total
+SEPARATE_STAGES = ('svg_backend', 'svg_stream', 'role_load')
+
+QUICK_CASES = [
+    ('gantt', {'n_tasks': 10, 'n_roles': 5}),
+    ('gantt', {'n_tasks': 100, 'n_roles': 5}),
+    ('gantt', {'n_tasks': 1000, 'n_roles': 20}),
+    ('milestone', {'n_milestones': 1}),
+    ('milestone', {'n_milestones': 10}),
+    ('milestone', {'n_milestones': 100}),
+]
+FULL_CASES = QUICK_CASES + [
+    ('gantt', {'n_tasks': 1000, 'n_roles': 50}),
+    ('gantt', {'n_tasks': 10000, 'n_roles': 50}),
+    ('milestone', {'n_milestones': 500}),
+]
+
+
+# ── Synthetic plans ──
+def role_names(n_roles):
+    """The chart's own roles first, then R06, R07, ..."""
+    known = timeline_gantt.ROLE_ORDER[:n_roles]
+    return known + [f'R{i:02d}' for i in range(len(known) + 1, n_roles + 1)]
+
+
+def gantt_plan(n_tasks, n_roles=5, n_weeks=None, seed=0):
+    """Gantt plan with n_tasks tasks spread over n_roles roles and ~50-task phases.
+
+    About half the tasks depend on one or two tasks that end by their
+    start, so the critical path is computed as in a real plan.
+    """
+    rng = random.Random(seed)
+    n_weeks = n_weeks or min(52, max(10, n_tasks // 20))
+    roles = role_names(n_roles)
+    n_phases = min(20, max(1, n_tasks // 50))
+    phases = []
+    for p in range(n_phases):
+        tasks = []
+        for k in range(p, n_tasks, n_phases):
+            start = 1 + rng.randrange(0, n_weeks * 2) / 2
+            end = min(start + rng.choice((0.5, 1, 1.5, 2, 3, 4)), n_weeks + 1)
+            md = rng.randint(0, 8)
+            tasks.append((rng.choice(roles), f'작업{k} task', md, start, end, False))
+        phases.append({'name': f'P{p} 단계', 'weeks': '', 'md': sum(t[2] for t in tasks),
+                       'tasks': tasks})
+
+    by_end = sorted((t for phase in phases for t in phase['tasks']), key=lambda t: t[4])
+    ends = [t[4] for t in by_end]
+    for phase in phases:
+        for i, t in enumerate(phase['tasks']):
+            done = bisect.bisect_right(ends, t[3])
+            if done and rng.random() < 0.5:
+                deps = {by_end[rng.randrange(done)][1] for _ in range(rng.randint(1, 2))}
+                phase['tasks'][i] = (*t, sorted(deps))
+    return {
+        'title': f'Synthetic {n_tasks} tasks / {n_roles} roles',
+        'phases': phases,
+        'milestones': [(f'M{i}', '', 1 + i * n_weeks // 6, i % 3 == 0) for i in range(6)],
+        'week_labels': [f'W{i}\n{1 + (i - 1) // 4}/{1 + 7 * ((i - 1) % 4)}'
+                        for i in range(1, n_weeks + 1)],
+    }
+
+
+def milestone_plan(n_milestones, n_weeks=None, seed=0):
+    """Milestone plan with n_milestones spread over n_weeks and five phase segments."""
+    rng = random.Random(seed)
+    n_weeks = n_weeks or max(10, n_milestones // 2)
+    colors = ['#3b82f6', '#1d4ed8', '#f59e0b', '#10b981', '#9ca3af']
+    bounds = [1 + i * n_weeks // 5 for i in range(6)]
+    segs = [(f'P{i} 단계', bounds[i], bounds[i + 1], colors[i], 0.2) for i in range(5)]
+    milestones = []
+    for i in range(n_milestones):
+        gate = i % 5 == 0
+        milestones.append({
+            'id': f'M{i}', 'name': f'마일스톤{i}', 'week': rng.randint(1, n_weeks),
+            'date': f'{rng.randint(1, 12)}/{rng.randint(1, 28)}',
+            'is_gate': gate, 'gate_label': 'GATE Go/No-Go' if gate else None,
+            'exit': [f'완료 조건 {j}' for j in range(rng.randint(1, 3))],
+            'rollback': '롤백 절차' if rng.random() < 0.4 else None,
+        })
+    milestones.sort(key=lambda m: m['week'])
+    return {'title': f'Synthetic {n_milestones} milestones', 'phase_segs': segs,
+            'milestones': milestones}
+
+
+# ── Measurement ──
+def _timed(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - t0
+
+
+def _run_once(chart, plan, out_path):
+    """One pass through every stage; returns (stage seconds, artists, bytes)."""
+    module = timeline_gantt if chart == 'gantt' else milestone_timeline
+    stages = {}
+    plan, stages['load'] = _timed(lambda p: module.normalize_plan(json.loads(json.dumps(p))), plan)
+    if chart == 'gantt':
+        _, stages['build_rows'] = _timed(timeline_gantt.build_rows, plan['phases'])
+    fig, stages['draw'] = _timed(module.build_figure, plan)
+    artists = len(fig.findobj())
+    _, stages['savefig'] = _timed(export_figure, fig, out_path, None, None)
+    setup_matplotlib().close(fig)
+    n_bytes = os.path.getsize(out_path)
+    if chart == 'gantt':
+        from gantt_svg import render_svg
+        _, stages['svg_backend'] = _timed(render_svg, plan, out_path)
+        _, stages['svg_stream'] = _timed(render_svg, plan, out_path, True)
+        import role_load
+        _, stages['role_load'] = _timed(role_load.plan_load, plan, timeline_gantt.ROLE_ORDER)
+    return stages, artists, n_bytes
+
+
+def run_case(chart, params, repeat=3, memory=True):
+    """Benchmark one generated plan; returns a result dict."""
+    plan = gantt_plan(**params) if chart == 'gantt' else milestone_plan(**params)
+    with tempfile.TemporaryDirectory() as tmp:
+        out_path = os.path.join(tmp, 'chart.svg')
+        best = None
+        for _ in range(repeat):
+            gc.collect()
+            stages, artists, n_bytes = _run_once(chart, plan, out_path)
+            best = stages if best is None else {k: min(v, stages[k]) for k, v in best.items()}
+        peak = None
+        if memory:
+            gc.collect()
+            tracemalloc.start()
+            _run_once(chart, plan, out_path)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    name = chart + ''.join(f'-{k[2:]}{v}' for k, v in params.items())
+    return {
+        'case': name, 'chart': chart, 'params': params,
+        'stages': best, 'total': sum(v for k, v in best.items() if k not in SEPARATE_STAGES),
+        'artists': artists, 'bytes': n_bytes,
+        'peak_mb': None if peak is None else peak / 2**20,
+    }
+
+
+def environment():
+    import matplotlib
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = ''
+    return {'commit': commit or None, 'python': platform.python_version(),
+            'matplotlib': matplotlib.__version__, 'machine': platform.machine(),
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S')}
+
+
+# ── Reporting ──
+def print_results(results):
+    print(f"{'case':32} {'total ms':>9} {'draw':>8} {'savefig':>8} {'artists':>8} "
+          f"{'KB':>8} {'peak MB':>8}")
+    for r in results:
+        s = r['stages']
+        peak = f"{r['peak_mb']:8.1f}" if r['peak_mb'] is not None else f"{'-':>8}"
+        print(f"{r['case']:32} {r['total'] * 1000:9.1f} {s['draw'] * 1000:8.1f} "
+              f"{s['savefig'] * 1000:8.1f} {r['artists']:8d} {r['bytes'] / 1024:8.1f} {peak}")
+
+
+def compare(base, results):
+    """Print per-stage new/old time ratios for cases present in both runs."""
+    old = {r['case']: r for r in base['results']}
+    print(f"\nvs {base['meta'].get('commit') or 'baseline'} (new / old; < 1.00 is faster)")
+    for r in results:
+        b = old.get(r['case'])
+        if b is None:
+            continue
+        ratios = '  '.join(f"{k} {v / b['stages'][k]:.2f}" for k, v in r['stages'].items()
+                           if b['stages'].get(k))
+        print(f"{r['case']:32} total {r['total'] / b['total']:.2f}  {ratios}  "
+              f"bytes {r['bytes'] / b['bytes']:.2f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the chart renderers on synthetic plans.')
+    parser.add_argument('--full', action='store_true',
+                        help='include the 10,000-task and 500-milestone cases')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc run')
+    parser.add_argument('-o', '--output', default=OUT_PATH)
+    parser.add_argument('--compare', metavar='BASE_JSON')
+    args = parser.parse_args()
+
+    setup_matplotlib()
+    run_case('gantt', {'n_tasks': 10, 'n_roles': 5}, repeat=1, memory=False)   # warm-up
+
+    results = [run_case(chart, params, args.repeat, not args.no_memory)
+               for chart, params in (FULL_CASES if args.full else QUICK_CASES)]
+    imports = import_times()
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({'meta': environment(), 'imports': imports, 'results': results}, f, indent=1)
+    print_results(results)
+    print('\n' + '  '.join(f'import {module} {ms:.0f} ms' for module, ms in imports.items()))
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            compare(json.load(f), results)
+    print(f"OK: {args.output}")
@@ -0,0 +1,118 @@
+"""Content-hash cache for rendered chart files.
+
+A chart's key is a SHA-256 over everything that decides its bytes: the
+plan data, the style constants (color system), the renderer version and
+the output options (formats, dpi, backend, optimizer precision). The renderer
+version hashes the chart modules' source, so editing a script or the
+theme invalidates old entries without anyone bumping a number.
+
+Entries are plain files under CACHE_DIR named <key><ext>, one per output
+format. A hit copies the stored files to the output paths and touches
+them; once the cache grows past max_bytes the least recently used
+entries are evicted.
+"""
+import functools
+import hashlib
+import json
+import os
+import shutil
+
+from text_metrics import CACHE_DIR as _ASSET_CACHE_DIR
+
+CACHE_DIR = os.path.join(_ASSET_CACHE_DIR, 'charts')
+MAX_BYTES = 256 * 1024 * 1024
+
+# Sources whose edits change rendered output
+RENDERER_MODULES = (
+    'theme.py', 'fonts.py', 'text_metrics.py', 'draw_batch.py', 'export.py',
+    'timeline_gantt.py', 'schedule.py', 'gantt_svg.py', 'milestone_timeline.py', 'card_layout.py',
+    'label_layout.py', 'plan_calendar.py', 'role_load.py', 'load_histogram.py', 'svg_optimize.py',
+)
+
+
+@functools.lru_cache(maxsize=None)
+def renderer_version():
+    """Hash of the chart modules' source plus the matplotlib version."""
+    from importlib import metadata
+
+    h = hashlib.sha256()
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in RENDERER_MODULES:
+        with open(os.path.join(here, name), 'rb') as f:
+            h.update(name.encode() + b'\0' + f.read() + b'\0')
+    try:
+        h.update(metadata.version('matplotlib').encode())
+    except metadata.PackageNotFoundError:
+        pass
+    return h.hexdigest()[:16]
+
+
+def _canonical(value):
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    raise TypeError(f'cannot hash {type(value).__name__} in a cache key')
+
+
+def cache_key(**parts):
+    """Stable SHA-256 hex digest of JSON-serializable keyword parts."""
+    blob = json.dumps(parts, sort_keys=True, ensure_ascii=False,
+                      separators=(',', ':'), default=_canonical)
+    return hashlib.sha256(blob.encode('utf-8')).hexdigest()
+
+
+class BuildCache:
+    """Rendered files keyed by cache_key, with LRU eviction by total size."""
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = []
+        self.misses = []
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _entry(self, key, out_path):
+        return os.path.join(self.cache_dir, key + os.path.splitext(out_path)[1])
+
+    def fetch(self, key, out_paths):
+        """Copy the cached files for key to out_paths; False unless all are cached."""
+        entries = [self._entry(key, path) for path in out_paths]
+        if not all(os.path.exists(entry) for entry in entries):
+            self.misses.extend(out_paths)
+            return False
+        for entry, path in zip(entries, out_paths):
+            shutil.copyfile(entry, path)
+            os.utime(entry)
+        self.hits.extend(out_paths)
+        return True
+
+    def store(self, key, out_paths):
+        """Save freshly rendered out_paths under key."""
+        for path in out_paths:
+            entry = self._entry(key, path)
+            tmp = f'{entry}.{os.getpid()}.tmp'
+            shutil.copyfile(path, tmp)
+            os.replace(tmp, entry)
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits max_bytes."""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file():
+                st = entry.stat()
+                entries.append((st.st_mtime, st.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+            removed += 1
+        return removed
+
+    def report(self):
+        for path in self.hits:
+            print(f"hit:  {path}")
+        for path in self.misses:
+            print(f"miss: {path}")
+        print(f"cache: {len(self.hits)} hits, {len(self.misses)} misses ({self.cache_dir})")
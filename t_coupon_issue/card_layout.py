@@ -0,0 +1,104 @@
+"""Automatic placement of milestone cards around the timeline.
+
+Cards sit in tiers above and below the timeline; tier 0 is nearest to it.
+Milestones are swept once in week order. Each side keeps its tiers in two
+heaps, the same scheme as timeline_gantt.pack_lanes: busy tiers keyed on
+the right edge of their last card, and free tier indices. A card takes
+the lowest free tier on the better side. If no tier is free, it may slide
+right by up to max_shift past the tier that frees up first. Failing that,
+it opens a new tier. That is O(n log n) in the number of milestones, with
+no two cards in a tier overlapping.
+
+place_cards() returns each card's box and its connector line, so the
+renderer only draws.
+"""
+import heapq
+
+TIER_GAP = 0.25     # vertical gap between stacked tiers
+CARD_GAP = 0.15     # horizontal gap between cards in one tier
+
+
+class _Side:
+    """Tiers on one side of the timeline."""
+
+    def __init__(self):
+        self.busy = []      # (right edge, tier)
+        self.free = []      # tier indices whose cards all end left of the sweep
+        self.n_tiers = 0
+
+    def candidate(self, left, width, x_max, max_shift):
+        """(tier, left) this side would give a card wanting left."""
+        while self.busy and self.busy[0][0] + CARD_GAP <= left:
+            heapq.heappush(self.free, heapq.heappop(self.busy)[1])
+        if self.free:
+            return self.free[0], left
+        if self.busy:
+            shifted = self.busy[0][0] + CARD_GAP
+            if shifted - left <= max_shift and shifted + width <= x_max:
+                return self.busy[0][1], shifted
+        return self.n_tiers, left
+
+    def take(self, tier, right):
+        if self.free and self.free[0] == tier:
+            heapq.heappop(self.free)
+        elif self.busy and self.busy[0][1] == tier:
+            heapq.heappop(self.busy)
+        else:
+            self.n_tiers += 1
+        heapq.heappush(self.busy, (right, tier))
+
+
+def place_cards(node_xs, heights, width, x_min, x_max, timeline_y,
+                offset=0.75, max_shift=None):
+    """Lay out one card per milestone node.
+
+    node_xs are the nodes' x positions and heights the cards' heights
+    (data units); every card is width wide and kept within [x_min, x_max].
+    Cards start offset above/below timeline_y. Returns one dict per node,
+    in input order: left, cx, bottom, top, above, tier and connector
+    ((x, y) at the node, (x, y) at the card edge).
+    """
+    max_shift = width / 2 if max_shift is None else max_shift
+    sides = {True: _Side(), False: _Side()}
+    placed = [None] * len(node_xs)
+    prefer_above = True
+
+    for i in sorted(range(len(node_xs)), key=lambda i: node_xs[i]):
+        want = min(max(node_xs[i] - width / 2, x_min), x_max - width)
+        options = []
+        for above in (prefer_above, not prefer_above):
+            tier, left = sides[above].candidate(want, width, x_max, max_shift)
+            options.append((tier, left - want, above, left))
+        tier, _, above, left = min(options, key=lambda o: o[:2])
+        sides[above].take(tier, left + width)
+        placed[i] = {'left': left, 'cx': left + width / 2, 'above': above, 'tier': tier}
+        prefer_above = not above
+
+    # Tier heights are known once every card is placed
+    tier_h = {}
+    for card, h in zip(placed, heights):
+        key = (card['above'], card['tier'])
+        tier_h[key] = max(tier_h.get(key, 0.0), h)
+    inner = {}
+    for above in (True, False):
+        y = offset
+        for tier in range(sides[above].n_tiers):
+            inner[above, tier] = y
+            y += tier_h[above, tier] + TIER_GAP
+    for card, h in zip(placed, heights):
+        above = card['above']
+        if above:
+            card['bottom'] = timeline_y + inner[above, card['tier']]
+            card['top'] = card['bottom'] + h
+        else:
+            card['top'] = timeline_y - inner[above, card['tier']]
+            card['bottom'] = card['top'] - h
+
+    for x, card in zip(node_xs, placed):
+        # Vertical when the card spans the node, else to the nearest inset edge
+        anchor = min(max(x, card['left'] + 0.15), card['left'] + width - 0.15)
+        if card['above']:
+            card['connector'] = ((x, timeline_y + 0.25), (anchor, card['bottom']))
+        else:
+            card['connector'] = ((x, timeline_y - 0.25), (anchor, card['top']))
+    return placed
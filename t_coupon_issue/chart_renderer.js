@@ -0,0 +1,404 @@
+/*
+ * Draws the chart layouts written by layout_json.py as inline SVG.
+ *
+ * One copy serves every chart on a page (and is cached by the browser):
+ *
+ *   <div data-chart-layout="/download/attachments/123456/plan_gantt.json"></div>
+ *   <script src="/download/attachments/123456/chart_renderer.js" defer></script>
+ *
+ * or with the layout inline:
+ *
+ *   <div data-chart-layout><script type="application/json">{...}</script></div>
+ *
+ * The drawing mirrors gantt_svg.draw() and milestone_timeline.build_figure():
+ * colours, fonts, font sizes and offsets below are theirs, in the same data
+ * units. Text is laid out by the browser, so label backgrounds and the
+ * view box are measured with getBBox() instead of estimated.
+ *
+ * window.ChartLayout.render(element, layout) draws one layout into element.
+ */
+(function () {
+  'use strict';
+
+  var LAYOUT_VERSION = 1;
+  var NS = 'http://www.w3.org/2000/svg';
+  var FONT = "'Apple SD Gothic Neo', 'Noto Sans CJK KR', 'Noto Sans KR', 'NanumGothic', " +
+             "'Malgun Gothic', 'DejaVu Sans', sans-serif";
+  var ASCENT = 0.76, DESCENT = 0.24;     // of the font size, as in gantt_svg.py
+  var TIGHT_PAD = 7.2;                   // 0.1 in, savefig's pad_inches
+
+  // ── Canvas ──
+  function el(tag, attrs) {
+    var node = document.createElementNS(NS, tag);
+    for (var key in attrs) {
+      if (attrs[key] !== undefined && attrs[key] !== null) node.setAttribute(key, attrs[key]);
+    }
+    return node;
+  }
+
+  function num(v) {
+    return +v.toFixed(3);
+  }
+
+  // Primitives in data coordinates, one <g> per zorder (drawn in zorder)
+  function Canvas(svg, layout) {
+    this.svg = svg;
+    this.root = el('g', {'font-family': FONT});
+    svg.appendChild(this.root);
+    this.x0 = layout.x[0];
+    this.y1 = layout.y[1];
+    this.sx = layout.s[0];
+    this.sy = layout.s[1];
+    this.axW = (layout.x[1] - this.x0) * this.sx;
+    this.axH = (this.y1 - layout.y[0]) * this.sy;
+    this.layers = {};
+  }
+
+  Canvas.prototype.px = function (x) { return num((x - this.x0) * this.sx); };
+  Canvas.prototype.py = function (y) { return num((this.y1 - y) * this.sy); };
+
+  Canvas.prototype.layer = function (z) {
+    var layer = this.layers[z];
+    if (!layer) {
+      layer = this.layers[z] = el('g', {'data-z': z});
+      var above = Object.keys(this.layers).map(Number)
+        .filter(function (k) { return k > z; })
+        .sort(function (a, b) { return a - b; });
+      this.root.insertBefore(layer, above.length ? this.layers[above[0]] : null);
+    }
+    return layer;
+  };
+
+  // Rect from data corner (x, y); o: alpha, round (data units), stroke, strokeWidth, z
+  Canvas.prototype.rect = function (x, y, w, h, fill, o) {
+    o = o || {};
+    var attrs = {x: this.px(x), y: this.py(y + h), width: num(w * this.sx), height: num(h * this.sy),
+                 fill: fill, 'fill-opacity': o.alpha};
+    if (o.round) {
+      attrs.rx = num(o.round * this.sx);
+      attrs.ry = num(o.round * this.sy);
+    }
+    if (o.stroke) {
+      attrs.stroke = o.stroke;
+      attrs['stroke-width'] = o.strokeWidth;
+    }
+    this.layer(o.z === undefined ? 1 : o.z).appendChild(el('rect', attrs));
+  };
+
+  // o: alpha, dashed, cap ('square' unless dashed), z
+  Canvas.prototype.line = function (x0, y0, x1, y1, color, width, o) {
+    o = o || {};
+    var attrs = {x1: this.px(x0), y1: this.py(y0), x2: this.px(x1), y2: this.py(y1),
+                 stroke: color, 'stroke-width': width, 'stroke-opacity': o.alpha};
+    if (o.dashed) {
+      // lines.dashed_pattern (3.7, 1.6) scaled by the line width
+      attrs['stroke-dasharray'] = num(3.7 * width) + ',' + num(1.6 * width);
+    } else {
+      attrs['stroke-linecap'] = o.cap || 'square';
+    }
+    this.layer(o.z === undefined ? 2 : o.z).appendChild(el('line', attrs));
+  };
+
+  // Marker 'o': size is the diameter in points
+  Canvas.prototype.circle = function (x, y, size, color, edge, edgeWidth, z) {
+    this.layer(z === undefined ? 2 : z).appendChild(el('circle', {
+      cx: this.px(x), cy: this.py(y), r: size / 2, fill: color, stroke: edge, 'stroke-width': edgeWidth}));
+  };
+
+  // Marker 'D': a unit square rotated 45 degrees, scaled by size (points)
+  Canvas.prototype.diamond = function (x, y, size, color, edge, edgeWidth, z) {
+    var X = this.px(x), Y = this.py(y), r = size * Math.SQRT2 / 2;
+    var d = 'M' + num(X) + ' ' + num(Y - r) + 'L' + num(X + r) + ' ' + num(Y) +
+            'L' + num(X) + ' ' + num(Y + r) + 'L' + num(X - r) + ' ' + num(Y) + 'Z';
+    this.layer(z === undefined ? 2 : z).appendChild(el('path', {
+      d: d, fill: color, stroke: edge || 'white', 'stroke-width': edgeWidth || 1, 'stroke-linejoin': 'miter'}));
+  };
+
+  // Text anchored like ax.text; o: ha, va, weight, italic, linespacing, box [fill, alpha, pad], z
+  Canvas.prototype.text = function (x, y, s, size, color, o) {
+    o = o || {};
+    var lines = String(s).split('\n');
+    var X = this.px(x), Y = this.py(y);
+    var gap = (o.linespacing || 1.2) * size;
+    var blockH = (lines.length - 1) * gap + (ASCENT + DESCENT) * size;
+    var top = {top: Y, bottom: Y - blockH, center: Y - blockH / 2}[o.va] ;
+    if (top === undefined) top = Y - ASCENT * size;
+    var base = top + ASCENT * size;
+
+    var node = el('text', {'font-size': size, fill: color,
+                           'text-anchor': {center: 'middle', right: 'end'}[o.ha],
+                           'font-weight': o.weight, 'font-style': o.italic ? 'italic' : null});
+    if (lines.length === 1) {
+      node.setAttribute('x', X);
+      node.setAttribute('y', num(base));
+      node.textContent = s;
+    } else {
+      lines.forEach(function (line, i) {
+        var span = el('tspan', {x: X, y: num(base + i * gap)});
+        span.textContent = line;
+        node.appendChild(span);
+      });
+    }
+    var layer = this.layer(o.z === undefined ? 3 : o.z);
+    layer.appendChild(node);
+
+    if (o.box) {
+      var b = node.getBBox(), p = o.box[2] * size;
+      layer.insertBefore(el('rect', {
+        x: num(b.x - p), y: num(top - p), width: num(b.width + 2 * p), height: num(blockH + 2 * p),
+        rx: num(p), fill: o.box[0], 'fill-opacity': o.box[1]}), node);
+    }
+  };
+
+  // Crop to the axes box and drawing plus TIGHT_PAD, on a background rect
+  Canvas.prototype.fit = function (bg) {
+    var b = this.root.getBBox();
+    var x0 = Math.min(b.x, 0), y0 = Math.min(b.y, 0);
+    var x1 = Math.max(b.x + b.width, this.axW), y1 = Math.max(b.y + b.height, this.axH);
+    var x = num(x0 - TIGHT_PAD), y = num(y0 - TIGHT_PAD);
+    var w = num(x1 - x0 + 2 * TIGHT_PAD), h = num(y1 - y0 + 2 * TIGHT_PAD);
+    this.svg.insertBefore(el('rect', {x: x, y: y, width: w, height: h, fill: bg}), this.root);
+    this.svg.setAttribute('viewBox', [x, y, w, h].join(' '));
+    this.svg.setAttribute('width', w + 'pt');
+    this.svg.setAttribute('height', h + 'pt');
+  };
+
+  // ── Gantt (gantt_svg.draw) ──
+  var GC = {
+    bg: '#ffffff', text1: '#111827', text2: '#6b7280', text3: '#9ca3af',
+    divider: '#e5e7eb', divider_light: '#f3f4f6', row_alt: '#f9fafb',
+    critical: '#ef4444', accent: '#3b82f6'
+  };
+  var HEADER_Y = 2.0, ROW_H = 0.68, BAR_H = 0.48, LEFT_COL_W = 1.6;
+
+  function rowCenter(idx) { return HEADER_Y - 0.5 - idx * ROW_H; }
+
+  function estWidth(name) {
+    var w = 0;
+    for (var i = 0; i < name.length; i++) w += name.charCodeAt(i) > 0x2E7F ? 0.11 : 0.07;
+    return w;
+  }
+
+  function drawGantt(c, d) {
+    var nRows = d.rows.length;
+    var bottomY = HEADER_Y - 0.8 - nRows * ROW_H - 0.8;
+    var right = d.weeks.length;
+
+    // Title
+    c.text(-LEFT_COL_W, HEADER_Y + 1.4, d.title, 22, GC.text1, {va: 'bottom', weight: 700});
+    c.text(-LEFT_COL_W, HEADER_Y + 1.05, 'Implementation Gantt Chart', 13, GC.text2, {va: 'bottom'});
+    c.text(right + 1.3, HEADER_Y + 1.4, 'Total ' + d.md + ' MD', 14, GC.text1,
+           {ha: 'right', va: 'bottom', weight: 700});
+    c.text(right + 1.3, HEADER_Y + 1.05, right + ' Weeks  /  ' + d.n_roles + ' Roles', 11, GC.text2,
+           {ha: 'right', va: 'bottom'});
+
+    // Week column headers
+    d.weeks.forEach(function (label, i) {
+      if (i % 2 === 0) {
+        c.rect(i, bottomY + 0.5, 1, HEADER_Y + 0.6 - (bottomY + 0.5), GC.divider_light, {alpha: 0.5, z: 0});
+      }
+      c.text(i + 0.5, HEADER_Y + 0.25, label, 9, GC.text2,
+             {ha: 'center', va: 'center', weight: 500, linespacing: 1.3});
+    });
+    c.line(-0.05, HEADER_Y - 0.05, right + 0.05, HEADER_Y - 0.05, GC.divider, 1.2, {z: 2});
+
+    // Milestone diamonds at the header
+    d.milestones.forEach(function (m) {
+      var x = m[1], color = m[2] ? GC.critical : GC.accent, y = HEADER_Y + 0.7;
+      c.diamond(x, y, 7, color, 'white', 1.5, 5);
+      c.text(x, y + 0.22, m[0], 7.5, color, {ha: 'center', va: 'bottom', weight: 700});
+      c.line(x, HEADER_Y - 0.05, x, bottomY + 0.5, color, 0.8, {alpha: 0.1, dashed: true, z: 0});
+    });
+
+    // Rows
+    d.rows.forEach(function (row, idx) {
+      var yc = rowCenter(idx), yTop = yc + ROW_H / 2, yBottom = yc - ROW_H / 2;
+      var role = d.roles[row[0]];
+      if (row[2] >= 0) {
+        var phase = d.phases[row[2]], sepY = yTop + 0.15;
+        c.line(-LEFT_COL_W - 0.1, sepY, right + 1.3, sepY, GC.divider, 0.7, {z: 1});
+        c.text(-LEFT_COL_W, sepY + 0.04, phase[0], 10.5, GC.text1, {va: 'bottom', weight: 700});
+        if (phase[1]) {
+          c.text(-LEFT_COL_W + estWidth(phase[0]) + 0.65, sepY + 0.04, phase[1], 8.5, GC.text3, {va: 'bottom'});
+        }
+      }
+      if (idx % 2 === 1) {
+        c.rect(-0.05, yBottom + 0.02, right + 0.1, (yTop - 0.02) - (yBottom + 0.02), GC.row_alt,
+               {alpha: 0.4, z: 0});
+      }
+      if (row[1]) {
+        c.text(-0.15, yc, role[0], 9.5, role[1] || GC.text2, {ha: 'right', va: 'center', weight: 700});
+      }
+    });
+
+    // Bars and their labels (placed by timeline_gantt.bar_labels)
+    d.bars.forEach(function (b) {
+      var yc = rowCenter(b[0]), role = d.roles[b[3]];
+      var text = b[5], x = b[6], y = b[7], dot = b[8], leader = b[9];
+      c.rect(b[1], yc - BAR_H / 2, b[2], BAR_H, role[1] || GC.accent, {alpha: 0.85, round: 0.07, z: 3});
+      if (b[4]) {
+        if (dot !== null) c.text(dot, yc, '●', 5, GC.critical, {ha: 'center', va: 'center', z: 4});
+        c.text(x, yc, text, 8.5, 'white', {ha: 'center', va: 'center', weight: 500, z: 4});
+      } else if (text) {
+        if (leader) c.line(leader[0], leader[1], leader[2], leader[3], GC.text3, 0.6, {z: 4});
+        if (dot !== null) c.text(dot, y, '●', 5, GC.critical, {va: 'center', z: 4});
+        c.text(x, y, text, 8, GC.text1, {va: 'center', z: 4, box: ['white', 0.85, 0.04]});
+      }
+    });
+
+    // Legend
+    var legY = bottomY + 0.15, legX = -LEFT_COL_W, spacing = 1.5;
+    c.line(-LEFT_COL_W - 0.1, legY + 0.35, right + 1.3, legY + 0.35, GC.divider, 0.7, {z: 1});
+    d.roles.slice(0, d.legend).forEach(function (role, i) {
+      var x = legX + i * spacing;
+      c.rect(x, legY - 0.06, 0.28, 0.16, role[1], {alpha: 0.85, round: 0.04, z: 3});
+      c.text(x + 0.36, legY + 0.02, role[0], 9, GC.text1, {va: 'center'});
+    });
+    var cpX = legX + 5 * spacing + 0.3;
+    c.text(cpX, legY + 0.02, '●', 6, GC.critical, {va: 'center'});
+    c.text(cpX + 0.14, legY + 0.02, 'Critical Path', 9, GC.text1, {va: 'center'});
+    var mlX = cpX + 1.6;
+    c.diamond(mlX + 0.06, legY + 0.02, 6, GC.accent);
+    c.text(mlX + 0.22, legY + 0.02, 'Milestone', 9, GC.text1, {va: 'center'});
+    var glX = mlX + 1.4;
+    c.diamond(glX + 0.06, legY + 0.02, 6, GC.critical);
+    c.text(glX + 0.22, legY + 0.02, 'GATE', 9, GC.text1, {va: 'center'});
+    return GC.bg;
+  }
+
+  // ── Milestone timeline (milestone_timeline.build_figure) ──
+  var MC = {
+    bg: '#ffffff', surface: '#fafafa', text1: '#111827', text2: '#6b7280', text3: '#9ca3af',
+    border: '#e5e7eb', accent: '#3b82f6', critical: '#ef4444', critical_light: '#fef2f2'
+  };
+  var TL_Y = 5.0, CARD_W = 2.2, LINE_H = 0.21, WRAP_H = 0.15, RB_WRAP_H = 0.14;
+  var BULLET = '•  ';
+
+  function drawMilestone(c, d) {
+    var ms = d.milestones, n = d.n_weeks, yLo = d.y[0], yHi = d.y[1];
+    var phaseY = TL_Y + 0.55;
+    var gates = ms.filter(function (m) { return m[3]; }).length;
+
+    // Title
+    c.text(0.3, yHi - 0.5, d.title, 22, MC.text1, {va: 'bottom', weight: 700});
+    c.text(0.3, yHi - 0.85, 'Milestone Timeline', 13, MC.text2, {va: 'bottom'});
+    c.text(n + 1.7, yHi - 0.5, ms.length + ' Milestones  /  ' + n + ' Weeks  /  ' + gates + ' GATE',
+           11, MC.text2, {ha: 'right', va: 'bottom'});
+
+    // Phase bar
+    d.segs.forEach(function (seg) {
+      c.rect(seg[1], phaseY - 0.07, seg[2] - seg[1], 0.14, seg[3], {alpha: seg[4], round: 0.04, z: 2});
+      c.text((seg[1] + seg[2]) / 2, phaseY + 0.2, seg[0], 7.5, MC.text2,
+             {ha: 'center', va: 'bottom', weight: 500});
+    });
+
+    // Timeline, week ticks and labels
+    c.line(0.5, TL_Y, n + 1.0, TL_Y, MC.border, 2.5, {cap: 'round', z: 1});
+    for (var wk = 1; wk <= n; wk++) {
+      c.line(wk, TL_Y - 0.06, wk, TL_Y + 0.06, MC.border, 1, {z: 2});
+      c.text(wk, TL_Y - 0.22, 'W' + wk, 8, MC.text3, {ha: 'center', va: 'top'});
+    }
+
+    // Duration labels between milestones
+    for (var i = 0; i + 1 < ms.length; i++) {
+      c.text((ms[i][2] + ms[i + 1][2]) / 2, TL_Y + 0.22, (ms[i + 1][2] - ms[i][2]) + 'w', 8, MC.text3,
+             {ha: 'center', va: 'bottom', weight: 500, box: ['white', 0.9, 0.12]});
+    }
+
+    ms.forEach(function (m, k) {
+      var card = d.cards[k], x = m[2], gate = m[3];
+      var color = gate ? MC.critical : MC.accent;
+
+      // Node and date
+      c.circle(x, TL_Y, gate ? 18 : 15, color, 'white', 2.5, 5);
+      c.text(x, TL_Y, m[0], gate ? 7.5 : 7, 'white', {ha: 'center', va: 'center', weight: 700, z: 6});
+      c.text(x, TL_Y - 0.42, m[5], 9, color, {ha: 'center', va: 'top', weight: 700});
+
+      // Connector and card (above the z 3 texts: phase names may sit under a card)
+      var left = card[0], bottom = card[1], top = card[2], conn = card[3];
+      c.line(conn[0], conn[1], conn[2], conn[3], MC.border, 1, {z: 1});
+      c.rect(left - 0.02, bottom - 0.02, CARD_W + 0.04, top - bottom + 0.04,
+             gate ? MC.critical_light : MC.surface,
+             {round: 0.06, stroke: gate ? MC.critical : MC.border, strokeWidth: gate ? 1.2 : 0.8, z: 3.5});
+
+      // Card content
+      var tx = left + 0.12, ty = top - 0.18;
+      c.text(tx, ty, m[0] + ': ' + m[1], 9.5, gate ? MC.critical : MC.text1, {va: 'top', weight: 700, z: 4});
+      ty -= 0.22;
+      if (m[4] !== null) {
+        c.text(tx, ty, m[4], 7.5, MC.critical, {va: 'top', weight: 500, italic: true, z: 4});
+        ty -= 0.22;
+      }
+      c.text(tx, ty, 'Exit Criteria:', 7, MC.text3, {va: 'top', weight: 700, z: 4});
+      ty -= 0.2;
+      card[4].forEach(function (lines) {
+        c.text(tx + 0.08, ty, BULLET + lines[0], 7.5, MC.text2, {va: 'top', z: 4});
+        lines.slice(1).forEach(function (line) {
+          ty -= WRAP_H;
+          c.text(tx + 0.08 + d.bullet_w, ty, line, 7.5, MC.text2, {va: 'top', z: 4});
+        });
+        ty -= LINE_H;
+      });
+      if (card[5].length) {
+        ty -= 0.06;
+        card[5].forEach(function (line, j) {
+          c.text(tx, ty - j * RB_WRAP_H, line, 7, MC.critical, {va: 'top', italic: true, z: 4});
+        });
+      }
+    });
+
+    // Legend
+    var legY = yLo + 0.45;
+    c.circle(1.0, legY, 10, MC.critical, 'white', 2);
+    c.text(1.3, legY, 'GATE Milestone', 9, MC.text1, {va: 'center'});
+    c.circle(3.2, legY, 10, MC.accent, 'white', 2);
+    c.text(3.5, legY, 'Milestone', 9, MC.text1, {va: 'center'});
+    c.text(5.0, legY, 'Rollback:', 8, MC.critical, {va: 'center', italic: true});
+    c.text(5.65, legY, 'Rollback plan available', 9, MC.text1, {va: 'center'});
+    return MC.bg;
+  }
+
+  // ── Entry points ──
+  var DRAW = {gantt: drawGantt, milestone: drawMilestone};
+
+  function render(container, layout) {
+    if (layout.v !== LAYOUT_VERSION || !DRAW[layout.chart]) {
+      throw new Error('unsupported chart layout ' + layout.chart + ' v' + layout.v +
+                      ' (renderer v' + LAYOUT_VERSION + ')');
+    }
+    var svg = el('svg', {xmlns: NS, 'xml:space': 'preserve', style: 'max-width: 100%; height: auto; white-space: pre'});
+    container.appendChild(svg);      // measuring text needs the SVG in the document
+    var canvas = new Canvas(svg, layout);
+    canvas.fit(DRAW[layout.chart](canvas, layout));
+    return svg;
+  }
+
+  function load(node) {
+    var inline = node.querySelector('script[type="application/json"]');
+    if (inline) return Promise.resolve(JSON.parse(inline.textContent));
+    var src = node.getAttribute('data-chart-layout');
+    return fetch(src, {credentials: 'same-origin'}).then(function (resp) {
+      if (!resp.ok) throw new Error(src + ': HTTP ' + resp.status);
+      return resp.json();
+    });
+  }
+
+  function renderAll(root) {
+    var nodes = (root || document).querySelectorAll('[data-chart-layout]:not([data-chart-rendered])');
+    Array.prototype.forEach.call(nodes, function (node) {
+      node.setAttribute('data-chart-rendered', '');
+      load(node).then(function (layout) {
+        render(node, layout);
+      }).catch(function (err) {
+        node.textContent = 'Chart could not be drawn: ' + err.message;
+      });
+    });
+  }
+
+  window.ChartLayout = {render: render, renderAll: renderAll, version: LAYOUT_VERSION};
+  if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', function () { renderAll(); });
+  } else {
+    renderAll();
+  }
+})();
@@ -0,0 +1,165 @@
+"""Local stand-in for the Confluence attachment REST API, for trying publish.py.
+
+Implements just what publish.py calls, in memory:
+
+  GET /rest/api/content/{page}/child/attachment?start=&limit=
+  PUT /rest/api/content/{page}/child/attachment      (multipart 'file')
+
+PUT creates the attachment or adds a version, and like Confluence
+rejects requests without X-Atlassian-Token: no-check. --fail-rate
+answers that share of requests with 503 and Retry-After: 0 to exercise
+retries (tests queue exact statuses in .fail_next instead), and
+--latency delays every response. On exit it prints how
+many requests arrived over how many connections.
+
+    python confluence_stub.py [--port 8090] [--fail-rate 0.2] [--latency 0.05]
+
+serve() runs it on a background thread instead and returns the server,
+whose .url is the base URL to hand to ConfluenceClient.
+"""
+import argparse
+import email.parser
+import email.policy
+import json
+import random
+import re
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ATTACHMENTS_RE = re.compile(r'^/rest/api/content/(\w+)/child/attachment$')
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, fail_rate=0.0, latency=0.0):
+        super().__init__(address, StubHandler)
+        self.fail_rate = fail_rate
+        self.latency = latency
+        self.pages = {}         # page id -> {title: {'id', 'version', 'data'}}
+        self.fail_next = []     # statuses for the next requests, e.g. [503, 429]
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.connections = 0
+        self.next_id = 1
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'       # keep-alive, so client pooling is visible
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def _send(self, status, body=None, headers=()):
+        data = json.dumps(body).encode() if body is not None else b''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for key, value in headers:
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _route(self):
+        """Page id for an attachment URL after the common checks, else None (response sent)."""
+        length = int(self.headers.get('Content-Length') or 0)
+        self.body = self.rfile.read(length) if length else b''
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            status = server.fail_next.pop(0) if server.fail_next else None
+        if server.latency:
+            time.sleep(server.latency)
+        if status is None and random.random() < server.fail_rate:
+            status = 503
+        if status is not None:
+            self._send(status, {'message': 'injected failure'}, [('Retry-After', '0')])
+            return None
+        url = urllib.parse.urlsplit(self.path)
+        m = ATTACHMENTS_RE.match(url.path)
+        if not m:
+            self._send(404, {'message': f'no route for {url.path}'})
+            return None
+        self.query = urllib.parse.parse_qs(url.query)
+        return m.group(1)
+
+    @staticmethod
+    def _json(page_id, title, att):
+        return {'id': att['id'], 'type': 'attachment', 'title': title,
+                'version': {'number': att['version']},
+                '_links': {'download': f'/download/attachments/{page_id}/{title}'}}
+
+    def do_GET(self):
+        page_id = self._route()
+        if page_id is None:
+            return
+        start = int(self.query.get('start', ['0'])[0])
+        limit = int(self.query.get('limit', ['25'])[0])
+        with self.server.lock:
+            items = sorted(self.server.pages.get(page_id, {}).items())
+        results = [self._json(page_id, title, att) for title, att in items[start:start + limit]]
+        links = {'next': f'{self.path}'} if start + limit < len(items) else {}
+        self._send(200, {'results': results, 'start': start, 'limit': limit, 'size': len(results),
+                         '_links': links})
+
+    def do_PUT(self):
+        page_id = self._route()
+        if page_id is None:
+            return
+        if self.headers.get('X-Atlassian-Token') != 'no-check':
+            self._send(403, {'message': 'XSRF check failed'})
+            return
+        head = f'Content-Type: {self.headers.get("Content-Type", "")}\r\n\r\n'.encode()
+        msg = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(head + self.body)
+        files = [part for part in msg.iter_parts() if part.get_param('name', header='content-disposition') == 'file']
+        if not files or not files[0].get_filename():
+            self._send(400, {'message': 'missing file part'})
+            return
+        title, data = files[0].get_filename(), files[0].get_payload(decode=True)
+        with self.server.lock:
+            page = self.server.pages.setdefault(page_id, {})
+            att = page.get(title)
+            if att is None:
+                att = page[title] = {'id': f'att{self.server.next_id}', 'version': 0}
+                self.server.next_id += 1
+            att['version'] += 1
+            att['data'] = data
+            result = self._json(page_id, title, att)
+        self._send(200, {'results': [result], 'size': 1})
+
+
+def serve(port=0, fail_rate=0.0, latency=0.0):
+    """Start a StubServer on 127.0.0.1 in a daemon thread; call .shutdown() to stop it."""
+    server = StubServer(('127.0.0.1', port), fail_rate, latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run a local stand-in Confluence attachment API.')
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--fail-rate', type=float, default=0.0,
+                        help='share of requests answered with 503 (default: 0)')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every response')
+    args = parser.parse_args()
+
+    server = StubServer(('127.0.0.1', args.port), args.fail_rate, args.latency)
+    print(f"serving on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"{server.requests} requests over {server.connections} connections")
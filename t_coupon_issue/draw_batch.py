@@ -0,0 +1,103 @@
+"""Batched matplotlib drawing for the chart scripts.
+
+Adding every bar as its own FancyBboxPatch and every label as its own
+ax.text makes hundreds of artists, each with its own property handling,
+stale tracking and tight-bbox pass. Here bars go into one PatchCollection
+per z-layer and labels into a TextLayer, a single artist that draws all
+of its strings through one reused Text instance. In SVG a TextLayer is
+one <g> of <text> elements, instead of a <g> (and id) per label.
+"""
+from matplotlib.artist import Artist
+from matplotlib.collections import PatchCollection
+from matplotlib.text import Text
+from matplotlib.transforms import Bbox
+
+LEGACY_LINESPACING = 1.2    # Text default before matplotlib had get_linespacing()
+
+
+class PatchBatch:
+    """Collects patches and adds them to the axes as one collection."""
+
+    def __init__(self, zorder):
+        self.zorder = zorder
+        self.patches = []
+
+    def add(self, patch):
+        self.patches.append(patch)
+
+    def add_to(self, ax):
+        if self.patches:
+            ax.add_collection(PatchCollection(self.patches, match_original=True,
+                                              zorder=self.zorder),
+                              autolim=False)
+
+
+class _SharedGroup:
+    """Renderer view without open_group/close_group, so the labels (and
+    their bbox patches) land in the group their TextLayer opened."""
+
+    def __init__(self, renderer):
+        self._renderer = renderer
+
+    def __getattr__(self, name):
+        return getattr(self._renderer, name)
+
+    def open_group(self, s, gid=None):
+        pass
+
+    def close_group(self, s):
+        pass
+
+
+class TextLayer(Artist):
+    """Many ax.text-style labels drawn by a single artist.
+
+    text() takes the same arguments as ax.text. Unset properties fall back
+    to matplotlib's defaults, so each label looks as if drawn on its own.
+    """
+
+    def __init__(self, ax, zorder=3):
+        super().__init__()
+        self.set_zorder(zorder)
+        self.set_clip_on(False)
+        self.axes = ax
+        self.set_figure(ax.figure)
+        self._text = Text()
+        self._text.set_figure(ax.figure)
+        self._text.set_clip_on(False)
+        self._items = []
+        # Pristine Text properties, restored before each label
+        t = self._text
+        self._base = {
+            'fontproperties': t.get_fontproperties().copy(),
+            'color': t.get_color(), 'ha': t.get_ha(), 'va': t.get_va(),
+            'linespacing': (t.get_linespacing() if hasattr(t, 'get_linespacing')
+                            else LEGACY_LINESPACING),
+            'bbox': None,
+            'transform': ax.transData,
+        }
+
+    def text(self, x, y, s, **kwargs):
+        self._items.append((x, y, s, kwargs))
+
+    def _each(self):
+        t = self._text
+        for x, y, s, kwargs in self._items:
+            t.update({**self._base, **kwargs})
+            t.set_position((x, y))
+            t.set_text(s)
+            yield t
+
+    def draw(self, renderer):
+        if not self.get_visible():
+            return
+        renderer.open_group('textlayer', self.get_gid())
+        shared = _SharedGroup(renderer)
+        for t in self._each():
+            t.draw(shared)
+        renderer.close_group('textlayer')
+        self.stale = False
+
+    def get_window_extent(self, renderer=None):
+        boxes = [t.get_window_extent(renderer).frozen() for t in self._each()]
+        return Bbox.union(boxes) if boxes else Bbox.null()
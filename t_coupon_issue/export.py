@@ -0,0 +1,152 @@
+"""Save one laid-out figure in several formats.
+
+savefig(bbox_inches='tight') measures the figure with a full draw for
+every file it writes. export_figure() measures it once, hands the same
+padded bbox to each format, and keeps the raster path off the critical
+path: the Agg draw happens here, but PNG encoding (zlib, which releases
+the GIL) runs in a worker thread while the vector formats are written.
+
+Output is byte-stable: the same figure gives the same bytes in every
+format on every run. SVG and PDF leave out their creation date, SVG
+element ids are hashed with a fixed salt (theme.HASH_SALT) instead of a
+random one, and PNGs carry only the Software tag. Unchanged charts
+therefore produce no git diff, and their build-cache and upload-manifest
+hashes stay the same.
+
+    paths = export_figure(fig, 'out/gantt.svg', ['svg', 'png', 'pdf'],
+                          dpi={'png': 200}, facecolor='#ffffff')
+"""
+import argparse
+import io
+import os
+
+from profiling import span
+
+RASTER_FORMATS = ('png',)
+VECTOR_FORMATS = ('svg', 'pdf')
+FORMATS = VECTOR_FORMATS + RASTER_FORMATS
+DEFAULT_DPI = {'svg': 150, 'pdf': 150, 'png': 150}
+TIGHT_PAD = 0.1   # inches, savefig's default pad_inches
+# Metadata keys whose matplotlib default is the current time
+STABLE_METADATA = {'svg': {'Date': None}, 'pdf': {'CreationDate': None}}
+
+_pool = None
+
+
+def _encoder_pool():
+    global _pool
+    if _pool is None:
+        from concurrent.futures import ThreadPoolExecutor
+        _pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='png-encode')
+    return _pool
+
+
+def parse_formats(value):
+    """'svg,png' -> ['svg', 'png'] (argparse type)."""
+    formats = [f.strip().lower() for f in value.split(',') if f.strip()]
+    for fmt in formats:
+        if fmt not in FORMATS:
+            raise ValueError(f'unknown format {fmt!r} (choose from {", ".join(FORMATS)})')
+    return formats
+
+
+def dpi_spec(value):
+    """'png=300' -> ('png', 300.0) (argparse type for --dpi)."""
+    fmt, eq, number = value.partition('=')
+    fmt = fmt.strip().lower()
+    if not eq or not fmt:
+        raise argparse.ArgumentTypeError(f'{value!r}: expected FMT=DPI, e.g. png=300')
+    if fmt not in FORMATS:
+        raise argparse.ArgumentTypeError(f'unknown format {fmt!r} (choose from {", ".join(FORMATS)})')
+    try:
+        dpi = float(number)
+    except ValueError:
+        dpi = None
+    if dpi is None or not 0 < dpi < float('inf'):
+        raise argparse.ArgumentTypeError(f'{value!r}: DPI must be a positive number')
+    return fmt, dpi
+
+
+def parse_dpi(specs):
+    """--dpi values, ('png', 300.0) pairs or 'png=300' strings -> {'png': 300.0}."""
+    return dict(spec if isinstance(spec, tuple) else dpi_spec(spec) for spec in specs or ())
+
+
+def output_paths(out_path, formats):
+    """out_path with its extension swapped for each format."""
+    stem = os.path.splitext(out_path)[0]
+    return [f'{stem}.{fmt}' for fmt in formats]
+
+
+def tight_bbox(fig, pad=TIGHT_PAD):
+    """Padded tight bounding box of fig in inches (no full draw needed).
+
+    Text is measured the way the SVG backend measures it (unhinted
+    outlines at 72 dpi), so the SVG matches a bbox_inches='tight' save
+    exactly and the other formats share its layout.
+    """
+    from matplotlib.backends.backend_svg import RendererSVG
+
+    dpi = fig.dpi
+    fig.dpi = 72
+    try:
+        w, h = fig.get_size_inches() * 72
+        return fig.get_tightbbox(RendererSVG(w, h, io.StringIO())).padded(pad)
+    finally:
+        fig.dpi = dpi
+
+
+def _rasterize(fig, dpi, bbox, **savefig_kw):
+    """Draw fig with Agg; returns (rgba bytes, (width, height))."""
+    buf = io.BytesIO()
+    fig.savefig(buf, format='rgba', dpi=dpi, bbox_inches=bbox, **savefig_kw)
+    # Agg sizes its canvas as int(bbox * dpi), the same as here
+    size = int(bbox.width * dpi), int(bbox.height * dpi)
+    rgba = buf.getvalue()
+    if len(rgba) != size[0] * size[1] * 4:
+        raise RuntimeError(f'unexpected raster size for {size}: {len(rgba)} bytes')
+    return rgba, size
+
+
+def _encode_png(rgba, size, dpi, path):
+    """Write RGBA bytes as PNG with the metadata matplotlib's imsave adds."""
+    import matplotlib
+    from PIL import Image
+    from PIL.PngImagePlugin import PngInfo
+
+    info = PngInfo()
+    info.add_text('Software', f'Matplotlib version{matplotlib.__version__}, https://matplotlib.org/')
+    image = Image.frombuffer('RGBA', size, rgba, 'raw', 'RGBA', 0, 1)
+    with span('export.encode_png', bytes=len(rgba)):
+        image.save(path, format='png', pnginfo=info, dpi=(dpi, dpi))
+    return path
+
+
+def export_figure(fig, out_path, formats=None, dpi=None, **savefig_kw):
+    """Write fig as each format next to out_path; returns the paths written.
+
+    formats defaults to out_path's own extension; dpi maps a format to its
+    resolution, falling back to DEFAULT_DPI. savefig_kw (facecolor,
+    edgecolor, ...) are passed to every savefig call.
+    """
+    formats = formats or [os.path.splitext(out_path)[1].lstrip('.').lower()]
+    dpi = {**DEFAULT_DPI, **(dpi or {})}
+    paths = dict(zip(formats, output_paths(out_path, formats)))
+    with span('export.tight_bbox'):
+        bbox = tight_bbox(fig)
+
+    # Rasters first, so their encoding overlaps the vector writes
+    pending = []
+    for fmt in sorted(formats, key=lambda f: f not in RASTER_FORMATS):
+        if fmt in RASTER_FORMATS:
+            with span('export.rasterize', format=fmt, dpi=dpi[fmt]):
+                rgba, size = _rasterize(fig, dpi[fmt], bbox, **savefig_kw)
+            pending.append(_encoder_pool().submit(_encode_png, rgba, size, dpi[fmt], paths[fmt]))
+        else:
+            with span('export.savefig', format=fmt):
+                fig.savefig(paths[fmt], format=fmt, dpi=dpi[fmt], bbox_inches=bbox,
+                            metadata=STABLE_METADATA[fmt], **savefig_kw)
+    with span('export.wait_encode'):
+        for future in pending:
+            future.result()
+    return [paths[fmt] for fmt in formats]
@@ -0,0 +1,280 @@
+"""Chart font chain: resolution, persistence and SVG embedding.
+
+The charts want a Korean-capable sans font. Render hosts differ: macOS
+has Apple SD Gothic Neo, Linux build machines have Noto or Nanum, and
+matplotlib always bundles DejaVu Sans. FONT_CHAIN lists the families in
+order of preference. Set CHART_FONTS="A,B,..." to use a different chain.
+
+resolve() maps the chain to the installed families and their files
+once, by reading the name tables of the fonts in the usual font
+directories with fontTools (matplotlib's bundled fonts first). It does
+not import matplotlib, so the direct SVG backend does not pay for it.
+The result is persisted in the asset cache, so later processes skip the
+search, and theme.py hands matplotlib only families it knows, so it
+never warns about them or falls back. Output stays the same from run to
+run on one host.
+
+With svg.fonttype='none' an SVG names its fonts and the viewer
+supplies them. embed_svg_fonts() makes it self-contained instead: each
+family gets a WOFF subset holding only the glyphs the SVG uses, inlined
+as @font-face. PNG and PDF need none of this, since Agg and the PDF
+backend already draw or subset glyphs from the resolved files.
+
+    python fonts.py                      # show the resolved chain
+    python fonts.py --embed out/*.svg    # embed font subsets in place
+"""
+import argparse
+import base64
+import hashlib
+import html
+import importlib.util
+import json
+import os
+import re
+import sys
+
+from profiling import span
+
+FONT_CHAIN = ['Apple SD Gothic Neo', 'Noto Sans CJK KR', 'Noto Sans KR', 'NanumGothic',
+              'Malgun Gothic', 'DejaVu Sans']
+LAST_RESORT = 'DejaVu Sans'     # bundled with matplotlib, so always installed
+FONT_SUFFIXES = ('.ttf', '.otf', '.ttc', '.otc')
+REGULAR_WEIGHT = 400
+
+_TEXT_RE = re.compile(r'<(?:text|tspan)\b[^>]*>([^<]+)<')
+_SVG_OPEN_RE = re.compile(r'<svg\b[^>]*>')
+
+_resolved = {}
+
+
+def font_chain():
+    """Families in preference order (CHART_FONTS overrides FONT_CHAIN)."""
+    env = os.environ.get('CHART_FONTS')
+    if env:
+        return [f.strip() for f in env.split(',') if f.strip()]
+    return list(FONT_CHAIN)
+
+
+def _cache_file():
+    from text_metrics import CACHE_DIR
+    return os.path.join(CACHE_DIR, 'font-resolution.json')
+
+
+def font_dirs():
+    """Directories searched for fonts: matplotlib's bundled ones, then the system's."""
+    dirs = []
+    spec = importlib.util.find_spec('matplotlib')
+    if spec and spec.submodule_search_locations:
+        dirs.append(os.path.join(spec.submodule_search_locations[0], 'mpl-data', 'fonts', 'ttf'))
+    home = os.path.expanduser('~')
+    if sys.platform == 'darwin':
+        dirs += ['/System/Library/Fonts', '/Library/Fonts', os.path.join(home, 'Library', 'Fonts')]
+    elif sys.platform == 'win32':
+        windir = os.environ.get('WINDIR', r'C:\Windows')
+        dirs += [os.path.join(windir, 'Fonts'),
+                 os.path.join(os.environ.get('LOCALAPPDATA', ''), 'Microsoft', 'Windows', 'Fonts')]
+    else:
+        data_home = os.environ.get('XDG_DATA_HOME', os.path.join(home, '.local', 'share'))
+        dirs += ['/usr/share/fonts', '/usr/local/share/fonts', os.path.join(data_home, 'fonts'),
+                 os.path.join(home, '.fonts')]
+    return [d for d in dirs if os.path.isdir(d)]
+
+
+def _font_files():
+    for root in font_dirs():
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames.sort()
+            for name in sorted(filenames):
+                if name.lower().endswith(FONT_SUFFIXES):
+                    yield os.path.join(dirpath, name)
+
+
+def _face(path):
+    """(family names, weight distance from regular, italic) of a file's first face, or None."""
+    from fontTools.ttLib import TTFont, TTLibError
+
+    try:
+        font = TTFont(path, fontNumber=0, lazy=True)
+        try:
+            names = {rec.toUnicode() for rec in font['name'].names if rec.nameID in (1, 16)}
+            os2 = font['OS/2'] if 'OS/2' in font else None
+            weight = os2.usWeightClass if os2 is not None else REGULAR_WEIGHT
+            italic = bool(os2.fsSelection & 0x201) if os2 is not None else False   # ITALIC | OBLIQUE
+        finally:
+            font.close()
+    except (OSError, TTLibError, KeyError, UnicodeDecodeError, AssertionError):
+        return None
+    return names, abs(weight - REGULAR_WEIGHT), italic
+
+
+def _search(chain):
+    """[(family, file)] for the installed families of chain.
+
+    A family's file is its upright face closest to regular weight, the
+    first found on a tie. Without fontTools nothing is found.
+    """
+    try:
+        import fontTools  # noqa: F401
+    except ImportError:
+        return []
+    wanted = set(chain) | {LAST_RESORT}
+    best = {}
+    for path in _font_files():
+        face = _face(path)
+        if face is None:
+            continue
+        names, distance, italic = face
+        for family in names & wanted:
+            score = (italic, distance)
+            if family not in best or score < best[family][0]:
+                best[family] = (score, path)
+    found = [(family, best[family][1]) for family in chain if family in best]
+    if not found and LAST_RESORT in best:
+        found.append((LAST_RESORT, best[LAST_RESORT][1]))
+    return found
+
+
+def resolve(chain=None):
+    """[(family, font file)] for the installed members of chain, in order.
+
+    Persisted per chain; an entry whose files have gone is searched again.
+    """
+    chain = chain or font_chain()
+    key = '|'.join(chain)
+    if key in _resolved:
+        return _resolved[key]
+
+    cache_file = _cache_file()
+    try:
+        with open(cache_file, encoding='utf-8') as f:
+            persisted = json.load(f)
+    except (OSError, ValueError):
+        persisted = {}
+    found = [tuple(entry) for entry in persisted.get(key, ())]
+    if not found or not all(os.path.exists(path) for _, path in found):
+        with span('fonts.search'):
+            found = _search(chain)
+        if not found:           # nothing to persist; callers fall back
+            _resolved[key] = found
+            return found
+        persisted[key] = found
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        tmp = f'{cache_file}.{os.getpid()}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(persisted, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, cache_file)
+    _resolved[key] = found
+    return found
+
+
+def families():
+    """Installed chain families (the whole chain when none could be resolved)."""
+    return [family for family, _ in resolve()] or font_chain()
+
+
+def css_family(names=None):
+    """font-family value naming names (default: the whole configured chain)."""
+    return ', '.join(f"'{name}'" for name in (names or font_chain()))
+
+
+# ── Embedding ──
+def svg_text_chars(svg):
+    """Every character drawn as text in svg."""
+    return set(''.join(html.unescape(m) for m in _TEXT_RE.findall(svg))) - {'\n'}
+
+
+def _cmap(path):
+    from fontTools.ttLib import TTFont
+    font = TTFont(path, fontNumber=0, lazy=True)
+    cmap = set(font.getBestCmap())
+    font.close()
+    return cmap
+
+
+def _subset_woff(path, chars):
+    """WOFF bytes of path cut down to chars (cached on disk by font and chars)."""
+    from text_metrics import CACHE_DIR
+
+    st = os.stat(path)
+    key = hashlib.sha1(f"{os.path.abspath(path)}:{st.st_size}:{st.st_mtime_ns}:"
+                       f"{''.join(sorted(chars))}".encode()).hexdigest()[:16]
+    cache_file = os.path.join(CACHE_DIR, f'font-subset-{key}.woff')
+    try:
+        with open(cache_file, 'rb') as f:
+            return f.read()
+    except OSError:
+        pass
+
+    from fontTools import subset
+    from fontTools.ttLib import TTFont
+
+    options = subset.Options()
+    options.flavor = 'woff'
+    options.layout_features = ['*']
+    options.name_IDs = ['*']
+    options.drop_tables += ['FFTM']     # FontForge timestamps, not subsettable
+    font = TTFont(path, fontNumber=0, recalcTimestamp=False)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=[ord(c) for c in chars])
+    subsetter.subset(font)
+    tmp = f'{cache_file}.{os.getpid()}.tmp'
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    font.flavor = 'woff'
+    font.save(tmp)
+    os.replace(tmp, cache_file)
+    with open(cache_file, 'rb') as f:
+        return f.read()
+
+
+def font_faces(chars, resolved=None):
+    """@font-face rules covering chars with subsets of the resolved fonts.
+
+    Each character goes to the first font in the chain that has it;
+    characters no font has are left to the viewer.
+    """
+    remaining = {c for c in chars if not c.isspace()}
+    rules = []
+    for family, path in resolved or resolve():
+        if not remaining:
+            break
+        cmap = _cmap(path)
+        mine = {c for c in remaining if ord(c) in cmap}
+        if not mine:
+            continue
+        remaining -= mine
+        data = base64.b64encode(_subset_woff(path, mine)).decode('ascii')
+        rules.append(f"@font-face{{font-family:'{family}';"
+                     f"src:url(data:font/woff;base64,{data}) format('woff')}}")
+    return rules
+
+
+def embed_svg_fonts(svg, resolved=None):
+    """svg with a <style> of @font-face subsets for its text."""
+    rules = font_faces(svg_text_chars(svg), resolved)
+    opening = _SVG_OPEN_RE.search(svg)
+    if not rules or opening is None:
+        return svg
+    style = '<style>' + ''.join(rules) + '</style>'
+    return svg[:opening.end()] + '\n' + style + svg[opening.end():]
+
+
+def embed_file(path, out_path=None):
+    """Embed font subsets into the SVG at path; returns (bytes before, bytes after)."""
+    with open(path, encoding='utf-8') as f:
+        svg = f.read()
+    embedded = embed_svg_fonts(svg)
+    with open(out_path or path, 'w', encoding='utf-8') as f:
+        f.write(embedded)
+    return len(svg.encode('utf-8')), len(embedded.encode('utf-8'))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Show the resolved chart fonts or embed them in SVGs.')
+    parser.add_argument('--embed', nargs='+', metavar='SVG', help='SVG files to embed fonts into')
+    args = parser.parse_args()
+
+    for family, path in resolve():
+        print(f"{family}: {path}")
+    for path in args.embed or ():
+        before, after = embed_file(path)
+        print(f"OK: {path} ({before:,} -> {after:,} bytes)")
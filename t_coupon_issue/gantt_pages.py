@@ -0,0 +1,230 @@
+"""Paged / tiled Gantt charts for large plans.
+
+A plan with hundreds of rows or many quarters of weeks does not fit one
+readable image. paginate() cuts it into page plans:
+
+  - week windows: the x-range is split into windows of window_weeks;
+    a window keeps only the tasks that intersect it (looked up in an
+    IntervalIndex, not by scanning every task), clipped to its edges
+    and shifted so the window starts at W1 of the page
+  - row pages: each window's rows are split every rows_per_page rows
+
+Every page is an ordinary Gantt plan, so timeline_gantt.render() draws
+it unchanged, and pages render independently (-j N runs them in worker
+processes).
+
+    python gantt_pages.py plan.json -o out/gantt.svg [--rows-per-page 40]
+                          [--window-weeks 13] [-j 4] [-f svg,png]
+"""
+import argparse
+import os
+import time
+
+import timeline_gantt
+from export import dpi_spec, parse_dpi, parse_formats
+from theme import setup_matplotlib
+
+ROWS_PER_PAGE = 40
+
+
+class IntervalIndex:
+    """Static centered interval tree over half-open [start, end) intervals.
+
+    overlapping(lo, hi) returns the items whose interval intersects
+    [lo, hi) in O(log n + k).
+    """
+
+    def __init__(self, intervals):
+        """intervals: iterable of (start, end, item)."""
+        self._root = self._build([iv for iv in intervals if iv[0] < iv[1]])
+
+    @classmethod
+    def _build(cls, intervals):
+        if not intervals:
+            return None
+        # The median start: its own interval contains it, so every level
+        # keeps at least one interval and the recursion ends
+        starts = sorted(iv[0] for iv in intervals)
+        center = starts[len(starts) // 2]
+        left, here, right = [], [], []
+        for iv in intervals:
+            if iv[1] <= center:
+                left.append(iv)
+            elif iv[0] > center:
+                right.append(iv)
+            else:
+                here.append(iv)
+        by_start = sorted(here, key=lambda iv: iv[0])
+        by_end = sorted(here, key=lambda iv: iv[1], reverse=True)
+        return center, by_start, by_end, cls._build(left), cls._build(right)
+
+    def overlapping(self, lo, hi):
+        found = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            center, by_start, by_end, left, right = node
+            if hi <= center:
+                # Everything here contains center, so overlaps iff start < hi
+                for s, _, item in by_start:
+                    if s >= hi:
+                        break
+                    found.append(item)
+                stack.append(left)
+            elif lo > center:
+                for _, e, item in by_end:
+                    if e <= lo:
+                        break
+                    found.append(item)
+                stack.append(right)
+            else:
+                found.extend(item for _, _, item in by_start)
+                stack.append(left)
+                stack.append(right)
+        return found
+
+
+def task_index(phases):
+    """IntervalIndex over a plan's tasks; items are (phase index, task index, task)."""
+    return IntervalIndex((t[3], t[4], (pi, ti, t))
+                         for pi, phase in enumerate(phases)
+                         for ti, t in enumerate(phase['tasks']))
+
+
+def _week_name(label):
+    return label.split('\n')[0]
+
+
+def window_plan(plan, first, last, index=None):
+    """Plan restricted to weeks first..last (1-based, inclusive).
+
+    Tasks are clipped to the window and shifted so week first becomes
+    W1; milestones outside it are dropped. index is task_index() of the
+    plan's phases, built here when not given.
+    """
+    plan = timeline_gantt.normalize_plan(plan)
+    index = index or task_index(plan['phases'])
+    shift = first - 1
+
+    tasks = {}
+    for pi, ti, t in sorted(index.overlapping(first, last + 1), key=lambda hit: hit[:2]):
+        role, name, md, start, end, *rest = t
+        start, end = max(start, first), min(end, last + 1)
+        tasks.setdefault(pi, []).append((role, name, md, start - shift, end - shift, *rest))
+
+    return {
+        **plan,
+        'phases': [{**phase, 'tasks': tasks[pi]}
+                   for pi, phase in enumerate(plan['phases']) if pi in tasks],
+        'milestones': [(n, label, week - shift, gate) for n, label, week, gate in plan['milestones']
+                       if first <= week <= last],
+        'week_labels': plan['week_labels'][first - 1:last],
+    }
+
+
+def split_rows(plan, rows_per_page=ROWS_PER_PAGE):
+    """Split plan into plans of at most rows_per_page chart rows each.
+
+    Rows are packed once for the whole plan; a page keeps the tasks of
+    its rows, so its own packing gives back the same rows.
+    """
+    entries = [(phase, row) for phase in plan['phases']
+               for row in timeline_gantt.build_rows([phase])]
+    pages = []
+    for i in range(0, len(entries), rows_per_page):
+        phases = []
+        for phase, row in entries[i:i + rows_per_page]:
+            if not phases or phases[-1][0] is not phase:
+                phases.append((phase, []))
+            phases[-1][1].extend(row['tasks'])
+        pages.append({**plan, 'phases': [{**phase, 'tasks': tasks} for phase, tasks in phases]})
+    return pages or [plan]
+
+
+def paginate(plan, rows_per_page=ROWS_PER_PAGE, window_weeks=None):
+    """Page plans covering plan: week windows of window_weeks, then row pages.
+
+    Each page's title names its window and page number; the header's
+    MD total stays the whole plan's.
+    """
+    plan = timeline_gantt.normalize_plan(plan)
+    n_weeks = len(plan['week_labels'])
+    window_weeks = min(window_weeks or n_weeks, n_weeks)
+    index = task_index(plan['phases'])
+
+    pages = []
+    for first in range(1, n_weeks + 1, window_weeks):
+        last = min(first + window_weeks - 1, n_weeks)
+        window = plan if window_weeks == n_weeks else window_plan(plan, first, last, index)
+        row_pages = split_rows(window, rows_per_page)
+        for i, page in enumerate(row_pages, 1):
+            parts = []
+            if window_weeks < n_weeks:
+                parts.append(f"{_week_name(plan['week_labels'][first - 1])}"
+                             f"\u2013{_week_name(plan['week_labels'][last - 1])}")
+            if len(row_pages) > 1:
+                parts.append(f'{i}/{len(row_pages)}')
+            if parts:
+                page['title'] = f"{plan['title']}  ({', '.join(parts)})"
+            pages.append(page)
+    return pages
+
+
+def page_path(out_path, n):
+    stem, ext = os.path.splitext(out_path)
+    return f'{stem}-p{n:02d}{ext}'
+
+
+def _render_page(args):
+    return timeline_gantt.render_formats(*args)
+
+
+def render_pages(plan, out_path, rows_per_page=ROWS_PER_PAGE, window_weeks=None, jobs=1,
+                 formats=None, dpi=None, backend='matplotlib'):
+    """Render every page of plan next to out_path; returns [paths per page]."""
+    formats = formats or parse_formats(os.path.splitext(out_path)[1].lstrip('.'))
+    pages = paginate(plan, rows_per_page, window_weeks)
+    todo = [(page, page_path(out_path, n), formats, dpi, backend)
+            for n, page in enumerate(pages, 1)]
+    needs_mpl = backend != 'svg' or formats != ['svg']
+
+    if jobs > 1 and len(todo) > 1:
+        init = setup_matplotlib if needs_mpl else None
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=jobs, initializer=init) as pool:
+            return list(pool.map(_render_page, todo))
+    return [_render_page(job) for job in todo]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Render a large Gantt plan as pages / week tiles.')
+    parser.add_argument('plan', nargs='?',
+                        help="JSON/YAML plan (its 'gantt' section if present; default: built-in PLAN)")
+    parser.add_argument('-o', '--output', default=timeline_gantt.OUT_PATH,
+                        help='base path; pages are written as <stem>-pNN<ext>')
+    parser.add_argument('--rows-per-page', type=int, default=ROWS_PER_PAGE)
+    parser.add_argument('--window-weeks', type=int,
+                        help='weeks per tile (default: all weeks on each page)')
+    parser.add_argument('-j', '--jobs', type=int, default=1)
+    parser.add_argument('--backend', choices=['matplotlib', 'svg'], default='matplotlib')
+    parser.add_argument('-f', '--formats', type=parse_formats,
+                        help='comma-separated formats, e.g. svg,png,pdf (default: from -o)')
+    parser.add_argument('--dpi', action='append', type=dpi_spec, metavar='FMT=DPI',
+                        help='per-format resolution, e.g. png=300 (repeatable)')
+    args = parser.parse_args()
+
+    plan = timeline_gantt.PLAN
+    if args.plan:
+        from render_all import load_plan
+        data = load_plan(args.plan)
+        plan = {'title': data.get('title', ''), **data['gantt']} if 'gantt' in data else data
+
+    t0 = time.perf_counter()
+    results = render_pages(plan, args.output, args.rows_per_page, args.window_weeks, args.jobs,
+                           args.formats, parse_dpi(args.dpi), args.backend)
+    for paths in results:
+        for path in paths:
+            print(f"OK: {path}")
+    print(f"{len(results)} pages in {time.perf_counter() - t0:.2f}s")
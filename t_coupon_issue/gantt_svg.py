@@ -0,0 +1,377 @@
+"""Direct SVG backend for the implementation Gantt chart.
+
+Emits the same drawing as timeline_gantt.render() as plain SVG strings
+(rounded <rect>, <text>, <line>, <path>) without importing matplotlib,
+even on a cold cache: the font chain and its glyph widths are read with
+fontTools (fonts.py, text_metrics.py), and with no font found the label
+widths fall back to the CJK / non-CJK estimate.
+Geometry reproduces matplotlib's defaults for this figure: the size from
+timeline_gantt.figure_size() at 72 pt/in, default subplot margins and a
+bbox_inches='tight' crop with a 0.1 in pad.
+
+With stream=True (--stream) rows are generated, labelled and drawn one
+at a time (iter_rows, iter_bar_labels). Each element is written to a
+temporary file per z-order layer instead of being kept in a list. The
+header, whose viewBox depends on every element, is written last, followed
+by the layers. Memory then stays flat however many tasks the plan has.
+
+    python gantt_svg.py [plan.json] [-o out.svg] [--stream]
+"""
+import argparse
+import math
+import shutil
+import tempfile
+from html import escape
+
+import fonts
+from profiling import stages
+
+from timeline_gantt import (
+    C, ROLE_COLORS, HEADER_Y, ROW_H, BAR_H, LEFT_COL_W, OUT_PATH, PLAN,
+    w, text_width_est, row_center, chart_bottom, bar_labels, iter_bar_labels, build_rows, iter_rows,
+    normalize_plan, figure_size, x_limits, y_limits,
+)
+
+# ── Figure geometry (points) ──
+FIG_W, FIG_H = 24 * 72, 16 * 72
+AX_LEFT, AX_RIGHT, AX_BOTTOM, AX_TOP = 0.125, 0.9, 0.11, 0.88   # figure.subplot.*
+TIGHT_PAD = 0.1 * 72
+
+# Font metrics as fractions of the font size, used for vertical alignment
+# and for the tight bounding box (matplotlib measures the real glyphs).
+ASCENT = 0.76
+DESCENT = 0.24
+
+WEIGHTS = {'bold': 700, 'medium': 500}
+SVG_TAIL = '</g>\n</svg>\n'
+
+
+def _num(v):
+    """Compact float formatting for coordinates."""
+    return f'{v:.3f}'.rstrip('0').rstrip('.')
+
+
+class SvgCanvas:
+    """Collects SVG elements in data coordinates and writes them z-ordered."""
+
+    def __init__(self, xlim, ylim, figsize=(FIG_W, FIG_H)):
+        self.fig_w, self.fig_h = figsize
+        self.x0, self.x1 = xlim
+        self.y0, self.y1 = ylim
+        self.ax_left = AX_LEFT * self.fig_w
+        self.ax_top = (1 - AX_TOP) * self.fig_h
+        self.sx = (AX_RIGHT - AX_LEFT) * self.fig_w / (self.x1 - self.x0)
+        self.sy = (AX_TOP - AX_BOTTOM) * self.fig_h / (self.y1 - self.y0)
+        # Tight bbox starts from the axes box, like matplotlib's
+        self.bbox = [self.ax_left, self.ax_top,
+                     AX_RIGHT * self.fig_w, (1 - AX_BOTTOM) * self.fig_h]
+        self._elems = []
+
+    # ── Transforms ──
+    def px(self, x):
+        return self.ax_left + (x - self.x0) * self.sx
+
+    def py(self, y):
+        return self.ax_top + (self.y1 - y) * self.sy
+
+    def _add(self, zorder, svg, extent=None):
+        self._elems.append((zorder, len(self._elems), svg))
+        self._extend(extent)
+
+    def _extend(self, extent):
+        if extent is not None:
+            bx0, by0, bx1, by1 = extent
+            self.bbox = [min(self.bbox[0], bx0), min(self.bbox[1], by0),
+                         max(self.bbox[2], bx1), max(self.bbox[3], by1)]
+
+    # ── Primitives ──
+    def rect(self, x, y, width, height, fill, alpha=1.0, rounding=0.0, zorder=1):
+        """Axis-aligned rect from data-space corner (x, y); rounding in data units."""
+        X, Y = self.px(x), self.py(y + height)
+        W, H = width * self.sx, height * self.sy
+        attrs = f'x="{_num(X)}" y="{_num(Y)}" width="{_num(W)}" height="{_num(H)}"'
+        if rounding:
+            attrs += f' rx="{_num(rounding * self.sx)}" ry="{_num(rounding * self.sy)}"'
+        attrs += f' fill="{fill}"'
+        if alpha != 1.0:
+            attrs += f' fill-opacity="{alpha}"'
+        self._add(zorder, f'<rect {attrs}/>')
+
+    def line(self, xs, ys, color, width=1.0, alpha=1.0, dashed=False, zorder=2):
+        attrs = (f'x1="{_num(self.px(xs[0]))}" y1="{_num(self.py(ys[0]))}" '
+                 f'x2="{_num(self.px(xs[1]))}" y2="{_num(self.py(ys[1]))}" '
+                 f'stroke="{color}" stroke-width="{width}"')
+        if alpha != 1.0:
+            attrs += f' stroke-opacity="{alpha}"'
+        if dashed:
+            # lines.dashed_pattern (3.7, 1.6) scaled by linewidth
+            attrs += f' stroke-dasharray="{_num(3.7 * width)},{_num(1.6 * width)}"'
+        else:
+            attrs += ' stroke-linecap="square"'
+        self._add(zorder, f'<line {attrs}/>')
+
+    def diamond(self, x, y, size, color, edge='white', edge_width=1.0, zorder=2):
+        """Marker 'D': unit square rotated 45 degrees, scaled by size (pt)."""
+        X, Y, r = self.px(x), self.py(y), size * math.sqrt(2) / 2
+        d = (f'M{_num(X)} {_num(Y - r)}L{_num(X + r)} {_num(Y)}'
+             f'L{_num(X)} {_num(Y + r)}L{_num(X - r)} {_num(Y)}Z')
+        self._add(zorder, f'<path d="{d}" fill="{color}" stroke="{edge}" '
+                          f'stroke-width="{edge_width}" stroke-linejoin="miter"/>')
+
+    def text(self, x, y, s, fontsize, color, ha='left', va='baseline',
+             weight=None, linespacing=1.2, box=None, zorder=3):
+        """Text anchored like ax.text; box=(fill, alpha, pad) draws a bbox patch."""
+        lines = s.split('\n')
+        X, Y = self.px(x), self.py(y)
+        gap = linespacing * fontsize
+        block_h = (len(lines) - 1) * gap + (ASCENT + DESCENT) * fontsize
+        if va == 'top':
+            top = Y
+        elif va == 'bottom':
+            top = Y - block_h
+        elif va == 'center':
+            top = Y - block_h / 2
+        else:
+            top = Y - ASCENT * fontsize
+        width = max(text_width_est(ln, fontsize) for ln in lines) * self.sx
+        left = {'left': X, 'center': X - width / 2, 'right': X - width}[ha]
+        extent = (left, top, left + width, top + block_h)
+
+        if box is not None:
+            fill, alpha, pad = box
+            p = pad * fontsize
+            self._add(zorder, (
+                f'<rect x="{_num(left - p)}" y="{_num(top - p)}" '
+                f'width="{_num(width + 2 * p)}" height="{_num(block_h + 2 * p)}" '
+                f'rx="{_num(p)}" fill="{fill}" fill-opacity="{alpha}"/>'))
+
+        anchor = {'left': 'start', 'center': 'middle', 'right': 'end'}[ha]
+        attrs = f'font-size="{fontsize}" fill="{color}"'
+        if anchor != 'start':
+            attrs += f' text-anchor="{anchor}"'
+        if weight:
+            attrs += f' font-weight="{WEIGHTS[weight]}"'
+        base = top + ASCENT * fontsize
+        if len(lines) == 1:
+            svg = f'<text x="{_num(X)}" y="{_num(base)}" {attrs}>{escape(s, quote=False)}</text>'
+        else:
+            spans = ''.join(
+                f'<tspan x="{_num(X)}" y="{_num(base + i * gap)}">{escape(ln, quote=False)}</tspan>'
+                for i, ln in enumerate(lines))
+            svg = f'<text {attrs}>{spans}</text>'
+        self._add(zorder, svg, extent)
+
+    def _head(self):
+        bx0, by0, bx1, by1 = self.bbox
+        bx0, by0 = bx0 - TIGHT_PAD, by0 - TIGHT_PAD
+        vw, vh = bx1 - bx0 + TIGHT_PAD, by1 - by0 + TIGHT_PAD
+        return (
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{_num(vw)}pt" '
+            f'height="{_num(vh)}pt" viewBox="{_num(bx0)} {_num(by0)} {_num(vw)} {_num(vh)}">\n'
+            f'<rect x="{_num(bx0)}" y="{_num(by0)}" width="{_num(vw)}" height="{_num(vh)}" fill="{C["bg"]}"/>\n'
+            f'<g font-family="{fonts.css_family(fonts.families())}">\n'
+        )
+
+    def to_svg(self):
+        body = ''.join(svg + '\n' for _, _, svg in sorted(self._elems))
+        return self._head() + body + SVG_TAIL
+
+
+class SpooledSvgCanvas(SvgCanvas):
+    """SvgCanvas that writes elements to one temporary file per zorder.
+
+    write() produces the same bytes as SvgCanvas.to_svg() would, without
+    holding the elements in memory.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._layers = {}
+
+    def _add(self, zorder, svg, extent=None):
+        layer = self._layers.get(zorder)
+        if layer is None:
+            layer = self._layers[zorder] = tempfile.TemporaryFile('w+', encoding='utf-8')
+        layer.write(svg)
+        layer.write('\n')
+        self._extend(extent)
+
+    def write(self, f):
+        """Write the document to the text file f and discard the layers."""
+        f.write(self._head())
+        for zorder in sorted(self._layers):
+            layer = self._layers.pop(zorder)
+            layer.seek(0)
+            shutil.copyfileobj(layer, f)
+            layer.close()
+        f.write(SVG_TAIL)
+
+
+def draw(canvas, plan, labelled_rows, n_rows):
+    """Issue the Gantt drawing onto canvas; mirrors timeline_gantt.render().
+
+    labelled_rows yields (row, [(task, label)]) pairs, as zip(rows,
+    bar_labels(rows, ...)) or iter_bar_labels() does; it is read once.
+    """
+    bottom_y = chart_bottom(n_rows)
+    chart_right = float(len(plan['week_labels']))
+    n_roles = len({t[0] for p in plan['phases'] for t in p['tasks']})
+
+    # ── Title ──
+    canvas.text(-LEFT_COL_W, HEADER_Y + 1.4, plan['title'],
+                22, C['text1'], va='bottom', weight='bold')
+    canvas.text(-LEFT_COL_W, HEADER_Y + 1.05, 'Implementation Gantt Chart',
+                13, C['text2'], va='bottom')
+    canvas.text(chart_right + 1.3, HEADER_Y + 1.4, f'Total {plan["total_md"]} MD',
+                14, C['text1'], ha='right', va='bottom', weight='bold')
+    canvas.text(chart_right + 1.3, HEADER_Y + 1.05, f'{len(plan["week_labels"])} Weeks  /  {n_roles} Roles',
+                11, C['text2'], ha='right', va='bottom')
+
+    # ── Week column headers ──
+    for i, label in enumerate(plan['week_labels']):
+        if i % 2 == 0:
+            canvas.rect(i, bottom_y + 0.5, 1, HEADER_Y + 0.6 - (bottom_y + 0.5),
+                        C['divider_light'], alpha=0.5, zorder=0)
+        canvas.text(i + 0.5, HEADER_Y + 0.25, label, 9, C['text2'],
+                    ha='center', va='center', weight='medium', linespacing=1.3)
+
+    canvas.line([-0.05, chart_right + 0.05], [HEADER_Y - 0.05, HEADER_Y - 0.05],
+                C['divider'], width=1.2, zorder=2)
+
+    # ── Milestone diamonds at header ──
+    for m_name, m_label, m_week, is_gate in plan['milestones']:
+        x = w(m_week) + 0.5
+        color = C['critical'] if is_gate else C['accent']
+        diamond_y = HEADER_Y + 0.7
+        canvas.diamond(x, diamond_y, 7, color, edge_width=1.5, zorder=5)
+        canvas.text(x, diamond_y + 0.22, m_name, 7.5, color,
+                    ha='center', va='bottom', weight='bold')
+        canvas.line([x, x], [HEADER_Y - 0.05, bottom_y + 0.5], color,
+                    width=0.8, alpha=0.10, dashed=True, zorder=0)
+
+    # ── Rows ──
+    for idx, (row, placed) in enumerate(labelled_rows):
+        y_center = row_center(idx)
+        y_top = y_center + ROW_H / 2
+        y_bottom = y_center - ROW_H / 2
+
+        if row.get('phase_start'):
+            pd = row['phase_data']
+            sep_y = y_top + 0.15
+            canvas.line([-LEFT_COL_W - 0.1, chart_right + 1.3], [sep_y, sep_y],
+                        C['divider'], width=0.7, zorder=1)
+            canvas.text(-LEFT_COL_W, sep_y + 0.04, pd['name'], 10.5, C['text1'],
+                        va='bottom', weight='bold')
+            if pd['md'] > 0:
+                md_x = -LEFT_COL_W + sum(0.11 if ord(c) > 0x2E7F else 0.07 for c in pd['name']) + 0.65
+                canvas.text(md_x, sep_y + 0.04, f"{pd['md']} MD", 8.5, C['text3'],
+                            va='bottom')
+
+        if idx % 2 == 1:
+            canvas.rect(-0.05, y_bottom + 0.02, chart_right + 0.1, (y_top - 0.02) - (y_bottom + 0.02),
+                        C['row_alt'], alpha=0.4, zorder=0)
+
+        if row['role_label']:
+            canvas.text(-0.15, y_center, row['role_label'], 9.5,
+                        ROLE_COLORS.get(row['role'], C['text2']),
+                        ha='right', va='center', weight='bold')
+
+        for task, label in placed:
+            role, name, md, start, end = task[:5]
+            canvas.rect(w(start), y_center - BAR_H / 2, end - start, BAR_H,
+                        ROLE_COLORS.get(role, C['accent']), alpha=0.85,
+                        rounding=0.07, zorder=3)
+
+            if label['inside']:
+                if label['dot'] is not None:
+                    canvas.text(label['dot'], y_center, '\u25CF', 5,
+                                C['critical'], ha='center', va='center', zorder=4)
+                canvas.text(label['x'], y_center, label['text'], 8.5, 'white',
+                            ha='center', va='center', weight='medium', zorder=4)
+            elif label['text']:
+                if label['leader']:
+                    (lx0, ly0), (lx1, ly1) = label['leader']
+                    canvas.line([lx0, lx1], [ly0, ly1], C['text3'], width=0.6, zorder=4)
+                if label['dot'] is not None:
+                    canvas.text(label['dot'], label['y'], '\u25CF', 5, C['critical'],
+                                va='center', zorder=4)
+                canvas.text(label['x'], label['y'], label['text'], 8, C['text1'],
+                            va='center', zorder=4, box=('white', 0.85, 0.04))
+
+    # ── Legend bar ──
+    leg_y = bottom_y + 0.15
+    leg_x = -LEFT_COL_W
+    canvas.line([-LEFT_COL_W - 0.1, chart_right + 1.3], [leg_y + 0.35, leg_y + 0.35],
+                C['divider'], width=0.7, zorder=1)
+
+    spacing = 1.5
+    for i, (role, color) in enumerate(ROLE_COLORS.items()):
+        x_pos = leg_x + i * spacing
+        canvas.rect(x_pos, leg_y - 0.06, 0.28, 0.16, color, alpha=0.85,
+                    rounding=0.04, zorder=3)
+        canvas.text(x_pos + 0.36, leg_y + 0.02, role, 9, C['text1'], va='center')
+
+    cp_x = leg_x + 5 * spacing + 0.3
+    canvas.text(cp_x, leg_y + 0.02, '\u25CF', 6, C['critical'], va='center')
+    canvas.text(cp_x + 0.14, leg_y + 0.02, 'Critical Path', 9, C['text1'], va='center')
+
+    ml_x = cp_x + 1.6
+    canvas.diamond(ml_x + 0.06, leg_y + 0.02, 6, C['accent'])
+    canvas.text(ml_x + 0.22, leg_y + 0.02, 'Milestone', 9, C['text1'], va='center')
+
+    gl_x = ml_x + 1.4
+    canvas.diamond(gl_x + 0.06, leg_y + 0.02, 6, C['critical'])
+    canvas.text(gl_x + 0.22, leg_y + 0.02, 'GATE', 9, C['text1'], va='center')
+
+
+def render_svg(plan=PLAN, out_path=OUT_PATH, stream=False):
+    """Write the Gantt chart for plan straight to an SVG file.
+
+    stream=True draws row by row onto a SpooledSvgCanvas (see the module
+    docstring); the rows are generated twice, once to count them.
+    """
+    stage = stages('gantt_svg')
+    plan = normalize_plan(plan)
+    n_weeks = len(plan['week_labels'])
+    label_args = (plan['critical'], plan['milestones'], float(n_weeks))
+    if stream:
+        n_rows = sum(1 for _ in iter_rows(plan['phases']))
+        labelled = iter_bar_labels(iter_rows(plan['phases']), *label_args)
+    else:
+        all_rows = build_rows(plan['phases'])
+        n_rows = len(all_rows)
+        labelled = zip(all_rows, bar_labels(all_rows, *label_args))
+    fig_w, fig_h = figure_size(n_weeks, n_rows)
+    canvas_class = SpooledSvgCanvas if stream else SvgCanvas
+    canvas = canvas_class(x_limits(n_weeks), y_limits(n_rows), (fig_w * 72, fig_h * 72))
+    stage.mark('layout', rows=n_rows)
+    draw(canvas, plan, labelled, n_rows)
+    stage.mark('draw')
+    with open(out_path, 'w', encoding='utf-8') as f:
+        if stream:
+            canvas.write(f)
+        else:
+            svg = canvas.to_svg()
+            stage.mark('serialize', bytes=len(svg))
+            f.write(svg)
+    stage.mark('write')
+    stage.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Render the Gantt chart as SVG without matplotlib.')
+    parser.add_argument('plan', nargs='?',
+                        help="JSON/YAML plan (its 'gantt' section if present; default: built-in PLAN)")
+    parser.add_argument('-o', '--output', default=OUT_PATH)
+    parser.add_argument('--stream', action='store_true',
+                        help='write row by row with flat memory (for very large plans)')
+    args = parser.parse_args()
+
+    plan = PLAN
+    if args.plan:
+        from render_all import load_plan
+        data = load_plan(args.plan)
+        plan = {'title': data.get('title', ''), **data['gantt']} if 'gantt' in data else data
+
+    render_svg(plan, args.output, args.stream)
+    print(f"OK: {args.output}")
@@ -0,0 +1,129 @@
+"""Global placement of Gantt bar labels with a uniform grid index.
+
+Labels that don't fit inside their bar used to sit right of it, cut
+short before the next bar of the same row. They could still run into
+other rows' labels or milestone lines, and vanished when the gap was
+too small. place_labels() places all of them together instead.
+
+Every bar goes into a GridIndex, a hash of fixed-size cells, each
+listing the boxes that touch it. Labels are then placed one by one,
+critical ones first, each at its cheapest candidate that collides with
+nothing already in the index:
+
+  right     after the bar (the old position)
+  left      before the bar
+  above / below
+            in the gutter between this row and the next, joined to the
+            bar end by a short leader line
+  clipped   right of the bar, cut to the free space (the old fallback)
+
+Crossing a milestone guide line adds GUIDE_COST. A placed label joins
+the index. Each check only visits the cells under one box, so with
+bounded density a plan of n bars costs O(n).
+"""
+import math
+from bisect import bisect_right
+
+PAD = 0.08          # bar end to label
+LABEL_H = 0.18      # label box height (data units, 8 pt with its padding)
+MIN_CLIP_W = 0.25   # narrowest clipped label worth drawing
+GUIDE_COST = 1.5
+COSTS = {'right': 0, 'left': 1, 'above': 2, 'below': 2.5, 'clipped': 5}
+EPS = 1e-9
+
+
+class GridIndex:
+    """Boxes (x0, y0, x1, y1) bucketed into cell_w x cell_h grid cells."""
+
+    def __init__(self, cell_w=1.0, cell_h=0.5):
+        self.cell_w = cell_w
+        self.cell_h = cell_h
+        self.cells = {}
+        self.boxes = []
+
+    def _cells(self, box):
+        x0, y0, x1, y1 = box
+        for cx in range(math.floor(x0 / self.cell_w), math.floor(x1 / self.cell_w) + 1):
+            for cy in range(math.floor(y0 / self.cell_h), math.floor(y1 / self.cell_h) + 1):
+                yield cx, cy
+
+    def insert(self, box):
+        i = len(self.boxes)
+        self.boxes.append(box)
+        for cell in self._cells(box):
+            self.cells.setdefault(cell, []).append(i)
+
+    def query(self, box):
+        """Boxes overlapping box (touching edges do not count)."""
+        x0, y0, x1, y1 = box
+        seen = set()
+        for cell in self._cells(box):
+            for i in self.cells.get(cell, ()):
+                if i in seen:
+                    continue
+                seen.add(i)
+                b = self.boxes[i]
+                if b[0] < x1 - EPS and x0 < b[2] - EPS and b[1] < y1 - EPS and y0 < b[3] - EPS:
+                    yield b
+
+    def hits(self, box):
+        return next(self.query(box), None) is not None
+
+
+def _candidates(bar, width, gutters, x_max):
+    """(mode, box, leader) positions for a label of width next to bar."""
+    x0, y0, x1, y1 = bar
+    yc = (y0 + y1) / 2
+    h = LABEL_H / 2
+    yield 'right', (x1 + PAD, yc - h, x1 + PAD + width, yc + h), None
+    yield 'left', (x0 - PAD - width, yc - h, x0 - PAD, yc + h), None
+    for mode, gy, edge in (('above', gutters[0], y1), ('below', gutters[1], y0)):
+        left = min(x1 + PAD, x_max - width)
+        yield mode, (left, gy - h, left + width, gy + h), ((x1 - PAD / 2, edge), (left, gy))
+
+
+def place_labels(bars, items, x_min, x_max, guides=(), cell=(1.0, 0.5)):
+    """Place outside labels around bars.
+
+    bars are every bar's box (x0, y0, x1, y1); each item is a dict with
+    'bar' (its box), 'width' (full label width), 'gutters' (y of the gap
+    above and below its row) and optionally 'priority' (lower goes
+    first). guides are x positions of vertical lines to avoid. Returns
+    one placement per item, in item order: None when there is no room,
+    else {'mode', 'box', 'leader'}, where box may be narrower than width
+    for a 'clipped' label and leader is a ((x, y), (x, y)) line or None.
+    """
+    index = GridIndex(*cell)
+    for bar in bars:
+        index.insert(bar)
+    guides = sorted(guides)
+
+    def crosses(box):
+        i = bisect_right(guides, box[0] + EPS)
+        return i < len(guides) and guides[i] < box[2] - EPS
+
+    order = sorted(range(len(items)),
+                   key=lambda i: (items[i].get('priority', 0), items[i]['bar'][0], items[i]['bar'][1]))
+    placed = [None] * len(items)
+    for i in order:
+        item = items[i]
+        best = None
+        for mode, box, leader in _candidates(item['bar'], item['width'], item['gutters'], x_max):
+            if box[0] < x_min - EPS or box[2] > x_max + EPS or index.hits(box):
+                continue
+            cost = COSTS[mode] + (GUIDE_COST if crosses(box) else 0)
+            if best is None or cost < best[0]:
+                best = (cost, mode, box, leader)
+        if best is None:
+            x1 = item['bar'][2] + PAD
+            y0, y1 = item['bar'][1], item['bar'][3]
+            yc = (y0 + y1) / 2
+            strip = (x1, yc - LABEL_H / 2, min(x1 + item['width'], x_max), yc + LABEL_H / 2)
+            right = min((b[0] for b in index.query(strip)), default=strip[2]) - PAD
+            if right - x1 > MIN_CLIP_W:
+                best = (COSTS['clipped'], 'clipped', (x1, strip[1], right, strip[3]), None)
+        if best is not None:
+            _, mode, box, leader = best
+            index.insert(box)
+            placed[i] = {'mode': mode, 'box': box, 'leader': leader}
+    return placed
@@ -0,0 +1,182 @@
+"""Chart layouts as compact JSON, drawn in the browser by chart_renderer.js.
+
+An exported SVG repeats every coordinate, colour and font on every
+element, so a Gantt is 30-50 KB and its PNG 200-335 KB. Here the layout
+is computed as usual (rows and lanes, label placement, card placement
+and wrapped card text) and only its result is written, as arrays:
+
+  gantt      rows [role, shows role label, phase or -1], phases [name, 'N MD'],
+             bars [row, x, width, role, inside, text, x, y, dot, leader]
+             and milestones [name, x, gate]
+  milestone  phase segments, milestones [id, name, week, gate, gate label, date]
+             and cards [left, bottom, top, connector, exit item lines, rollback lines]
+
+plus the axis limits and points per data unit, so a few KB per chart.
+The colours, fonts and drawing rules live in chart_renderer.js, which
+mirrors gantt_svg.draw() and milestone_timeline.build_figure(). It is
+one file shared by every chart, so the browser caches it once. Keep it
+in step with those two and bump LAYOUT_VERSION when the format changes.
+
+    python layout_json.py plans/ -o out/
+
+writes <plan>_gantt.json / <plan>_milestone.json for each plan and
+copies chart_renderer.js next to them (see the README for the
+Confluence markup).
+"""
+import argparse
+import json
+import os
+import shutil
+
+import milestone_timeline
+import timeline_gantt
+from gantt_svg import AX_BOTTOM, AX_LEFT, AX_RIGHT, AX_TOP, SvgCanvas
+from profiling import span
+from render_all import find_plans, plan_jobs
+from text_metrics import chart_metrics
+
+OUT_DIR = '/tmp/agent_c_layouts'
+LAYOUT_VERSION = 1
+RENDERER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'chart_renderer.js')
+LAYOUT_CHARTS = ('gantt', 'milestone_timeline')
+
+
+def _r(v):
+    """v rounded to 3 places; whole numbers as ints."""
+    v = round(float(v), 3)
+    return int(v) if v.is_integer() else v
+
+
+def _rs(*values):
+    return [_r(v) for v in values]
+
+
+def gantt_layout(plan):
+    """Layout dict for a Gantt plan section."""
+    from timeline_gantt import ROLE_COLORS, bar_labels, build_rows, w
+
+    plan = timeline_gantt.normalize_plan(plan)
+    rows = build_rows(plan['phases'])
+    n_weeks = len(plan['week_labels'])
+    (x0, x1), (y0, y1) = timeline_gantt.x_limits(n_weeks), timeline_gantt.y_limits(len(rows))
+    fig_w, fig_h = timeline_gantt.figure_size(n_weeks, len(rows))
+    canvas = SvgCanvas((x0, x1), (y0, y1), (fig_w * 72, fig_h * 72))
+    label_rows = bar_labels(rows, plan['critical'], plan['milestones'], float(n_weeks))
+
+    # Legend roles first (in ROLE_COLORS order), then any others
+    roles = [[role, color] for role, color in ROLE_COLORS.items()]
+    role_index = {role: i for i, (role, _) in enumerate(roles)}
+
+    def role_of(role):
+        if role not in role_index:
+            role_index[role] = len(roles)
+            roles.append([role, None])
+        return role_index[role]
+
+    out_rows, phases, bars = [], [], []
+    for idx, (row, placed) in enumerate(zip(rows, label_rows)):
+        phase = -1
+        if row.get('phase_start'):
+            pd = row['phase_data']
+            phase = len(phases)
+            phases.append([pd['name'], f"{pd['md']} MD" if pd['md'] > 0 else ''])
+        out_rows.append([role_of(row['role']), 1 if row['role_label'] else 0, phase])
+        for task, label in placed:
+            role, _, _, start, end = task[:5]
+            leader = label['leader'] and _rs(*label['leader'][0], *label['leader'][1])
+            bars.append([idx, *_rs(w(start), end - start), role_of(role), 1 if label['inside'] else 0,
+                         label['text'], *_rs(label['x'], label['y']),
+                         None if label['dot'] is None else _r(label['dot']), leader])
+
+    return {
+        'chart': 'gantt', 'v': LAYOUT_VERSION,
+        'title': plan['title'],
+        'md': f"{plan['total_md']}",
+        'n_roles': len({t[0] for p in plan['phases'] for t in p['tasks']}),
+        'x': _rs(x0, x1), 'y': _rs(y0, y1), 's': _rs(canvas.sx, canvas.sy),
+        'weeks': plan['week_labels'],
+        'roles': roles, 'legend': len(ROLE_COLORS),
+        'milestones': [[m[0], _r(w(m[2]) + 0.5), 1 if m[3] else 0] for m in plan['milestones']],
+        'phases': phases, 'rows': out_rows, 'bars': bars,
+    }
+
+
+def milestone_layout(plan):
+    """Layout dict for a milestone timeline plan section."""
+    from milestone_timeline import (
+        BULLET, PT_PER_UNIT, REF_FIGSIZE, REF_SPAN, card_lines, layout_cards, plot_limits,
+        timeline_weeks,
+    )
+
+    plan = milestone_timeline.normalize_plan(plan)
+    milestones = plan['milestones']
+    n_weeks = timeline_weeks(plan)
+    placed = layout_cards(plan, n_weeks)
+    (x_lo, x_hi), (y_lo, y_hi) = plot_limits(n_weeks, placed)
+    fig_w = round(REF_FIGSIZE[0] * (x_hi - x_lo) / REF_SPAN[0], 4) * 72
+    fig_h = round(REF_FIGSIZE[1] * (y_hi - y_lo) / REF_SPAN[1], 4) * 72
+
+    cards = []
+    for m, card in zip(milestones, placed):
+        items, rollback = card_lines(m)
+        (cx0, cy0), (cx1, cy1) = card['connector']
+        cards.append([*_rs(card['left'], card['bottom'], card['top']), _rs(cx0, cy0, cx1, cy1),
+                      [list(lines) for lines in items], list(rollback)])
+
+    return {
+        'chart': 'milestone', 'v': LAYOUT_VERSION,
+        'title': plan['title'],
+        'n_weeks': n_weeks,
+        'x': _rs(x_lo, x_hi), 'y': _rs(y_lo, y_hi),
+        's': _rs((AX_RIGHT - AX_LEFT) * fig_w / (x_hi - x_lo), (AX_TOP - AX_BOTTOM) * fig_h / (y_hi - y_lo)),
+        'bullet_w': _r(chart_metrics().width(BULLET, 7.5) / PT_PER_UNIT),
+        'segs': [[name, *_rs(start, end), color, alpha] for name, start, end, color, alpha in plan['phase_segs']],
+        'milestones': [[m['id'], m['name'], m['week'], 1 if m['is_gate'] else 0, m['gate_label'], m['date']]
+                       for m in milestones],
+        'cards': cards,
+    }
+
+
+def dumps(layout):
+    return json.dumps(layout, ensure_ascii=False, separators=(',', ':'))
+
+
+def write_layouts(plan_dir, out_dir=OUT_DIR):
+    """Write every Gantt/milestone layout under plan_dir to out_dir; returns the paths written.
+
+    The renderer is copied alongside only when it differs, so an
+    unchanged copy keeps its mtime and upload hash.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for (chart, _, out_path), data in plan_jobs(find_plans(plan_dir), out_dir).items():
+        if chart not in LAYOUT_CHARTS:
+            continue
+        with span('layout_json.job', chart=out_path):
+            layout = (gantt_layout if chart == 'gantt' else milestone_layout)(data)
+            path = os.path.splitext(out_path)[0] + '.json'
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(dumps(layout))
+        paths.append(path)
+
+    target = os.path.join(out_dir, os.path.basename(RENDERER))
+    with open(RENDERER, 'rb') as f:
+        renderer = f.read()
+    try:
+        with open(target, 'rb') as f:
+            current = f.read()
+    except FileNotFoundError:
+        current = None
+    if current != renderer:
+        shutil.copyfile(RENDERER, target)
+    return paths + [target]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Write chart layouts as JSON for chart_renderer.js.')
+    parser.add_argument('plan_dir', help=f"directory of plan files (sections: {', '.join(LAYOUT_CHARTS)})")
+    parser.add_argument('-o', '--out-dir', default=OUT_DIR)
+    args = parser.parse_args()
+
+    for path in write_layouts(args.plan_dir, args.out_dir):
+        print(f"OK: {path} ({os.path.getsize(path) / 1024:.1f} KB)")
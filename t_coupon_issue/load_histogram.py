@@ -0,0 +1,134 @@
+"""Resource histogram: MD per role per week of a Gantt plan.
+
+Stacked bars show each week's load by role (role_load.plan_load);
+weeks where any role goes over its weekly capacity get a red marker
+naming the roles and their load.
+
+    python load_histogram.py [-o out.svg] [-f svg,png]
+"""
+import argparse
+
+import profiling
+import timeline_gantt
+from export import dpi_spec, export_figure, parse_dpi, parse_formats
+from profiling import span, stages
+from timeline_gantt import C, PLAN, ROLE_COLORS, ROLE_ORDER
+
+OUT_PATH = '/tmp/agent_c_load.svg'
+
+BAR_W = 0.62
+WEEK_W = 0.9            # figure inches per week
+FIG_H = 5.2
+MAX_WEEK_TICKS = 26     # beyond this, label calendar days/weeks/months instead of every week
+
+
+def week_ticks(plan):
+    """(x positions, labels) for the week axis; bar k is centred on x = k.
+
+    Long plans with a 'start' date get calendar ticks (see plan_calendar);
+    long plans without one label every few weeks.
+    """
+    labels = plan['week_labels']
+    n_weeks = len(labels)
+    if n_weeks <= MAX_WEEK_TICKS:
+        return list(range(1, n_weeks + 1)), labels
+    if plan.get('start'):
+        from plan_calendar import calendar_for
+        positions, tick_labels = calendar_for(plan).ticks(1, n_weeks + 1)
+        return (positions - 0.5).tolist(), tick_labels
+    step = -(-n_weeks // MAX_WEEK_TICKS)
+    return list(range(1, n_weeks + 1, step)), labels[::step]
+
+
+def build_figure(plan=PLAN):
+    """Draw the load histogram for a Gantt plan into a new matplotlib figure."""
+    from theme import setup_matplotlib
+    plt = setup_matplotlib()
+    import role_load
+
+    stage = stages('load')
+    plan = timeline_gantt.normalize_plan(plan)
+    result = role_load.plan_load(plan, ROLE_ORDER)
+    roles, load, cap, over = result['roles'], result['load'], result['capacity'], result['over']
+    n_weeks = len(plan['week_labels'])
+    totals = load.sum(axis=0)
+    top = max(float(totals.max(initial=0)), float(cap.sum()) * 0.5, 1.0)
+    stage.mark('load', roles=len(roles), weeks=n_weeks)
+
+    # ── Figure ──
+    fig, ax = plt.subplots(figsize=(max(8.0, 2.4 + WEEK_W * n_weeks), FIG_H))
+    fig.set_facecolor(C['bg'])
+    ax.set_facecolor(C['bg'])
+    weeks = range(1, n_weeks + 1)
+    ax.set_xlim(0.4, n_weeks + 0.6)
+    ax.set_ylim(0, top * 1.22)
+
+    # ── Stacked bars ──
+    bottom = [0.0] * n_weeks
+    for i, role in enumerate(roles):
+        color = ROLE_COLORS.get(role, C['text2'])
+        ax.bar(weeks, load[i], BAR_W, bottom=bottom, color=color, alpha=0.85,
+               edgecolor='white', linewidth=0.6, label=role, zorder=3)
+        bottom = [b + v for b, v in zip(bottom, load[i])]
+
+    for week, total in zip(weeks, totals):
+        if total > 0:
+            ax.text(week, total + top * 0.015, f'{total:.1f}', fontsize=8,
+                    color=C['text2'], ha='center', va='bottom', zorder=4)
+
+    # ── Over-allocation ──
+    for k in result['over_weeks']:
+        rows = [i for i in range(len(roles)) if over[i, k - 1]]
+        note = '\n'.join(f'{roles[i]} {load[i, k - 1]:.1f}/{cap[i]:g}' for i in rows)
+        y = totals[k - 1] + top * 0.07
+        ax.plot(k, y, 'v', markersize=7, color=C['critical'], zorder=5)
+        ax.text(k, y + top * 0.035, note, fontsize=7, color=C['critical'],
+                ha='center', va='bottom', zorder=5)
+    stage.mark('bars')
+
+    # ── Axes & header ──
+    ticks, tick_labels = week_ticks(plan)
+    ax.set_xticks(ticks)
+    ax.set_xticklabels(tick_labels, fontsize=8, color=C['text2'])
+    ax.tick_params(axis='y', labelsize=8, colors=C['text2'], length=0)
+    ax.tick_params(axis='x', length=0)
+    ax.grid(axis='y', color=C['divider_light'], linewidth=0.8, zorder=0)
+    for side in ('top', 'right', 'left'):
+        ax.spines[side].set_visible(False)
+    ax.spines['bottom'].set_color(C['divider'])
+    ax.set_ylabel('MD / week', fontsize=9, color=C['text2'])
+
+    title = f"{plan['title']} · 주차별 투입 MD" if plan['title'] else '주차별 투입 MD'
+    ax.set_title(title, loc='left', fontsize=15, fontweight='bold', color=C['text1'], pad=14)
+    ax.legend(loc='upper right', ncol=len(roles), fontsize=8, frameon=False,
+              handlelength=1.2, columnspacing=1.2)
+    stage.mark('axes')
+    stage.close()
+
+    return fig
+
+
+def render(plan=PLAN, out_path=OUT_PATH, formats=None, dpi=None):
+    """Draw the load histogram for plan with matplotlib; returns the paths written."""
+    from theme import setup_matplotlib
+    with span('load.build_figure'):
+        fig = build_figure(plan)
+    paths = export_figure(fig, out_path, formats, dpi, facecolor=C['bg'], edgecolor='none')
+    setup_matplotlib().close(fig)
+    return paths
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Render the per-role weekly load histogram.')
+    parser.add_argument('-o', '--output', default=OUT_PATH)
+    parser.add_argument('-f', '--formats', type=parse_formats,
+                        help='comma-separated formats, e.g. svg,png,pdf (default: from -o)')
+    parser.add_argument('--dpi', action='append', type=dpi_spec, metavar='FMT=DPI',
+                        help='per-format resolution, e.g. png=300 (repeatable)')
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+
+    with profiling.session(args):
+        paths = render(PLAN, args.output, args.formats, parse_dpi(args.dpi))
+    for path in paths:
+        print(f"OK: {path}")
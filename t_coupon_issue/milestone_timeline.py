@@ -1,13 +1,12 @@
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-from matplotlib.patches import FancyBboxPatch
-import numpy as np
+import argparse
 
-# ── Font & Global ──
-plt.rcParams['font.family'] = 'Apple SD Gothic Neo'
-plt.rcParams['svg.fonttype'] = 'none'
-plt.rcParams['axes.unicode_minus'] = False
+import profiling
+from card_layout import place_cards
+from export import dpi_spec, export_figure, parse_dpi, parse_formats
+from profiling import span, stages
+from text_metrics import chart_metrics
+
+OUT_PATH = '/tmp/agent_c_milestone.svg'
 
 # ── Color System ──
 C = {
@@ -34,258 +33,400 @@ PHASE_SEGS = [
 
 milestones = [
     {
-        'id': 'M0', 'name': '설계확정', 'week': 1, 'date': '4/4',
+        'id': 'M0', 'name': '설계확정', 'week': 1,
         'is_gate': True, 'gate_label': 'GATE Go/No-Go',
         'exit': ['프로덕션 벤치마크 3.0x+ 달성', '설계 리뷰 완료'],
         'rollback': None,
     },
     {
-        'id': 'M1', 'name': '개발완료', 'week': 5, 'date': '5/2',
+        'id': 'M1', 'name': '개발완료', 'week': 5,
         'is_gate': False, 'gate_label': None,
         'exit': ['단위 테스트 통과', 'Feature Flag 동작', 'Shadow Mode 배포 가능'],
         'rollback': 'FF OFF -> DB 즉시 전환 (<1분)',
     },
     {
-        'id': 'M2', 'name': '검증완료', 'week': 7, 'date': '5/16',
+        'id': 'M2', 'name': '검증완료', 'week': 7,
         'is_gate': False, 'gate_label': None,
         'exit': ['Shadow Mode 1주+ 무장애', 'TPS 3.4x+ 달성', 'QA 전수 통과'],
         'rollback': 'Lua script 이전 버전 배포 (<5분)',
     },
     {
-        'id': 'M3', 'name': 'MC 전환완료', 'week': 8, 'date': '5/23',
+        'id': 'M3', 'name': 'MC 전환완료', 'week': 8,
         'is_gate': False, 'gate_label': None,
         'exit': ['MC 100% + 48h 안정화', 'drift < 0.01%'],
         'rollback': 'Redis MC: FF -> DB 전환 (<1분)',
     },
     {
-        'id': 'M4', 'name': '안정화완료', 'week': 9, 'date': '5/30',
+        'id': 'M4', 'name': '안정화완료', 'week': 9,
         'is_gate': False, 'gate_label': None,
         'exit': ['7일간 Sev-0/Sev-1 0건', '변경 동결 기간 무사 통과'],
         'rollback': None,
     },
     {
-        'id': 'M5', 'name': '인덱스삭제완료', 'week': 10, 'date': '6/6',
+        'id': 'M5', 'name': '인덱스삭제완료', 'week': 10,
         'is_gate': False, 'gate_label': None,
         'exit': ['인덱스 6개 삭제 완료', 'INSERT TPS 3.4x+ 달성'],
         'rollback': '인덱스 재생성 (15~40분)',
     },
 ]
 
-# ── Figure ──
-fig, ax = plt.subplots(figsize=(24, 10))
-fig.set_facecolor(C['bg'])
-ax.set_facecolor(C['bg'])
-ax.axis('off')
-
-# Coordinate system
-# x: week 1..10 mapped to 1..10
-# y: timeline at y=5, cards above (y>5) and below (y<5)
-TL_Y = 5.0  # timeline y
-PHASE_Y = TL_Y + 0.55  # phase bar y
+PLAN = {
+    'title': 't_coupon_issue INSERT 부하 개선',
+    'phase_segs': PHASE_SEGS,
+    'milestones': milestones,
+    'start': '2025-04-01',      # W1; milestone dates come from the calendar
+}
 
-ax.set_xlim(-0.5, 12.5)
-ax.set_ylim(0.0, 10.0)
+def normalize_plan(plan):
+    """Fill defaults for a milestone plan (e.g. one loaded from JSON/YAML).
+
+    Cards are placed automatically (see card_layout) unless the plan pins
+    them with card_specs: one {'cx', 'above'} per milestone.
+
+    With a 'start' date (and optional 'holidays'), a milestone may give
+    an ISO 'date' instead of its 'week', and one without a 'date' shows
+    the last business day of its week (see plan_calendar.py).
+    """
+    milestones = plan['milestones']
+    if plan.get('start'):
+        milestones = date_milestones(plan, milestones)
+    return {
+        'title': plan.get('title', ''),
+        'phase_segs': plan.get('phase_segs', []),
+        'milestones': milestones,
+        'card_specs': plan.get('card_specs'),
+    }
+
+def date_milestones(plan, milestones):
+    """milestones with 'week' and a 'M/D' 'date' filled in from the plan's calendar."""
+    from plan_calendar import calendar_for, is_date, month_day
+
+    cal = calendar_for(plan)
+    iso = [m['date'] for m in milestones if is_date(m.get('date'))]
+    weeks = [m['week'] for m in milestones if m.get('date') is None]
+    shown = dict(zip(iso, month_day(iso).tolist()))
+    week_of = dict(zip(iso, cal.week_of(iso).tolist()))
+    week_end = dict(zip(weeks, month_day(cal.week_end(weeks)).tolist()))
+
+    placed = []
+    for m in milestones:
+        date = m.get('date')
+        if is_date(date):
+            m = {**m, 'week': m.get('week', week_of[date]), 'date': shown[date]}
+        elif date is None:
+            m = {**m, 'date': week_end[m['week']]}
+        placed.append(m)
+    return placed
 
 def wx(week):
     return float(week)
 
-# ── Title ──
-ax.text(0.3, 9.5,
-        't_coupon_issue INSERT 부하 개선',
-        fontsize=22, fontweight='bold', color=C['text1'],
-        va='bottom', ha='left')
-ax.text(0.3, 9.15,
-        'Milestone Timeline',
-        fontsize=13, color=C['text2'], va='bottom', ha='left')
-
-ax.text(11.7, 9.5,
-        '6 Milestones  /  10 Weeks  /  1 GATE',
-        fontsize=11, color=C['text2'], va='bottom', ha='right')
-
-# ── Phase bar ──
-bar_h = 0.14
-for name, start, end, color, alpha in PHASE_SEGS:
-    xs, xe = wx(start), wx(end)
-    r = FancyBboxPatch(
-        (xs, PHASE_Y - bar_h/2), xe - xs, bar_h,
-        boxstyle="round,pad=0,rounding_size=0.04",
-        facecolor=color, alpha=alpha, edgecolor='none', zorder=2
-    )
-    ax.add_patch(r)
-    ax.text((xs + xe) / 2, PHASE_Y + 0.2, name,
-            fontsize=7.5, color=C['text2'], ha='center', va='bottom',
-            fontweight='medium')
-
-# ── Timeline ──
-ax.plot([wx(0.5), wx(11.0)], [TL_Y, TL_Y],
-        color=C['border'], linewidth=2.5, zorder=1, solid_capstyle='round')
-
-# Week tick marks & labels
-for wk in range(1, 11):
-    x = wx(wk)
-    ax.plot([x, x], [TL_Y - 0.06, TL_Y + 0.06],
-            color=C['border'], linewidth=1, zorder=2)
-    ax.text(x, TL_Y - 0.22, f'W{wk}',
-            fontsize=8, color=C['text3'], ha='center', va='top')
-
-# ── Duration labels between milestones ──
-for i in range(len(milestones) - 1):
-    m1, m2 = milestones[i], milestones[i + 1]
-    x1, x2 = wx(m1['week']), wx(m2['week'])
-    dur = m2['week'] - m1['week']
-    ax.text((x1 + x2) / 2, TL_Y + 0.22, f'{dur}w',
-            fontsize=8, color=C['text3'], ha='center', va='bottom',
-            fontweight='medium',
-            bbox=dict(boxstyle='round,pad=0.12', facecolor='white',
-                      edgecolor='none', alpha=0.9))
-
-# ── Cards: define positions carefully to avoid overlap ──
-# Card layout: specify (card_center_x, is_above) for each milestone
-# We manually tune x offsets to prevent overlap
-card_specs = [
-    # M0: above, at week 1
-    {'cx': 1.0, 'above': True},
-    # M1: below, at week 5
-    {'cx': 5.0, 'above': False},
-    # M2: above, at week 7
-    {'cx': 6.5, 'above': True},
-    # M3: below, at week 8
-    {'cx': 8.5, 'above': False},
-    # M4: above, at week 9
-    {'cx': 9.5, 'above': True},
-    # M5: below, at week 10.5
-    {'cx': 10.8, 'above': False},
-]
+# Figure size follows the layout; the 10-week reference fills 24x10 in
+REF_FIGSIZE = (24, 10)
+REF_SPAN = (13.0, 10.0)
+PT_PER_UNIT = REF_FIGSIZE[0] * 72 / REF_SPAN[0]     # the same on every timeline
 
+# ── Cards ──
+TL_Y = 5.0              # timeline y
 CARD_W = 2.2
-
-for i, m in enumerate(milestones):
-    spec = card_specs[i]
-    node_x = wx(m['week'])
-    is_gate = m['is_gate']
-    is_above = spec['above']
-    card_cx = spec['cx']
-
-    # ── Node on timeline ──
-    node_size = 18 if is_gate else 15
-    node_color = C['critical'] if is_gate else C['accent']
-    ax.plot(node_x, TL_Y, 'o', markersize=node_size,
-            color=node_color, markeredgecolor='white',
-            markeredgewidth=2.5, zorder=5)
-    ax.text(node_x, TL_Y, m['id'],
-            fontsize=7.5 if is_gate else 7, color='white',
-            ha='center', va='center', fontweight='bold', zorder=6)
-
-    # Date below node
-    ax.text(node_x, TL_Y - 0.42, m['date'],
-            fontsize=9, color=node_color, ha='center', va='top',
-            fontweight='bold')
-
-    # ── Card dimensions ──
-    n_exit = len(m['exit'])
-    has_rb = m['rollback'] is not None
+CARD_OFFSET = 0.75      # timeline to nearest card edge
+LINE_H = 0.21           # exit criteria line height
+WRAP_H = 0.15           # each further line of a wrapped exit item
+RB_WRAP_H = 0.14        # each further line of the rollback note
+TEXT_W = CARD_W - 0.3   # card text column (left and right padding)
+BULLET = '\u2022  '
+
+def card_lines(m):
+    """(exit items, rollback lines) of m's card, wrapped to the card width.
+
+    Each exit item is a tuple of lines, the first carrying the bullet;
+    the rollback lines start with 'Rollback: ' (empty when there is none).
+    Lines are measured with the chart font (text_metrics.wrap, memoized).
+    """
+    metrics = chart_metrics()
+    bullet_w = metrics.width(BULLET, 7.5)
+    item_w = (TEXT_W - 0.08) * PT_PER_UNIT - bullet_w
+    items = tuple(metrics.wrap(item, item_w, 7.5) or ('',) for item in m['exit'])
+    rollback = ()
+    if m['rollback'] is not None:
+        rollback = metrics.wrap(f"Rollback: {m['rollback']}", TEXT_W * PT_PER_UNIT, 7)
+    return items, rollback
+
+def card_height(m):
+    """Card height for m's content, wrapped lines included."""
+    items, rollback = card_lines(m)
     has_gate = m['gate_label'] is not None
-    line_h = 0.21
-    card_h = 0.25 + (1 if has_gate else 0) * 0.20 + 0.22 + n_exit * line_h + (0.25 if has_rb else 0) + 0.12
-
-    card_left = card_cx - CARD_W / 2
-    # Clamp to visible area
-    if card_left < 0.0:
-        card_left = 0.0
-    if card_left + CARD_W > 12.3:
-        card_left = 12.3 - CARD_W
-
-    if is_above:
-        card_bottom = TL_Y + 0.75
-        card_top = card_bottom + card_h
-    else:
-        card_top = TL_Y - 0.75
-        card_bottom = card_top - card_h
-
-    # ── Connector line ──
-    conn_top = TL_Y + 0.25 if is_above else TL_Y - 0.25
-    conn_bot = card_bottom if is_above else card_top
-    # Angled connector from node to card center
-    ax.plot([node_x, card_cx], [conn_top, conn_bot],
-            color=C['border'], linewidth=1, zorder=1)
-
-    # ── Card background ──
-    border_c = C['critical'] if is_gate else C['border']
-    bg_c = C['critical_light'] if is_gate else C['surface']
-
-    card_y_min = min(card_bottom, card_top)
-    card_rect = FancyBboxPatch(
-        (card_left, card_y_min), CARD_W, card_h,
-        boxstyle="round,pad=0.02,rounding_size=0.06",
-        facecolor=bg_c, edgecolor=border_c,
-        linewidth=1.2 if is_gate else 0.8,
-        zorder=3
-    )
-    ax.add_patch(card_rect)
-
-    # ── Card content ──
-    tx = card_left + 0.12
-    if is_above:
-        ty = card_top - 0.18
-    else:
+    exit_h = sum(LINE_H + (len(lines) - 1) * WRAP_H for lines in items)
+    rb_h = 0.25 + (len(rollback) - 1) * RB_WRAP_H if rollback else 0
+    return 0.25 + (0.20 if has_gate else 0) + 0.22 + exit_h + rb_h + 0.12
+
+def timeline_weeks(plan):
+    """Weeks the timeline spans: the phase bar's extent, else the last milestone."""
+    weeks = [seg[1] for seg in plan['phase_segs']] + [seg[2] for seg in plan['phase_segs']]
+    return int(max(weeks) - min(weeks)) if weeks else max(m['week'] for m in plan['milestones'])
+
+def layout_cards(plan, n_weeks):
+    """Card boxes and connectors for plan's milestones (see card_layout.place_cards)."""
+    milestones = plan['milestones']
+    heights = [card_height(m) for m in milestones]
+    x_min, x_max = 0.0, n_weeks + 2.3
+    if not plan['card_specs']:
+        return place_cards([wx(m['week']) for m in milestones], heights, CARD_W,
+                           x_min, x_max, TL_Y, CARD_OFFSET)
+
+    # Pinned cards: clamped into view, connector aimed at the given cx
+    placed = []
+    for m, spec, h in zip(milestones, plan['card_specs'], heights):
+        left = min(max(spec['cx'] - CARD_W / 2, x_min), x_max - CARD_W)
+        above = spec['above']
+        bottom = TL_Y + CARD_OFFSET if above else TL_Y - CARD_OFFSET - h
+        edge = bottom if above else bottom + h
+        node = (wx(m['week']), TL_Y + 0.25 if above else TL_Y - 0.25)
+        placed.append({'left': left, 'cx': left + CARD_W / 2, 'above': above, 'tier': 0,
+                       'bottom': bottom, 'top': bottom + h,
+                       'connector': (node, (spec['cx'], edge))})
+    return placed
+
+def plot_limits(n_weeks, placed):
+    """((x_lo, x_hi), (y_lo, y_hi)) of the plot for placed cards.
+
+    x: week 1..n maps to 1..n. y: the timeline is at TL_Y = 5, cards
+    above and below it; the range grows past 0..10 when stacked card
+    tiers need the room.
+    """
+    y_hi = max([10.0] + [c['top'] + 1.5 for c in placed])
+    y_lo = min([0.0] + [c['bottom'] - 1.0 for c in placed])
+    return (-0.5, n_weeks + 2.5), (y_lo, y_hi)
+
+# ── Render (matplotlib) ──
+def build_figure(plan=PLAN):
+    """Draw the milestone timeline for plan into a new matplotlib figure."""
+    from theme import setup_matplotlib
+    plt = setup_matplotlib()
+    from matplotlib.patches import FancyBboxPatch
+    from draw_batch import PatchBatch, TextLayer
+
+    stage = stages('milestone')
+    plan = normalize_plan(plan)
+    milestones = plan['milestones']
+    n_weeks = timeline_weeks(plan)
+    n_gates = sum(1 for m in milestones if m['is_gate'])
+    placed = layout_cards(plan, n_weeks)
+    bullet_w = chart_metrics().width(BULLET, 7.5) / PT_PER_UNIT
+    stage.mark('layout', cards=len(placed))
+
+    PHASE_Y = TL_Y + 0.55  # phase bar y
+    (x_lo, x_hi), (y_lo, y_hi) = plot_limits(n_weeks, placed)
+
+    # ── Figure ──
+    fig, ax = plt.subplots(figsize=(round(REF_FIGSIZE[0] * (x_hi - x_lo) / REF_SPAN[0], 4),
+                                    round(REF_FIGSIZE[1] * (y_hi - y_lo) / REF_SPAN[1], 4)))
+    fig.set_facecolor(C['bg'])
+    ax.set_facecolor(C['bg'])
+    ax.axis('off')
+
+    ax.set_xlim(x_lo, x_hi)
+    ax.set_ylim(y_lo, y_hi)
+
+    # Batched layers: one collection per z-level, one artist per text level
+    segs = PatchBatch(zorder=2)
+    cards = PatchBatch(zorder=3)
+    texts = TextLayer(ax, zorder=3)
+    card_texts = TextLayer(ax, zorder=4)
+    node_ids = TextLayer(ax, zorder=6)
+
+    # ── Title ──
+    texts.text(0.3, y_hi - 0.5,
+               plan['title'],
+               fontsize=22, fontweight='bold', color=C['text1'],
+               va='bottom', ha='left')
+    texts.text(0.3, y_hi - 0.85,
+               'Milestone Timeline',
+               fontsize=13, color=C['text2'], va='bottom', ha='left')
+
+    texts.text(n_weeks + 1.7, y_hi - 0.5,
+               f'{len(milestones)} Milestones  /  {n_weeks} Weeks  /  {n_gates} GATE',
+               fontsize=11, color=C['text2'], va='bottom', ha='right')
+
+    # ── Phase bar ──
+    bar_h = 0.14
+    for name, start, end, color, alpha in plan['phase_segs']:
+        xs, xe = wx(start), wx(end)
+        r = FancyBboxPatch(
+            (xs, PHASE_Y - bar_h/2), xe - xs, bar_h,
+            boxstyle="round,pad=0,rounding_size=0.04",
+            facecolor=color, alpha=alpha, edgecolor='none'
+        )
+        segs.add(r)
+        texts.text((xs + xe) / 2, PHASE_Y + 0.2, name,
+                   fontsize=7.5, color=C['text2'], ha='center', va='bottom',
+                   fontweight='medium')
+
+    # ── Timeline ──
+    ax.plot([wx(0.5), wx(n_weeks + 1.0)], [TL_Y, TL_Y],
+            color=C['border'], linewidth=2.5, zorder=1, solid_capstyle='round')
+
+    # Week tick marks & labels
+    for wk in range(1, n_weeks + 1):
+        x = wx(wk)
+        ax.plot([x, x], [TL_Y - 0.06, TL_Y + 0.06],
+                color=C['border'], linewidth=1, zorder=2)
+        texts.text(x, TL_Y - 0.22, f'W{wk}',
+                   fontsize=8, color=C['text3'], ha='center', va='top')
+
+    # ── Duration labels between milestones ──
+    for i in range(len(milestones) - 1):
+        m1, m2 = milestones[i], milestones[i + 1]
+        x1, x2 = wx(m1['week']), wx(m2['week'])
+        dur = m2['week'] - m1['week']
+        texts.text((x1 + x2) / 2, TL_Y + 0.22, f'{dur}w',
+                   fontsize=8, color=C['text3'], ha='center', va='bottom',
+                   fontweight='medium',
+                   bbox=dict(boxstyle='round,pad=0.12', facecolor='white',
+                             edgecolor='none', alpha=0.9))
+
+    stage.mark('timeline')
+
+    for m, card in zip(milestones, placed):
+        node_x = wx(m['week'])
+        is_gate = m['is_gate']
+
+        # ── Node on timeline ──
+        node_size = 18 if is_gate else 15
+        node_color = C['critical'] if is_gate else C['accent']
+        ax.plot(node_x, TL_Y, 'o', markersize=node_size,
+                color=node_color, markeredgecolor='white',
+                markeredgewidth=2.5, zorder=5)
+        node_ids.text(node_x, TL_Y, m['id'],
+                      fontsize=7.5 if is_gate else 7, color='white',
+                      ha='center', va='center', fontweight='bold')
+
+        # Date below node
+        texts.text(node_x, TL_Y - 0.42, m['date'],
+                   fontsize=9, color=node_color, ha='center', va='top',
+                   fontweight='bold')
+
+        has_gate = m['gate_label'] is not None
+        card_left, card_top = card['left'], card['top']
+        card_h = card['top'] - card['bottom']
+
+        # ── Connector line ──
+        (x0, y0), (x1, y1) = card['connector']
+        ax.plot([x0, x1], [y0, y1],
+                color=C['border'], linewidth=1, zorder=1)
+
+        # ── Card background ──
+        border_c = C['critical'] if is_gate else C['border']
+        bg_c = C['critical_light'] if is_gate else C['surface']
+
+        card_rect = FancyBboxPatch(
+            (card_left, card['bottom']), CARD_W, card_h,
+            boxstyle="round,pad=0.02,rounding_size=0.06",
+            facecolor=bg_c, edgecolor=border_c,
+            linewidth=1.2 if is_gate else 0.8
+        )
+        cards.add(card_rect)
+
+        # ── Card content ──
+        tx = card_left + 0.12
         ty = card_top - 0.18
 
-    # Title
-    title_c = C['critical'] if is_gate else C['text1']
-    ax.text(tx, ty, f"{m['id']}: {m['name']}",
-            fontsize=9.5, fontweight='bold', color=title_c,
-            va='top', ha='left', zorder=4)
-    ty -= 0.22
-
-    # Gate sub-label
-    if has_gate:
-        ax.text(tx, ty, m['gate_label'],
-                fontsize=7.5, color=C['critical'], fontweight='medium',
-                va='top', ha='left', zorder=4, fontstyle='italic')
+        # Title
+        title_c = C['critical'] if is_gate else C['text1']
+        card_texts.text(tx, ty, f"{m['id']}: {m['name']}",
+                        fontsize=9.5, fontweight='bold', color=title_c,
+                        va='top', ha='left')
         ty -= 0.22
 
-    # Exit criteria header
-    ax.text(tx, ty, 'Exit Criteria:',
-            fontsize=7, color=C['text3'], va='top', ha='left',
-            fontweight='bold', zorder=4)
-    ty -= 0.2
-
-    # Exit items
-    for item in m['exit']:
-        disp = item if len(item) <= 26 else item[:24] + '...'
-        ax.text(tx + 0.08, ty, f'\u2022  {disp}',
-                fontsize=7.5, color=C['text2'], va='top', ha='left',
-                zorder=4)
-        ty -= line_h
-
-    # Rollback
-    if has_rb:
-        ty -= 0.06
-        rb = m['rollback']
-        if len(rb) > 30:
-            rb = rb[:28] + '...'
-        ax.text(tx, ty, f'Rollback: {rb}',
-                fontsize=7, color=C['critical'], va='top', ha='left',
-                fontstyle='italic', zorder=4)
-
-# ── Legend ──
-leg_y = 0.45
-ax.plot(1.0, leg_y, 'o', markersize=10, color=C['critical'],
-        markeredgecolor='white', markeredgewidth=2)
-ax.text(1.3, leg_y, 'GATE Milestone', fontsize=9, color=C['text1'],
-        va='center')
-
-ax.plot(3.2, leg_y, 'o', markersize=10, color=C['accent'],
-        markeredgecolor='white', markeredgewidth=2)
-ax.text(3.5, leg_y, 'Milestone', fontsize=9, color=C['text1'],
-        va='center')
-
-ax.text(5.0, leg_y, 'Rollback:',
-        fontsize=8, color=C['critical'], va='center', fontstyle='italic')
-ax.text(5.65, leg_y, 'Rollback plan available',
-        fontsize=9, color=C['text1'], va='center')
-
-plt.savefig('/tmp/agent_c_milestone.svg', format='svg', bbox_inches='tight',
-            facecolor=C['bg'], edgecolor='none', dpi=150)
-plt.close()
-print("OK: /tmp/agent_c_milestone.svg")
+        # Gate sub-label
+        if has_gate:
+            card_texts.text(tx, ty, m['gate_label'],
+                            fontsize=7.5, color=C['critical'], fontweight='medium',
+                            va='top', ha='left', fontstyle='italic')
+            ty -= 0.22
+
+        # Exit criteria header
+        card_texts.text(tx, ty, 'Exit Criteria:',
+                        fontsize=7, color=C['text3'], va='top', ha='left',
+                        fontweight='bold')
+        ty -= 0.2
+
+        # Exit items, wrapped (continuation lines under the text, not the bullet)
+        items, rollback = card_lines(m)
+        for lines in items:
+            card_texts.text(tx + 0.08, ty, BULLET + lines[0],
+                            fontsize=7.5, color=C['text2'], va='top', ha='left')
+            for line in lines[1:]:
+                ty -= WRAP_H
+                card_texts.text(tx + 0.08 + bullet_w, ty, line,
+                                fontsize=7.5, color=C['text2'], va='top', ha='left')
+            ty -= LINE_H
+
+        # Rollback
+        if rollback:
+            ty -= 0.06
+            for i, line in enumerate(rollback):
+                card_texts.text(tx, ty - i * RB_WRAP_H, line,
+                                fontsize=7, color=C['critical'], va='top', ha='left',
+                                fontstyle='italic')
+
+    stage.mark('cards')
+
+    # ── Legend ──
+    leg_y = y_lo + 0.45
+    ax.plot(1.0, leg_y, 'o', markersize=10, color=C['critical'],
+            markeredgecolor='white', markeredgewidth=2)
+    texts.text(1.3, leg_y, 'GATE Milestone', fontsize=9, color=C['text1'],
+               va='center')
+
+    ax.plot(3.2, leg_y, 'o', markersize=10, color=C['accent'],
+            markeredgecolor='white', markeredgewidth=2)
+    texts.text(3.5, leg_y, 'Milestone', fontsize=9, color=C['text1'],
+               va='center')
+
+    texts.text(5.0, leg_y, 'Rollback:',
+               fontsize=8, color=C['critical'], va='center', fontstyle='italic')
+    texts.text(5.65, leg_y, 'Rollback plan available',
+               fontsize=9, color=C['text1'], va='center')
+
+    # ── Batched layers onto the axes ──
+    # (texts go in before the cards: phase names may sit under a card)
+    segs.add_to(ax)
+    ax.add_artist(texts)
+    cards.add_to(ax)
+    ax.add_artist(card_texts)
+    ax.add_artist(node_ids)
+    stage.mark('legend')
+    stage.close()
+
+    return fig
+
+
+def render(plan=PLAN, out_path=OUT_PATH, formats=None, dpi=None):
+    """Draw the milestone timeline for plan with matplotlib; returns the paths written.
+
+    Saves out_path's format, or each of formats (see export.export_figure)
+    from the one figure.
+    """
+    from theme import setup_matplotlib
+    with span('milestone.build_figure'):
+        fig = build_figure(plan)
+    paths = export_figure(fig, out_path, formats, dpi, facecolor=C['bg'], edgecolor='none')
+    setup_matplotlib().close(fig)
+    return paths
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Render the milestone timeline.')
+    parser.add_argument('-o', '--output', default=OUT_PATH)
+    parser.add_argument('-f', '--formats', type=parse_formats,
+                        help='comma-separated formats, e.g. svg,png,pdf (default: from -o)')
+    parser.add_argument('--dpi', action='append', type=dpi_spec, metavar='FMT=DPI',
+                        help='per-format resolution, e.g. png=300 (repeatable)')
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+
+    with profiling.session(args):
+        paths = render(PLAN, args.output, args.formats, parse_dpi(args.dpi))
+    for path in paths:
+        print(f"OK: {path}")
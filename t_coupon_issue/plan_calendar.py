@@ -0,0 +1,142 @@
+"""Calendar for date-based plans: dates <-> week positions, business days, ticks.
+
+The charts place time in week units: week k is the column [k, k+1), and
+W1 is the calendar week (Monday to Sunday) holding the plan's 'start'
+date. A date maps to its week plus the fraction of that week's working
+days before it:
+
+    Tue 2025-04-01 -> 1.2      (start = 2025-04-01, Monday 3/31 is 1.0)
+    Mon 2025-04-07 -> 2.0
+    Sat 2025-04-12 -> 3.0      (weekends sit on the next week's edge)
+
+So a task from Monday to Friday, with its end given as the day after,
+fills its column exactly. Holidays do not move positions. They only
+count in week_end(), the date a milestone 'in week k' lands on, and in
+day ticks, which mark business days.
+
+Every conversion takes and returns numpy.datetime64 arrays (np.busday_*
+does the calendar work), so a multi-year plan costs one pass per array,
+not one per date. Tick labels are assembled with np.char.
+
+    cal = Calendar('2025-04-01', holidays=['2025-05-05', '2025-05-06'])
+    cal.weeks(['2025-04-14', '2025-05-02'])    # array([3. , 5.8])
+    cal.week_labels(3)                          # ['W1\\n4/1', 'W2\\n4/7', 'W3\\n4/14']
+    cal.ticks(1, 120, 'auto')                   # month ticks over ~2.3 years
+"""
+import numpy as np
+
+WEEKMASK = '1111100'        # Monday..Sunday working days
+UNITS = ('day', 'week', 'month', 'year')
+MAX_TICKS = 40              # 'auto' picks the finest unit with at most this many ticks
+MONTHS = np.array(['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+                   'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'])
+
+
+def dates(values):
+    """values (ISO strings, dates or datetime64) as a datetime64[D] array."""
+    return np.asarray(values, dtype='datetime64[D]')
+
+
+def monday(d):
+    """Monday of each date's week."""
+    d = dates(d)
+    # 1970-01-01 was a Thursday (weekday 3)
+    return d - (d.astype(np.int64) + 3) % 7
+
+
+def month_day(d):
+    """'M/D' labels for dates."""
+    d = dates(d)
+    month = d.astype('datetime64[M]')
+    m = month.astype(np.int64) % 12 + 1
+    day = (d - month.astype('datetime64[D]')).astype(np.int64) + 1
+    return np.char.add(np.char.add(m.astype(str), '/'), day.astype(str))
+
+
+def is_date(value):
+    return isinstance(value, str) and len(value) >= 8 and value[4:5] == '-'
+
+
+class Calendar:
+    """Week positions and business days for a plan starting on start."""
+
+    def __init__(self, start, holidays=(), weekmask=WEEKMASK):
+        self.start = dates(start)[()]
+        self.origin = monday(self.start)[()]
+        self.weekmask = weekmask
+        self.workdays = weekmask.count('1')
+        self.holidays = dates(list(holidays))
+        self.busdays = np.busdaycalendar(weekmask=weekmask, holidays=self.holidays)
+
+    # ── Dates <-> week positions ──
+    def weeks(self, d):
+        """Week position of each date (W1 begins at 1.0)."""
+        d = dates(d)
+        mon = monday(d)
+        into = np.busday_count(mon, d, weekmask=self.weekmask)
+        return 1 + (mon - self.origin).astype(np.int64) / 7 + into / self.workdays
+
+    def week_start(self, weeks):
+        """First date of each (integer) week; W1 starts on start itself."""
+        first = self.origin + (np.asarray(weeks, dtype=np.int64) - 1) * 7
+        return np.maximum(first, self.start)
+
+    def week_end(self, weeks):
+        """Last business day of each (integer) week, skipping holidays."""
+        sunday = self.origin + (np.asarray(weeks, dtype=np.int64) - 1) * 7 + 6
+        return np.busday_offset(sunday, 0, roll='backward', busdaycal=self.busdays)
+
+    def week_of(self, d):
+        """Integer week holding each date."""
+        return ((monday(d) - self.origin).astype(np.int64) // 7 + 1)
+
+    # ── Labels & ticks ──
+    def week_labels(self, n_weeks):
+        """'W{k}\\nM/D' header labels for weeks 1..n_weeks."""
+        k = np.arange(1, n_weeks + 1)
+        prefix = np.char.add(np.char.add('W', k.astype(str)), '\n')
+        return np.char.add(prefix, month_day(self.week_start(k))).tolist()
+
+    def ticks(self, first, last, unit='auto'):
+        """(week positions, labels) of day/week/month/year ticks in weeks [first, last).
+
+        'auto' picks the finest unit giving at most MAX_TICKS ticks.
+        """
+        lo = self.origin + int(round((first - 1) * 7))
+        hi = self.origin + int(round((last - 1) * 7))
+        if unit == 'auto':
+            days = (hi - lo).astype(np.int64)
+            spans = {'day': days, 'week': days / 7, 'month': days / 30.4, 'year': days / 365.2}
+            unit = next((u for u in UNITS if spans[u] <= MAX_TICKS), 'year')
+
+        if unit == 'day':
+            d = np.arange(lo, hi, dtype='datetime64[D]')
+            d = d[np.is_busday(d, busdaycal=self.busdays)]
+            labels = month_day(d)
+        elif unit == 'week':
+            d = np.arange(monday(lo)[()], hi, 7, dtype='datetime64[D]')
+            d = d[d >= lo]
+            labels = month_day(d)
+        else:
+            step = 'M' if unit == 'month' else 'Y'
+            d = np.arange(lo.astype(f'datetime64[{step}]'), hi.astype(f'datetime64[{step}]') + 1)
+            d = d.astype('datetime64[D]')
+            d = d[(d >= lo) & (d < hi)]
+            years = d.astype('datetime64[Y]').astype(np.int64) + 1970
+            if unit == 'year':
+                labels = years.astype(str)
+            else:
+                months = d.astype('datetime64[M]').astype(np.int64) % 12
+                # the year goes on January and on the first tick
+                show_year = (months == 0) | (np.arange(len(d)) == 0)
+                labels = np.where(show_year,
+                                  np.char.add(np.char.add(MONTHS[months], '\n'), years.astype(str)),
+                                  MONTHS[months])
+        return self.weeks(d), labels.tolist()
+
+
+def calendar_for(plan):
+    """Calendar of a plan with a 'start' date, else None."""
+    if not plan.get('start'):
+        return None
+    return Calendar(plan['start'], plan.get('holidays', ()))
@@ -0,0 +1,143 @@
+"""Check plan files and print their totals without any plotting import.
+
+Uses only the data/layout half of the chart modules (normalize_plan,
+build_rows, layout_cards), which import no matplotlib, and numpy only
+for plans with a 'start' date (see plan_calendar.py), so a run costs
+tens of milliseconds rather than the plotting stack's startup.
+--import-time reports what importing each chart module costs.
+
+    python plan_info.py [plans/*.json] [--import-time]
+"""
+import argparse
+import subprocess
+import sys
+
+import milestone_timeline
+import schedule
+import timeline_gantt
+
+# Modules timed by --import-time, each in a fresh interpreter
+IMPORT_MODULES = ('timeline_gantt', 'milestone_timeline', 'gantt_svg', 'render_all',
+                  'matplotlib.pyplot')
+
+
+def check_gantt(plan):
+    """(summary dict, [problems]) for a Gantt plan."""
+    problems = []
+    hand_kept = set(plan.get('critical_tasks', ()))
+    try:
+        plan = timeline_gantt.normalize_plan(plan)
+    except ValueError as e:     # unknown dependency or a cycle
+        problems.append(str(e))
+        plan = timeline_gantt.normalize_plan({**plan, 'critical': ()})
+    n_weeks = len(plan['week_labels'])
+    names = set()
+    for phase in plan['phases']:
+        md = 0
+        for role, name, task_md, start, end, *_ in phase['tasks']:
+            names.add(name)
+            md += task_md
+            if not start < end:
+                problems.append(f"{phase['name']}: {name!r} ends before it starts ({start}-{end})")
+            elif start < 1 or end > n_weeks + 1:
+                problems.append(f"{phase['name']}: {name!r} falls outside W1-W{n_weeks}")
+        if md != phase['md']:
+            problems.append(f"{phase['name']}: phase md {phase['md']} != task sum {md}")
+    for name in sorted(hand_kept - names):
+        problems.append(f'critical task {name!r} is not in any phase')
+    tasks = [t for p in plan['phases'] for t in p['tasks']]
+    for task, dep in schedule.conflicts(tasks):
+        problems.append(f'{task[1]!r} starts at W{task[3]} before {dep[1]!r} ends at W{dep[4]}')
+    for m_name, _, week, _ in plan['milestones']:
+        if not 1 <= week <= n_weeks:
+            problems.append(f'milestone {m_name} at W{week} is outside W1-W{n_weeks}')
+    summary = {
+        'total_md': plan['total_md'],
+        'phase_md': {p['name']: p['md'] for p in plan['phases']},
+        'tasks': sum(len(p['tasks']) for p in plan['phases']),
+        'rows': len(timeline_gantt.build_rows(plan['phases'])),
+        'weeks': n_weeks,
+        'critical': [t[1] for t in sorted(tasks, key=lambda t: (t[3], t[4]))
+                     if schedule.task_key(t) in plan['critical']],
+    }
+    return summary, problems
+
+
+def check_milestones(plan):
+    """(summary dict, [problems]) for a milestone plan."""
+    plan = milestone_timeline.normalize_plan(plan)
+    milestones = plan['milestones']
+    problems = []
+    if plan['card_specs'] and len(plan['card_specs']) != len(milestones):
+        problems.append(f"{len(plan['card_specs'])} card_specs for {len(milestones)} milestones")
+    weeks = [m['week'] for m in milestones]
+    if weeks != sorted(weeks):
+        problems.append('milestones are not in week order')
+    placed = milestone_timeline.layout_cards(plan, milestone_timeline.timeline_weeks(plan))
+    summary = {
+        'milestones': len(milestones),
+        'gates': sum(1 for m in milestones if m['is_gate']),
+        'weeks': milestone_timeline.timeline_weeks(plan),
+        'card_tiers': {side: 1 + max((c['tier'] for c in placed if c['above'] == above), default=-1)
+                       for side, above in (('above', True), ('below', False))},
+    }
+    return summary, problems
+
+
+def import_times(modules=IMPORT_MODULES):
+    """{module: ms} for importing each module in a fresh interpreter (-X importtime)."""
+    times = {}
+    for module in modules:
+        proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                              capture_output=True, text=True)
+        # "import time: self [us] | cumulative | name"; the top-level import is the last line
+        for line in proc.stderr.splitlines():
+            parts = [p.strip() for p in line.split('|')]
+            if len(parts) == 3 and parts[2] == module:
+                times[module] = int(parts[1]) / 1000
+    return times
+
+
+def report_plan(path, data):
+    problems = []
+    print(path)
+    if 'gantt' in data or 'phases' in data:
+        gantt = {'title': data.get('title', ''), **data['gantt']} if 'gantt' in data else data
+        summary, found = check_gantt(gantt)
+        problems += found
+        print(f"  gantt: {summary['total_md']} MD, {summary['tasks']} tasks in "
+              f"{summary['rows']} rows over {summary['weeks']} weeks")
+        for name, md in summary['phase_md'].items():
+            print(f"    {md:5} MD  {name}")
+        print(f"  critical path: {' -> '.join(summary['critical']) or '-'}")
+    section = data.get('milestone_timeline')
+    if section is not None:
+        summary, found = check_milestones(section)
+        problems += found
+        tiers = summary['card_tiers']
+        print(f"  milestones: {summary['milestones']} ({summary['gates']} gates) over "
+              f"{summary['weeks']} weeks, card tiers {tiers['above']} above / {tiers['below']} below")
+    for problem in problems:
+        print(f"  problem: {problem}")
+    return problems
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Check plan files and print MD totals and layout sizes.')
+    parser.add_argument('plans', nargs='*', help='JSON/YAML plans (default: the built-in PLANs)')
+    parser.add_argument('--import-time', action='store_true',
+                        help='report the import cost of the chart modules')
+    args = parser.parse_args()
+
+    n_problems = 0
+    if args.plans:
+        from render_all import load_plan
+        for path in args.plans:
+            n_problems += len(report_plan(path, load_plan(path)))
+    else:
+        n_problems += len(report_plan('built-in', {'gantt': timeline_gantt.PLAN,
+                                                    'milestone_timeline': milestone_timeline.PLAN}))
+    if args.import_time:
+        for module, ms in import_times().items():
+            print(f"import {module:20} {ms:7.1f} ms")
+    sys.exit(1 if n_problems else 0)
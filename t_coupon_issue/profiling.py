@@ -0,0 +1,215 @@
+"""Named timing spans for the render pipeline.
+
+The chart code wraps its stages in span('gantt.legend') and the like.
+Spans cost next to nothing until enable() is called. After that, each
+span records its wall time, thread and nesting, plus its net allocation
+when memory tracing is on.
+
+The recorded spans can be written two ways. write_trace() gives a
+Chrome trace: open it in chrome://tracing or https://ui.perfetto.dev.
+write_json() gives raw spans plus per-name totals. report() prints
+those totals. cProfile capture is separate and opt-in, through
+session().
+
+Every chart CLI takes the same flags (see add_arguments):
+
+    python timeline_gantt.py --trace /tmp/gantt-trace.json [--trace-memory]
+                             [--cprofile /tmp/gantt.prof]
+"""
+import contextlib
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+_events = None          # list of recorded spans while enabled
+_memory = False
+_owns_tracing = False   # enable() started tracemalloc, so disable() stops it
+_local = threading.local()
+_t0 = 0.0
+
+
+class _Span:
+    __slots__ = ('name', 'args', 'start', 'mem')
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        _local.depth = getattr(_local, 'depth', 0) + 1
+        self.mem = tracemalloc.get_traced_memory()[0] if _memory else None
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        _local.depth -= 1
+        event = {'name': self.name, 'start': self.start - _t0, 'dur': end - self.start,
+                 'tid': threading.get_ident(), 'depth': _local.depth}
+        if self.args:
+            event['args'] = self.args
+        if self.mem is not None:
+            event['mem'] = tracemalloc.get_traced_memory()[0] - self.mem
+        _events.append(event)
+        return False
+
+
+_NULL = contextlib.nullcontext()
+
+
+def span(name, **args):
+    """Context manager timing one named stage (no-op unless enabled)."""
+    if _events is None:
+        return _NULL
+    return _Span(name, args)
+
+
+class _Stages:
+    """Back-to-back spans: mark(name) closes the stage begun at the last mark."""
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+        self._span = None
+        self._begin()
+
+    def _begin(self):
+        self._span = _Span(None, None)
+        self._span.__enter__()
+
+    def mark(self, name, **args):
+        self._span.name = f'{self.prefix}.{name}'
+        self._span.args = args
+        self._span.__exit__()
+        self._begin()
+
+    def close(self):
+        _local.depth -= 1
+
+
+class _NullStages:
+    def mark(self, name, **args):
+        pass
+
+    def close(self):
+        pass
+
+
+_NULL_STAGES = _NullStages()
+
+
+def stages(prefix):
+    """Stage timer for straight-line code; call close() after the last mark()."""
+    if _events is None:
+        return _NULL_STAGES
+    return _Stages(prefix)
+
+
+def enable(memory=False):
+    """Start recording spans; memory=True also traces allocations.
+
+    Tracing the caller already started is used as is and left running.
+    """
+    global _events, _memory, _owns_tracing, _t0
+    _events = []
+    _memory = memory
+    _t0 = time.perf_counter()
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _owns_tracing = True
+
+
+def disable():
+    """Stop recording; returns the recorded spans."""
+    global _events, _memory, _owns_tracing
+    events, _events = _events or [], None
+    if _owns_tracing:
+        tracemalloc.stop()
+    _memory = _owns_tracing = False
+    return events
+
+
+def events():
+    return list(_events or ())
+
+
+def summary(spans):
+    """{name: {'count', 'total', 'max'[, 'mem']}} with times in seconds."""
+    out = {}
+    for e in spans:
+        s = out.setdefault(e['name'], {'count': 0, 'total': 0.0, 'max': 0.0})
+        s['count'] += 1
+        s['total'] += e['dur']
+        s['max'] = max(s['max'], e['dur'])
+        if 'mem' in e:
+            s['mem'] = s.get('mem', 0) + e['mem']
+    return out
+
+
+def report(spans):
+    """Print per-name totals, slowest first."""
+    rows = sorted(summary(spans).items(), key=lambda kv: -kv[1]['total'])
+    print(f"{'span':28} {'count':>6} {'total ms':>10} {'max ms':>9} {'alloc KB':>9}")
+    for name, s in rows:
+        mem = f"{s['mem'] / 1024:9.0f}" if 'mem' in s else f"{'-':>9}"
+        print(f"{name:28} {s['count']:6d} {s['total'] * 1000:10.1f} {s['max'] * 1000:9.1f} {mem}")
+
+
+def write_trace(path, spans):
+    """Write spans as Chrome trace-event JSON."""
+    pid = os.getpid()
+    trace = [{'name': e['name'], 'ph': 'X', 'pid': pid, 'tid': e['tid'],
+              'ts': e['start'] * 1e6, 'dur': e['dur'] * 1e6,
+              'args': {**e.get('args', {}), **({'alloc_bytes': e['mem']} if 'mem' in e else {})}}
+             for e in spans]
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': trace, 'displayTimeUnit': 'ms'}, f)
+
+
+def write_json(path, spans):
+    """Write raw spans plus the per-name summary."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'spans': spans, 'summary': summary(spans)}, f, indent=1, ensure_ascii=False,
+                  default=str)
+
+
+# ── CLI glue ──
+def add_arguments(parser):
+    group = parser.add_argument_group('profiling')
+    group.add_argument('--trace', metavar='PATH',
+                       help='record stage spans; .json -> Chrome trace, .spans.json -> raw spans')
+    group.add_argument('--trace-memory', action='store_true',
+                       help='also record net allocations per span (tracemalloc)')
+    group.add_argument('--cprofile', metavar='PATH', help='write cProfile stats to PATH')
+
+
+@contextlib.contextmanager
+def session(args):
+    """Profile the enclosed block as the add_arguments() flags ask."""
+    profiler = None
+    if args.cprofile:
+        import cProfile
+        profiler = cProfile.Profile()
+    if args.trace or args.trace_memory:
+        enable(memory=args.trace_memory)
+    if profiler:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(args.cprofile)
+            import pstats
+            pstats.Stats(profiler).sort_stats('cumulative').print_stats(15)
+            print(f"OK: {args.cprofile}")
+        if _events is not None:
+            spans = disable()
+            report(spans)
+            if args.trace:
+                if args.trace.endswith('.spans.json'):
+                    write_json(args.trace, spans)
+                else:
+                    write_trace(args.trace, spans)
+                print(f"OK: {args.trace}")
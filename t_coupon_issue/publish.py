@@ -0,0 +1,321 @@
+"""Upload changed chart files as Confluence page attachments.
+
+A manifest (JSON, next to the files by default) records, per page and
+file name, the SHA-256 of the bytes last uploaded together with the
+attachment's id and version. A run hashes the local files and uploads
+only those whose hash differs, so re-publishing a directory of 50
+charts after editing one sends one request.
+
+Uploads use Confluence's create-or-update endpoint
+(PUT /rest/api/content/{page}/child/attachment) from a thread pool
+sharing a small pool of keep-alive connections. Connection errors, 429
+and 5xx responses are retried with exponential backoff (honouring
+Retry-After). The manifest is saved even when some uploads fail, so
+the next run retries only those.
+
+--refresh first lists the page's attachments and forgets every entry
+whose remote version no longer matches the manifest (someone edited or
+deleted it in Confluence), so those files are uploaded again.
+
+The server and credentials come from CONFLUENCE_URL, and CONFLUENCE_USER
+plus CONFLUENCE_TOKEN (basic auth with an API token) or CONFLUENCE_TOKEN
+alone (a personal access token). confluence_stub.py is a local stand-in
+server to try it against:
+
+    python confluence_stub.py --port 8090 &
+    CONFLUENCE_URL=http://localhost:8090 python publish.py out/ --page 123 [-j 4] [--refresh] [--dry-run]
+"""
+import argparse
+import base64
+import hashlib
+import http.client
+import json
+import mimetypes
+import os
+import queue
+import random
+import sys
+import time
+import urllib.parse
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from profiling import span
+
+MANIFEST_NAME = '.confluence-manifest.json'
+ASSET_SUFFIXES = ('.svg', '.png', '.pdf', '.json', '.js')    # .json/.js: layout_json.py
+
+RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+RETRIES = 4
+BACKOFF = 0.5           # seconds before the first retry, doubled each time
+MAX_BACKOFF = 30
+TIMEOUT = 60
+PAGE_LIMIT = 200        # attachments per listing request
+
+
+class UploadError(Exception):
+    pass
+
+
+# ── HTTP client ──
+class ConfluenceClient:
+    """Confluence REST calls over a pool of keep-alive connections.
+
+    Safe to share between threads: each request borrows a connection
+    from the pool (opening one when none is idle) and returns it after
+    reading the response, so the pool never holds more connections
+    than there are concurrent callers.
+    """
+
+    def __init__(self, base_url, user=None, token=None, retries=RETRIES, backoff=BACKOFF,
+                 timeout=TIMEOUT):
+        url = urllib.parse.urlsplit(base_url)
+        if url.scheme not in ('http', 'https'):
+            raise ValueError(f'not an http(s) URL: {base_url}')
+        self.conn_class = http.client.HTTPSConnection if url.scheme == 'https' else http.client.HTTPConnection
+        self.netloc = url.netloc
+        self.prefix = url.path.rstrip('/')
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.headers = {'Accept': 'application/json', 'X-Atlassian-Token': 'no-check'}
+        if user and token:
+            basic = base64.b64encode(f'{user}:{token}'.encode()).decode()
+            self.headers['Authorization'] = f'Basic {basic}'
+        elif token:
+            self.headers['Authorization'] = f'Bearer {token}'
+        self._idle = queue.LifoQueue()
+        self.opened = 0
+        self.requests = 0
+
+    @classmethod
+    def from_env(cls, base_url=None, **kwargs):
+        base_url = base_url or os.environ.get('CONFLUENCE_URL')
+        if not base_url:
+            raise UploadError('set CONFLUENCE_URL or pass --url')
+        return cls(base_url, os.environ.get('CONFLUENCE_USER'), os.environ.get('CONFLUENCE_TOKEN'),
+                   **kwargs)
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            self.opened += 1
+            return self.conn_class(self.netloc, timeout=self.timeout)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def _delay(self, attempt, retry_after=None):
+        if retry_after and retry_after.isdigit():
+            return min(int(retry_after), MAX_BACKOFF)
+        return min(self.backoff * 2 ** attempt, MAX_BACKOFF) * random.uniform(0.5, 1)
+
+    def request(self, method, path, body=None, headers=None):
+        """Send a request, retrying transient failures; returns the decoded JSON body."""
+        url = self.prefix + path
+        headers = {**self.headers, **(headers or {})}
+        for attempt in range(self.retries + 1):
+            conn = self._acquire()
+            self.requests += 1
+            try:
+                conn.request(method, url, body=body, headers=headers)
+                resp = conn.getresponse()
+                data = resp.read()
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                problem, retry_after = f'{type(e).__name__}: {e}', None
+            else:
+                if resp.will_close:
+                    conn.close()
+                else:
+                    self._idle.put(conn)
+                if resp.status < 300:
+                    return json.loads(data) if data else None
+                problem = f'HTTP {resp.status} {data[:200].decode("utf-8", "replace")}'
+                if resp.status not in RETRY_STATUS:
+                    raise UploadError(f'{method} {url}: {problem}')
+                retry_after = resp.getheader('Retry-After')
+            if attempt < self.retries:
+                time.sleep(self._delay(attempt, retry_after))
+        raise UploadError(f'{method} {url}: {problem} (after {self.retries + 1} attempts)')
+
+    # ── Attachments ──
+    def attachments(self, page_id):
+        """{file name: (attachment id, version)} for every attachment of a page."""
+        found = {}
+        start = 0
+        while True:
+            query = urllib.parse.urlencode({'start': start, 'limit': PAGE_LIMIT, 'expand': 'version'})
+            data = self.request('GET', f'/rest/api/content/{page_id}/child/attachment?{query}')
+            results = data.get('results', [])
+            for att in results:
+                found[att['title']] = (att['id'], att['version']['number'])
+            if len(results) < PAGE_LIMIT or 'next' not in data.get('_links', {}):
+                return found
+            start += len(results)
+
+    def upload(self, page_id, name, content, comment=None):
+        """Create or update attachment name on a page; returns (attachment id, version)."""
+        content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+        fields = [('minorEdit', None, 'text/plain', b'true')]
+        if comment:
+            fields.append(('comment', None, 'text/plain', comment.encode()))
+        fields.append(('file', name, content_type, content))
+        body, multipart_type = _multipart(fields)
+        data = self.request('PUT', f'/rest/api/content/{page_id}/child/attachment', body,
+                            {'Content-Type': multipart_type})
+        att = data['results'][0] if 'results' in data else data
+        return att['id'], att['version']['number']
+
+
+def _multipart(fields):
+    """multipart/form-data body for (name, filename, content type, bytes) fields."""
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, filename, content_type, value in fields:
+        disposition = f'form-data; name="{name}"'
+        if filename:
+            disposition += f'; filename="{filename}"'
+        parts.append(f'--{boundary}\r\nContent-Disposition: {disposition}\r\n'
+                     f'Content-Type: {content_type}\r\n\r\n'.encode() + value + b'\r\n')
+    parts.append(f'--{boundary}--\r\n'.encode())
+    return b''.join(parts), f'multipart/form-data; boundary={boundary}'
+
+
+# ── Manifest ──
+def load_manifest(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_manifest(path, manifest):
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+        f.write('\n')
+    os.replace(tmp, path)
+
+
+def file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def find_assets(paths):
+    """Files named by paths, expanding directories to their chart files (not dotfiles)."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(os.path.join(path, name) for name in os.listdir(path)
+                                if name.endswith(ASSET_SUFFIXES) and not name.startswith('.')))
+        else:
+            files.append(path)
+    names = {}
+    for path in files:
+        other = names.setdefault(os.path.basename(path), path)
+        if other != path:
+            raise UploadError(f'{other} and {path} would be the same attachment')
+    return files
+
+
+# ── Publishing ──
+def publish(client, page_id, paths, manifest_path, jobs=4, refresh=False, dry_run=False, comment=None):
+    """Upload the files whose content changed since the manifest was written.
+
+    Returns (uploaded, unchanged, failed): uploaded is [(path, version)],
+    unchanged [path] and failed [(path, error)]. A failed upload, whatever
+    the exception, is only recorded; the others still run.
+    """
+    manifest = load_manifest(manifest_path)
+    entries = manifest.setdefault(str(page_id), {})
+    if refresh:
+        with span('publish.refresh'):
+            remote = client.attachments(page_id)
+        for name in list(entries):
+            entry = entries[name]
+            if remote.get(name) != (entry['id'], entry['version']):
+                del entries[name]
+
+    hashes, failed = {}, []
+    with span('publish.hash', files=len(paths)):
+        for path in paths:
+            try:
+                hashes[path] = file_hash(path)
+            except OSError as e:
+                failed.append((path, f'{type(e).__name__}: {e}'))
+    changed, unchanged = [], []
+    for path in hashes:
+        same = entries.get(os.path.basename(path), {}).get('sha256') == hashes[path]
+        (unchanged if same else changed).append(path)
+    if dry_run:
+        return [(p, None) for p in changed], unchanged, failed
+
+    def upload(path):
+        with open(path, 'rb') as f:
+            content = f.read()
+        return client.upload(page_id, os.path.basename(path), content, comment)
+
+    uploaded = []
+    try:
+        with span('publish.upload', files=len(changed)), \
+                ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+            futures = {pool.submit(upload, path): path for path in changed}
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    att_id, version = future.result()
+                except UploadError as e:
+                    failed.append((path, str(e)))
+                    continue
+                except Exception as e:      # unreadable file, unexpected response shape
+                    failed.append((path, f'{type(e).__name__}: {e}'))
+                    continue
+                entries[os.path.basename(path)] = {'sha256': hashes[path], 'id': att_id,
+                                                   'version': version}
+                uploaded.append((path, version))
+    finally:
+        save_manifest(manifest_path, manifest)
+    return uploaded, unchanged, failed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Upload changed chart files to a Confluence page.')
+    parser.add_argument('paths', nargs='+', help='chart files or directories of them')
+    parser.add_argument('--page', required=True, help='Confluence page (content) id')
+    parser.add_argument('--url', help='Confluence base URL (default: $CONFLUENCE_URL)')
+    parser.add_argument('-j', '--jobs', type=int, default=4, help='concurrent uploads (default: 4)')
+    parser.add_argument('--manifest', help=f'manifest file (default: {MANIFEST_NAME} next to the first file)')
+    parser.add_argument('--refresh', action='store_true',
+                        help='re-upload files whose attachment changed in Confluence')
+    parser.add_argument('--dry-run', action='store_true', help='only list the files that would be uploaded')
+    parser.add_argument('--comment', help='attachment version comment')
+    args = parser.parse_args()
+
+    files = find_assets(args.paths)
+    if not files:
+        sys.exit('no chart files found')
+    manifest_path = args.manifest or os.path.join(os.path.dirname(files[0]) or '.', MANIFEST_NAME)
+    client = ConfluenceClient.from_env(args.url)
+    t0 = time.perf_counter()
+    try:
+        uploaded, unchanged, failed = publish(client, args.page, files, manifest_path, args.jobs,
+                                              args.refresh, args.dry_run, args.comment)
+    finally:
+        client.close()
+
+    for path, version in uploaded:
+        print(f"upload: {path}" + (f" (v{version})" if version else ''))
+    for path, error in failed:
+        print(f"FAILED: {path}: {error}")
+    verb = 'to upload' if args.dry_run else 'uploaded'
+    print(f"{len(uploaded)} {verb}, {len(unchanged)} unchanged, {len(failed)} failed "
+          f"({client.requests} requests, {client.opened} connections, {time.perf_counter() - t0:.2f}s)")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,231 @@
+"""Batch renderer: draw every chart for a directory of plan files.
+
+A plan file (JSON, or YAML when PyYAML is installed) holds a 'gantt'
+section shaped like timeline_gantt.PLAN and/or a 'milestone_timeline'
+section shaped like milestone_timeline.PLAN. A top-level 'title' is
+used by both unless a section sets its own. The 'gantt' section also
+yields the per-role load histogram (see load_histogram.py).
+
+All charts render in one warm process, so matplotlib, the theme and the
+font lookup are set up once. -j N fans the charts out to N worker
+processes, each warmed once by the pool initializer. --formats writes
+several formats from each laid-out figure (see export.py); --optimize
+runs each SVG through svg_optimize as soon as it is written, and
+--embed-fonts inlines subsets of the chart fonts (see fonts.py).
+
+Charts whose plan data, style, renderer and output options are unchanged
+are copied from the build cache (see build_cache.py) instead of being
+rendered again; --no-cache turns that off.
+
+--trace / --cprofile profile the run (see profiling.py); stage spans
+are only recorded in this process, so trace with -j 1.
+
+    python render_all.py plans/ -o out/ [-j 4] [--gantt-backend svg] [--optimize]
+                         [--embed-fonts] [-f svg,png,pdf] [--dpi png=300]
+"""
+import argparse
+import json
+import os
+import time
+
+import fonts
+import load_histogram
+import milestone_timeline
+import profiling
+import timeline_gantt
+from build_cache import CACHE_DIR, BuildCache, cache_key, renderer_version
+from export import dpi_spec, output_paths, parse_dpi, parse_formats
+from profiling import span
+from svg_optimize import optimize_file, report
+from theme import setup_matplotlib
+
+PLAN_SUFFIXES = ('.json', '.yaml', '.yml')
+
+# chart -> (plan section it draws, output file suffix; the extension is swapped per format)
+CHARTS = {
+    'gantt': ('gantt', '_gantt.svg'),
+    'milestone_timeline': ('milestone_timeline', '_milestone.svg'),
+    'load': ('gantt', '_load.svg'),
+}
+
+
+def load_plan(path):
+    """Read a plan definition from a JSON or YAML file."""
+    with open(path, encoding='utf-8') as f:
+        if path.endswith('.json'):
+            return json.load(f)
+        try:
+            import yaml
+        except ImportError:
+            raise RuntimeError(f'{path}: PyYAML is required for YAML plans')
+        return yaml.safe_load(f)
+
+
+def find_plans(plan_dir):
+    return sorted(os.path.join(plan_dir, name) for name in os.listdir(plan_dir)
+                  if name.endswith(PLAN_SUFFIXES))
+
+
+def plan_jobs(plan_paths, out_dir):
+    """{(chart, plan_path, out_path): data} for every chart a plan defines.
+
+    Each file is read once; data is the section the chart draws (see
+    job_data) and is what both job_key and render_job take.
+    """
+    jobs = {}
+    for path in plan_paths:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        with span('render_all.load_plan'):
+            plan = load_plan(path)
+        for chart, (section, suffix) in CHARTS.items():
+            if section in plan:
+                jobs[(chart, path, os.path.join(out_dir, stem + suffix))] = job_data(plan, chart)
+    return jobs
+
+
+def job_data(plan, chart):
+    """The section of a loaded plan that chart renders, with the plan-level title filled in."""
+    data = dict(plan[CHARTS[chart][0]])
+    data.setdefault('title', plan.get('title', ''))
+    return data
+
+
+def chart_module(chart):
+    """Module whose normalize_plan() reads the chart's section."""
+    return milestone_timeline if chart == 'milestone_timeline' else timeline_gantt
+
+
+def chart_style(chart):
+    """Style constants a chart's output depends on."""
+    if chart in ('gantt', 'load'):
+        return {'C': timeline_gantt.C, 'role_colors': timeline_gantt.ROLE_COLORS,
+                'phase_tints': timeline_gantt.PHASE_TINTS}
+    return {'C': milestone_timeline.C}
+
+
+def job_key(job, data, gantt_backend='matplotlib', precision=None, formats=('svg',), dpi=None,
+            embed_fonts=False):
+    """Build cache key for one chart job and its plan data."""
+    chart = job[0]
+    return cache_key(
+        chart=chart,
+        data=chart_module(chart).normalize_plan(data),
+        style=chart_style(chart),
+        renderer=renderer_version(),
+        fonts=fonts.resolve(),
+        formats=list(formats),
+        dpi=dpi or {},
+        backend=gantt_backend if chart == 'gantt' else None,
+        precision=precision,
+        embed_fonts=embed_fonts,
+    )
+
+
+def render_job(job, data, gantt_backend='matplotlib', precision=None, formats=('svg',), dpi=None,
+               embed_fonts=False):
+    """Render one chart of data in each format; returns (out_paths, seconds, sizes).
+
+    With a precision the SVG is optimized in place and sizes is its
+    (bytes_before, bytes_after); otherwise sizes is None. embed_fonts
+    then inlines the fonts its text uses.
+    """
+    chart, _, out_path = job
+    t0 = time.perf_counter()
+    with span('render_all.job', chart=out_path):
+        if chart == 'gantt':
+            paths = timeline_gantt.render_formats(data, out_path, list(formats), dpi, gantt_backend)
+        elif chart == 'load':
+            paths = load_histogram.render(data, out_path, list(formats), dpi)
+        else:
+            paths = milestone_timeline.render(data, out_path, list(formats), dpi)
+        sizes = None
+        if precision is not None and 'svg' in formats:
+            with span('svg_optimize'):
+                sizes = optimize_file(output_paths(out_path, ['svg'])[0], precision=precision)
+        if embed_fonts and 'svg' in formats:
+            with span('fonts.embed'):
+                fonts.embed_file(output_paths(out_path, ['svg'])[0])
+    return paths, time.perf_counter() - t0, sizes
+
+
+def _render_job_star(args):
+    return render_job(*args)
+
+
+def render_all(plan_dir, out_dir, jobs=1, gantt_backend='matplotlib', precision=None,
+               cache=None, formats=('svg',), dpi=None, embed_fonts=False):
+    """Render every chart under plan_dir into out_dir; returns [(out_paths, seconds, sizes)].
+
+    With a BuildCache, charts found in it are copied out instead and only
+    the rendered ones are returned.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    todo = plan_jobs(find_plans(plan_dir), out_dir)
+    opts = (gantt_backend, precision, tuple(formats), dpi, embed_fonts)
+    if cache is None:
+        return _render_jobs(todo, jobs, opts)
+
+    with span('cache.lookup', jobs=len(todo)):
+        keys = {job: job_key(job, data, *opts) for job, data in todo.items()}
+        todo = {job: data for job, data in todo.items()
+                if not cache.fetch(keys[job], output_paths(job[2], formats))}
+    results = _render_jobs(todo, jobs, opts)
+    with span('cache.store', jobs=len(todo)):
+        for job in todo:
+            cache.store(keys[job], output_paths(job[2], formats))
+        cache.evict()
+    return results
+
+
+def _render_jobs(todo, jobs, opts):
+    if not todo:
+        return []
+    gantt_backend, _, formats, *_ = opts
+    needs_mpl = (gantt_backend != 'svg' or formats != ('svg',)
+                 or any(s != 'gantt' for s, _, _ in todo))
+
+    if jobs > 1 and len(todo) > 1:
+        init = setup_matplotlib if needs_mpl else None
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=jobs, initializer=init) as pool:
+            return list(pool.map(_render_job_star, [(j, d, *opts) for j, d in todo.items()]))
+
+    if needs_mpl:
+        setup_matplotlib()
+    return [render_job(j, d, *opts) for j, d in todo.items()]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Render all charts for a directory of plan files.')
+    parser.add_argument('plan_dir')
+    parser.add_argument('-o', '--out-dir', default='/tmp/agent_c_charts')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='worker processes (default: render in this process)')
+    parser.add_argument('--gantt-backend', choices=['matplotlib', 'svg'], default='matplotlib')
+    parser.add_argument('-f', '--formats', type=parse_formats, default=['svg'],
+                        help='comma-separated formats, e.g. svg,png,pdf (default: svg)')
+    parser.add_argument('--dpi', action='append', type=dpi_spec, metavar='FMT=DPI',
+                        help='per-format resolution, e.g. png=300 (repeatable)')
+    parser.add_argument('--optimize', action='store_true', help='optimize each SVG after rendering')
+    parser.add_argument('--precision', type=int, default=2,
+                        help='decimal places kept by --optimize (default: 2)')
+    parser.add_argument('--embed-fonts', action='store_true',
+                        help='inline subsets of the chart fonts into each SVG')
+    parser.add_argument('--cache-dir', default=CACHE_DIR)
+    parser.add_argument('--no-cache', action='store_true', help='always render every chart')
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    cache = None if args.no_cache else BuildCache(args.cache_dir)
+    with profiling.session(args):
+        results = render_all(args.plan_dir, args.out_dir, args.jobs, args.gantt_backend,
+                             args.precision if args.optimize else None, cache,
+                             args.formats, parse_dpi(args.dpi), args.embed_fonts)
+    for out_paths, secs, sizes in results:
+        print(f"OK: {', '.join(out_paths)} ({secs * 1000:.0f} ms)")
+        if sizes:
+            report(out_paths[0], *sizes)
+    if cache is not None:
+        cache.report()
+    print(f"{len(results)} charts rendered in {time.perf_counter() - t0:.2f}s")
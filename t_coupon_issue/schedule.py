@@ -0,0 +1,121 @@
+"""Critical path of a Gantt plan from its task dependencies.
+
+A task tuple may carry a seventh element: the tasks it depends on
+(finish-to-start). Each is named by the task name, or by 'ROLE/name'
+when several roles share the name; a bare name means every task called
+that.
+
+    ('BE-1', 'compensate·FF', 5, 4, 5.3, True, ['gate_keeper Lua']),
+
+schedule() runs the usual critical path method over the dependency graph
+in topological order (Kahn), so it costs O(V + E):
+
+  forward   ES = the later of its planned start and the latest EF of its
+            dependencies; EF = ES + duration
+  backward  LF = earliest LS of its dependents, or the project finish;
+            LS = LF - duration
+  slack     LS - ES; the critical path is the zero-slack tasks
+
+Durations are the planned bar lengths (end - start, in weeks).
+"""
+from collections import deque
+
+EPS = 1e-9
+
+
+def task_deps(task):
+    return task[6] if len(task) > 6 and task[6] else ()
+
+
+def task_key(task):
+    """(role, name): how the chart refers to one task."""
+    return task[0], task[1]
+
+
+def _lookup(tasks):
+    """ref -> [task indices] for the bare names and 'ROLE/name' refs that deps use."""
+    wanted = {ref for t in tasks for ref in task_deps(t)}
+    refs = {}
+    for i, t in enumerate(tasks):
+        if t[1] in wanted:
+            refs.setdefault(t[1], []).append(i)
+        key = f'{t[0]}/{t[1]}'
+        if key in wanted:
+            refs.setdefault(key, []).append(i)
+    return refs
+
+
+def _cpm(tasks):
+    """(es, ef, ls, lf) lists indexed like tasks; see schedule()."""
+    n = len(tasks)
+    refs = _lookup(tasks)
+    succ = [[] for _ in range(n)]
+    preds = [[] for _ in range(n)]
+    for i, t in enumerate(tasks):
+        for ref in task_deps(t):
+            if ref not in refs:
+                raise ValueError(f'{t[1]!r} depends on unknown task {ref!r}')
+            for j in refs[ref]:
+                succ[j].append(i)
+                preds[i].append(j)
+
+    # Kahn: a task is ready once all of its dependencies are ordered
+    indegree = [len(p) for p in preds]
+    ready = deque(i for i in range(n) if not indegree[i])
+    order = []
+    while ready:
+        i = ready.popleft()
+        order.append(i)
+        for k in succ[i]:
+            indegree[k] -= 1
+            if not indegree[k]:
+                ready.append(k)
+    if len(order) < n:
+        stuck = sorted({tasks[i][1] for i in range(n) if indegree[i]})
+        raise ValueError(f"dependency cycle among: {', '.join(stuck)}")
+
+    dur = [t[4] - t[3] for t in tasks]
+    es, ef = [0.0] * n, [0.0] * n
+    for i in order:
+        es[i] = max([tasks[i][3]] + [ef[j] for j in preds[i]])
+        ef[i] = es[i] + dur[i]
+    finish = max(ef, default=0.0)
+    ls, lf = [0.0] * n, [0.0] * n
+    for i in reversed(order):
+        lf[i] = min((ls[k] for k in succ[i]), default=finish)
+        ls[i] = lf[i] - dur[i]
+    return es, ef, ls, lf
+
+
+def schedule(tasks):
+    """{task index: {'es', 'ef', 'ls', 'lf', 'slack', 'critical'}} for tasks.
+
+    Raises ValueError for a dependency on an unknown task or a cycle.
+    """
+    es, ef, ls, lf = _cpm(tasks)
+    return {i: {'es': es[i], 'ef': ef[i], 'ls': ls[i], 'lf': lf[i], 'slack': ls[i] - es[i],
+                'critical': ls[i] - es[i] <= EPS}
+            for i in range(len(tasks))}
+
+
+def conflicts(tasks):
+    """(task, dependency) pairs where the plan starts task before dependency ends."""
+    refs = _lookup(tasks)
+    return [(t, tasks[j]) for t in tasks for ref in task_deps(t)
+            for j in refs.get(ref, ()) if tasks[j][4] > t[3] + EPS]
+
+
+def critical_path(phases, names=(), flagged=True):
+    """Set of task_key()s on the critical path of phases.
+
+    With dependencies it is computed by schedule(). Plans without any
+    fall back to the hand-kept list: tasks whose name is in names, or
+    (flagged) whose sixth element is True.
+    """
+    tasks = [t for phase in phases for t in phase['tasks']]
+    if any(task_deps(t) for t in tasks):
+        es, _, ls, _ = _cpm(tasks)
+        return {task_key(t) for t, e, l in zip(tasks, es, ls) if l - e <= EPS}
+    names = set(names)
+    return {task_key(t) for t in tasks
+            if t[1] in names or (flagged and len(t) > 5 and t[5] is True)}
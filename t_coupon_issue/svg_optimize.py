@@ -0,0 +1,283 @@
+"""Shrink matplotlib SVG output before it is attached to Confluence.
+
+Passes, in order:
+  - drop <metadata>, the XML prolog and no-op rotate(-0 ...) transforms
+  - move a clip-path shared by every child of a group onto the group
+    (only when no child has a transform the clip would be read through)
+  - round coordinates (d, x, y, width, ... and transforms) to a precision
+  - hoist repeated shapes: paths that differ only by a translation share
+    one <path> in <defs> and are drawn with <use x= y=>
+  - move style="..." strings used more than once into CSS classes
+
+Generated ids (s0, s1, ...) and classes (c0, c1, ...) skip names the
+document already uses.
+
+    python svg_optimize.py chart.svg [more.svg ...] [-p 2] [-o out_dir]
+
+Prints the bytes saved for each file.
+"""
+import argparse
+import os
+import re
+import xml.etree.ElementTree as ET
+
+SVG_NS = 'http://www.w3.org/2000/svg'
+XLINK_NS = 'http://www.w3.org/1999/xlink'
+HREF = f'{{{XLINK_NS}}}href'
+ET.register_namespace('', SVG_NS)
+ET.register_namespace('xlink', XLINK_NS)
+
+NUMERIC_ATTRS = ('x', 'y', 'x1', 'y1', 'x2', 'y2', 'cx', 'cy', 'r', 'rx', 'ry',
+                 'width', 'height')
+NUM_RE = re.compile(r'-?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][-+]?\d+)?')
+PATH_TOKEN_RE = re.compile(r'[A-Za-z]|-?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][-+]?\d+)?')
+NOOP_ROTATE_RE = re.compile(r'rotate\(-?0(?:\s[^)]*)?\)')
+CSS_CLASS_RE = re.compile(r'\.(-?[_a-zA-Z][-\w]*)')
+
+
+def _tag(el):
+    return el.tag.rpartition('}')[2]
+
+
+def _fmt(v, precision):
+    s = f'{v:.{precision}f}'.rstrip('0').rstrip('.') if precision > 0 else str(round(v))
+    return '0' if s in ('-0', '') else s
+
+
+def _round_numbers(text, precision):
+    return NUM_RE.sub(lambda m: _fmt(float(m.group()), precision), text)
+
+
+def _parse_path(d):
+    """[(cmd, [numbers])] for absolute M/L/Q/C/Z paths, else None."""
+    segs = []
+    for tok in PATH_TOKEN_RE.findall(d):
+        if tok.isalpha():
+            if tok not in 'MLQCZz':
+                return None
+            segs.append((tok.upper(), []))
+        elif not segs:
+            return None
+        else:
+            segs[-1][1].append(float(tok))
+    return segs
+
+
+def _format_path(segs, precision, dx=0.0, dy=0.0):
+    out = []
+    for cmd, nums in segs:
+        coords = [_fmt(v - (dx if i % 2 == 0 else dy), precision) for i, v in enumerate(nums)]
+        out.append(cmd + ' '.join(coords))
+    return ''.join(out)
+
+
+def _fresh_names(prefix, taken):
+    """prefix0, prefix1, ... skipping the names in taken."""
+    n = 0
+    while True:
+        name = f'{prefix}{n}'
+        n += 1
+        if name not in taken:
+            yield name
+
+
+def _strip(root):
+    for parent in root.iter():
+        for child in list(parent):
+            if _tag(child) == 'metadata':
+                parent.remove(child)
+    for el in root.iter():
+        t = el.get('transform')
+        if t is not None:
+            t = NOOP_ROTATE_RE.sub('', t).strip()
+            if t:
+                el.set('transform', t)
+            else:
+                del el.attrib['transform']
+
+
+def _lift_clips(root):
+    """Move a clip-path shared by all of a group's children onto the group.
+
+    A child's clip is in its own coordinates, i.e. after its transform,
+    so groups with a transformed child are left alone.
+    """
+    for g in root.iter(f'{{{SVG_NS}}}g'):
+        clips = {child.get('clip-path') for child in g}
+        if (len(clips) == 1 and None not in clips and 'clip-path' not in g.attrib
+                and not any('transform' in child.attrib for child in g)):
+            g.set('clip-path', clips.pop())
+            for child in g:
+                del child.attrib['clip-path']
+
+
+def _round(root, precision):
+    for el in root.iter():
+        for name in NUMERIC_ATTRS:
+            if name in el.attrib:
+                el.set(name, _round_numbers(el.get(name), precision))
+        for name in ('transform', 'points', 'viewBox'):
+            if name in el.attrib:
+                el.set(name, _round_numbers(el.get(name), precision))
+        if _tag(el) == 'path' and 'd' in el.attrib:
+            segs = _parse_path(el.get('d'))
+            if segs is None:
+                d = _round_numbers(el.get('d'), precision)
+                el.set('d', re.sub(r'\s*([A-Za-z])\s*', r'\1', ' '.join(d.split())))
+            else:
+                el.set('d', _format_path(segs, precision))
+
+
+def _hoist_shapes(root, precision):
+    """Share translated copies of the same path through <defs>/<use>."""
+    parents = {child: parent for parent in root.iter() for child in parent}
+    groups = {}            # (shape, attrs, in_defs) -> [(path element, dx, dy)]
+    for el in root.iter(f'{{{SVG_NS}}}path'):
+        segs = _parse_path(el.get('d', ''))
+        if segs is None or len(segs) < 2 or not segs[0][1]:
+            continue
+        dx, dy = segs[0][1][0], segs[0][1][1]
+        shape = _format_path(segs, precision, dx, dy)
+        in_defs = _tag(parents[el]) == 'defs'
+        if in_defs and 'transform' in el.attrib:
+            continue  # the offset would have to be scaled into the <use>
+        # Defs paths keep their own style; loose paths hand theirs to the <use>
+        attrs = tuple(sorted((k, v) for k, v in el.attrib.items()
+                             if k not in ('d', 'id'))) if in_defs else ()
+        groups.setdefault((shape, attrs, in_defs), []).append((el, dx, dy))
+
+    uses = {}
+    for use in root.iter(f'{{{SVG_NS}}}use'):
+        uses.setdefault(use.get(HREF, '').lstrip('#'), []).append(use)
+
+    defs = root.find(f'{{{SVG_NS}}}defs')
+    if defs is None:
+        defs = ET.Element(f'{{{SVG_NS}}}defs')
+        root.insert(0, defs)
+
+    ids = _fresh_names('s', {el.get('id') for el in root.iter() if 'id' in el.attrib})
+    for (shape, attrs, in_defs), members in groups.items():
+        if len(members) < 2:
+            continue
+        sid = next(ids)
+        ET.SubElement(defs, f'{{{SVG_NS}}}path', {'id': sid, 'd': shape, **dict(attrs)})
+        for el, dx, dy in members:
+            parent = parents[el]
+            if in_defs:
+                # Re-point existing <use>s, folding the offset into x/y
+                for use in uses.get(el.get('id'), []):
+                    use.set(HREF, f'#{sid}')
+                    use.set('x', _fmt(float(use.get('x', 0)) + dx, precision))
+                    use.set('y', _fmt(float(use.get('y', 0)) + dy, precision))
+                parent.remove(el)
+            else:
+                attrib = {k: v for k, v in el.attrib.items() if k not in ('d', 'id')}
+                clip = attrib.pop('clip-path', None)
+                transform = attrib.pop('transform', None) if clip is not None else None
+                use = ET.Element(f'{{{SVG_NS}}}use', {
+                    HREF: f'#{sid}', 'x': _fmt(dx, precision), 'y': _fmt(dy, precision), **attrib})
+                if clip is not None:
+                    # Renderers disagree on whether a <use>'s clip moves with
+                    # its x/y, so clip from an untranslated parent instead,
+                    # one carrying the path's transform if it had one
+                    if (transform is None and _tag(parent) == 'g' and len(parent) == 1
+                            and 'clip-path' not in parent.attrib):
+                        parent.set('clip-path', clip)
+                    else:
+                        wrap = ET.Element(f'{{{SVG_NS}}}g', {'clip-path': clip})
+                        if transform is not None:
+                            wrap.set('transform', transform)
+                        wrap.append(use)
+                        use = wrap
+                use.tail = el.tail
+                parent[list(parent).index(el)] = use
+    # Drop <defs> blocks that are now empty
+    for parent in list(root.iter()):
+        for child in list(parent):
+            if _tag(child) == 'defs' and len(child) == 0 and child is not defs:
+                parent.remove(child)
+
+
+def _classify_styles(root):
+    """Replace style strings that repeat with short CSS classes."""
+    counts = {}
+    for el in root.iter():
+        style = el.get('style')
+        if style:
+            counts[style] = counts.get(style, 0) + 1
+    taken = {cls for el in root.iter() for cls in el.get('class', '').split()}
+    taken.update(cls for el in root.iter(f'{{{SVG_NS}}}style')
+                 for cls in CSS_CLASS_RE.findall(el.text or ''))
+    names = _fresh_names('c', taken)
+    classes = {}
+    for style, count in sorted(counts.items(), key=lambda kv: -kv[1]):
+        if count > 1:
+            classes[style] = next(names)
+    if not classes:
+        return
+    for el in root.iter():
+        cls = classes.get(el.get('style'))
+        if cls:
+            del el.attrib['style']
+            el.set('class', f"{el.get('class')} {cls}" if el.get('class') else cls)
+
+    css = ''.join('.%s{%s}' % (cls, re.sub(r'\s*([:;])\s*', r'\1', style)) for style, cls in classes.items())
+    defs = root.find(f'{{{SVG_NS}}}defs')
+    style_el = defs.find(f'{{{SVG_NS}}}style') if defs is not None else None
+    if style_el is None:
+        if defs is None:
+            defs = ET.Element(f'{{{SVG_NS}}}defs')
+            root.insert(0, defs)
+        style_el = ET.SubElement(defs, f'{{{SVG_NS}}}style', {'type': 'text/css'})
+    style_el.text = (style_el.text or '') + css
+
+
+def _compact(root):
+    for el in root.iter():
+        if el.text is not None and not el.text.strip() and len(el):
+            el.text = None
+        if el.tail is not None and not el.tail.strip():
+            el.tail = None
+
+
+def optimize_svg(text, precision=2):
+    """Return an optimized copy of an SVG document string."""
+    root = ET.fromstring(text.encode('utf-8'))
+    _strip(root)
+    _lift_clips(root)
+    _round(root, precision)
+    _hoist_shapes(root, precision)
+    _classify_styles(root)
+    _compact(root)
+    return ET.tostring(root, encoding='unicode', short_empty_elements=True) + '\n'
+
+
+def optimize_file(path, out_path=None, precision=2):
+    """Optimize path (in place unless out_path); returns (bytes_before, bytes_after)."""
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    result = optimize_svg(text, precision)
+    with open(out_path or path, 'w', encoding='utf-8') as f:
+        f.write(result)
+    return len(text.encode('utf-8')), len(result.encode('utf-8'))
+
+
+def report(path, before, after):
+    saved = before - after
+    print(f"{path}: {before:,} -> {after:,} bytes "
+          f"(saved {saved:,}, {saved / before:.0%})" if before else f"{path}: empty")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Optimize SVG charts in place (or into --out-dir).')
+    parser.add_argument('files', nargs='+')
+    parser.add_argument('-p', '--precision', type=int, default=2,
+                        help='decimal places kept in coordinates (default: 2)')
+    parser.add_argument('-o', '--out-dir')
+    args = parser.parse_args()
+
+    for path in args.files:
+        out = os.path.join(args.out_dir, os.path.basename(path)) if args.out_dir else None
+        if args.out_dir:
+            os.makedirs(args.out_dir, exist_ok=True)
+        report(path, *optimize_file(path, out, args.precision))
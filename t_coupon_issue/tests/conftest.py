@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The chart modules are run from t_coupon_issue/ and import each other flat
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,33 @@
+import argparse
+
+import pytest
+
+from export import dpi_spec, parse_dpi
+
+
+def parser():
+    p = argparse.ArgumentParser()
+    p.add_argument('--dpi', action='append', type=dpi_spec)
+    return p
+
+
+def test_dpi_specs():
+    args = parser().parse_args(['--dpi', 'PNG=300', '--dpi', ' pdf = 72.5'])
+    assert parse_dpi(args.dpi) == {'png': 300.0, 'pdf': 72.5}
+    assert parse_dpi(['svg=96']) == {'svg': 96.0}
+    assert parse_dpi(None) == {}
+
+
+@pytest.mark.parametrize('value, message', [
+    ('png', 'expected FMT=DPI'),
+    ('=300', 'expected FMT=DPI'),
+    ('png=abc', 'DPI must be a positive number'),
+    ('png=0', 'DPI must be a positive number'),
+    ('png=inf', 'DPI must be a positive number'),
+    ('tiff=300', "unknown format 'tiff'"),
+])
+def test_bad_dpi_is_an_argparse_error(value, message, capsys):
+    with pytest.raises(SystemExit) as exit:
+        parser().parse_args(['--dpi', value])
+    assert exit.value.code == 2
+    assert message in capsys.readouterr().err
@@ -0,0 +1,76 @@
+import collections
+import random
+
+import pytest
+
+import timeline_gantt
+from gantt_pages import IntervalIndex, split_rows
+
+ROLES = ('BE', 'FE', 'DBA', 'QA', 'OPS')
+
+
+def random_intervals(rng, n):
+    # Half-week grid: many intervals touch each other and the query edges
+    out = []
+    for k in range(n):
+        start = rng.randrange(0, 60) / 2
+        out.append((start, start + rng.randrange(0, 10) / 2, k))
+    return out
+
+
+def scan(intervals, lo, hi):
+    return sorted(item for s, e, item in intervals if s < e and s < hi and e > lo)
+
+
+@pytest.mark.parametrize('seed', range(100))
+def test_overlapping_matches_a_linear_scan(seed):
+    rng = random.Random(seed)
+    intervals = random_intervals(rng, rng.randrange(0, 80))
+    index = IntervalIndex(intervals)
+    for _ in range(50):
+        lo = rng.randrange(-2, 64) / 2
+        hi = lo + rng.randrange(0, 12) / 2
+        assert sorted(index.overlapping(lo, hi)) == scan(intervals, lo, hi), (lo, hi)
+
+
+def test_touching_intervals_are_half_open():
+    index = IntervalIndex([(1, 3, 'a'), (3, 5, 'b'), (5, 5, 'empty')])
+    assert index.overlapping(3, 4) == ['b']
+    assert index.overlapping(2, 3) == ['a']
+    assert sorted(index.overlapping(1, 6)) == ['a', 'b']
+    assert index.overlapping(5, 7) == []
+
+
+def random_plan(rng, n_tasks):
+    phases = []
+    for p in range(rng.randrange(1, 5)):
+        tasks = []
+        for k in range(n_tasks):
+            start = rng.randrange(2, 40) / 2
+            tasks.append((rng.choice(ROLES), f'p{p}t{k}', 1, start,
+                          start + rng.randrange(1, 10) / 2, False))
+        phases.append({'name': f'P{p}', 'md': len(tasks), 'tasks': tasks})
+    return {'title': 'plan', 'phases': phases}
+
+
+def row_keys(rows):
+    return [(r['role'], r['phase_name'], r['tasks']) for r in rows]
+
+
+def page_tasks(pages):
+    return collections.Counter((phase['name'], t) for page in pages
+                               for phase in page['phases'] for t in phase['tasks'])
+
+
+@pytest.mark.parametrize('seed', range(30))
+@pytest.mark.parametrize('rows_per_page', [1, 3, 7, 40])
+def test_split_rows_keeps_every_task_once(seed, rows_per_page):
+    rng = random.Random(seed)
+    plan = random_plan(rng, rng.randrange(1, 30))
+    pages = split_rows(plan, rows_per_page)
+    assert page_tasks(pages) == page_tasks([plan])
+    page_rows = [timeline_gantt.build_rows(page['phases']) for page in pages]
+    assert all(len(rows) <= rows_per_page for rows in page_rows)
+    # Each page packs back into the rows it was cut from
+    whole = row_keys(timeline_gantt.build_rows(plan['phases']))
+    assert [key for rows in page_rows for key in row_keys(rows)] == whole
@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+
+MODULE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RENDER = """
+import sys
+if sys.argv[2:] == ['--no-fonttools']:
+    sys.modules['fontTools'] = None
+import gantt_svg
+gantt_svg.render_svg(out_path=sys.argv[1])
+assert 'matplotlib' not in sys.modules, 'matplotlib was imported'
+"""
+
+
+def _render(tmp_path, out_name, *args):
+    out = tmp_path / out_name
+    subprocess.run([sys.executable, '-c', RENDER, str(out), *args], cwd=MODULE_DIR, check=True,
+                   env={**os.environ, 'XDG_CACHE_HOME': str(tmp_path / 'cache')})
+    return out.read_text(encoding='utf-8')
+
+
+def test_cold_cache_does_not_import_matplotlib(tmp_path):
+    svg = _render(tmp_path, 'cold.svg')
+    assert svg.startswith('<svg') and svg.endswith('</svg>\n')
+    assert _render(tmp_path, 'warm.svg') == svg        # persisted resolution gives the same output
+
+
+def test_without_fonttools_falls_back_to_estimate(tmp_path):
+    svg = _render(tmp_path, 'estimate.svg', '--no-fonttools')
+    assert svg.startswith('<svg') and svg.endswith('</svg>\n')
+    assert not (tmp_path / 'cache' / 'confluence-assets' / 'font-resolution.json').exists()
@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+from timeline_gantt import pack_lanes
+
+
+def first_fit(tasks):
+    """The scan pack_lanes replaced: each task goes in the first lane it doesn't overlap."""
+    lanes = []
+    for t in sorted(tasks, key=lambda x: x[3]):
+        for lane in lanes:
+            if all(t[3] >= other[4] or t[4] <= other[3] for other in lane):
+                lane.append(t)
+                break
+        else:
+            lanes.append([t])
+    return lanes
+
+
+def random_tasks(rng, n, weeks, min_length=1):
+    tasks = []
+    for k in range(n):
+        # Half-week grid, so many bars touch (one ends where the next starts)
+        start = rng.randrange(2, 2 * weeks) / 2
+        end = start + rng.randrange(min_length, 12) / 2
+        tasks.append(('BE', f't{k}', 1, start, end, False))
+    return tasks
+
+
+@pytest.mark.parametrize('seed', range(200))
+def test_matches_first_fit(seed):
+    rng = random.Random(seed)
+    tasks = random_tasks(rng, rng.randrange(1, 60), rng.choice((4, 12, 40)))
+    assert pack_lanes(tasks) == first_fit(tasks)
+
+
+@pytest.mark.parametrize('seed', range(200))
+def test_matches_first_fit_with_zero_length_bars(seed):
+    rng = random.Random(seed)
+    tasks = random_tasks(rng, rng.randrange(1, 60), rng.choice((4, 12)), min_length=0)
+    assert pack_lanes(tasks) == first_fit(tasks)
+
+
+def test_touching_bars_share_a_lane():
+    tasks = [('BE', 'a', 1, 1, 3, False), ('BE', 'b', 1, 3, 5, False), ('BE', 'c', 1, 2, 4, False)]
+    assert [[t[1] for t in lane] for lane in pack_lanes(tasks)] == [['a', 'b'], ['c']]
+    assert pack_lanes(tasks) == first_fit(tasks)
+
+
+def test_freed_lanes_are_reused_lowest_first():
+    tasks = [('BE', n, 1, s, e, False) for n, s, e in
+             (('a', 1, 2), ('b', 1, 4), ('c', 1, 3), ('d', 3, 5), ('e', 2, 6))]
+    assert [[t[1] for t in lane] for lane in pack_lanes(tasks)] == [['a', 'e'], ['b'], ['c', 'd']]
+    assert pack_lanes(tasks) == first_fit(tasks)
+
+
+def test_zero_length_bar_shares_a_lane_started_with_it():
+    tasks = [('BE', n, 1, s, e, False) for n, s, e in
+             (('a', 1, 3), ('b', 2, 4), ('m', 2, 2), ('c', 2, 5))]
+    assert [[t[1] for t in lane] for lane in pack_lanes(tasks)] == [['a'], ['b', 'm'], ['c']]
+    assert pack_lanes(tasks) == first_fit(tasks)
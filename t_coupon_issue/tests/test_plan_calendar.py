@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from plan_calendar import Calendar, dates
+
+# W1 is the week of Tue 2025-04-01 (Monday 3/31); W3 has Good Friday off
+# and W6 starts with a two-day holiday
+HOLIDAYS = ['2025-04-18', '2025-05-05', '2025-05-06']
+
+
+@pytest.fixture
+def cal():
+    return Calendar('2025-04-01', holidays=HOLIDAYS)
+
+
+def test_weeks_ignore_holidays(cal):
+    np.testing.assert_allclose(
+        cal.weeks(['2025-04-01', '2025-04-07', '2025-04-12', '2025-04-18', '2025-05-02', '2025-05-07']),
+        [1.2, 2.0, 3.0, 3.8, 5.8, 6.4])
+    np.testing.assert_allclose(cal.weeks(['2025-05-07']), Calendar('2025-04-01').weeks(['2025-05-07']))
+
+
+def test_week_of(cal):
+    assert cal.week_of(['2025-03-30', '2025-03-31', '2025-04-06', '2025-04-07',
+                        '2025-05-05', '2026-01-01']).tolist() == [0, 1, 1, 2, 6, 40]
+
+
+def test_week_start(cal):
+    assert cal.week_start([1, 2, 6]).tolist() == dates(['2025-04-01', '2025-04-07', '2025-05-05']).tolist()
+
+
+def test_week_end_skips_holidays(cal):
+    assert cal.week_end([1, 3, 6]).tolist() == dates(['2025-04-04', '2025-04-17', '2025-05-09']).tolist()
+    # A week that is all holidays ends on the previous week's last business day
+    all_off = Calendar('2025-04-01', holidays=[f'2025-04-{d:02d}' for d in range(7, 12)])
+    assert all_off.week_end([2]).tolist() == dates(['2025-04-04']).tolist()
+
+
+def test_week_of_and_week_end_round_trip(cal):
+    weeks = np.arange(1, 60)
+    assert cal.week_of(cal.week_end(weeks)).tolist() == weeks.tolist()
+    assert cal.week_of(cal.week_start(weeks)).tolist() == weeks.tolist()
+
+
+def test_day_ticks_skip_holidays(cal):
+    positions, labels = cal.ticks(6, 7, 'day')
+    assert labels == ['5/7', '5/8', '5/9']
+    np.testing.assert_allclose(positions, [6.4, 6.6, 6.8])
+
+
+def test_week_ticks(cal):
+    positions, labels = cal.ticks(1, 4, 'week')
+    assert labels == ['3/31', '4/7', '4/14']
+    np.testing.assert_allclose(positions, [1, 2, 3])
+
+
+def test_auto_ticks_pick_months_then_years(cal):
+    positions, labels = cal.ticks(1, 60)
+    assert labels[:3] == ['Apr\n2025', 'May', 'Jun'] and labels[9] == 'Jan\n2026'
+    np.testing.assert_allclose(positions[:3], [1.2, 5.6, 10.0])
+    _, labels = cal.ticks(1, 300)
+    assert labels == ['2026', '2027', '2028', '2029', '2030']
+
+
+def test_week_labels(cal):
+    assert cal.week_labels(3) == ['W1\n4/1', 'W2\n4/7', 'W3\n4/14']
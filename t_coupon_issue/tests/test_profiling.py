@@ -0,0 +1,28 @@
+import tracemalloc
+
+import profiling
+
+
+def test_memory_tracing_started_here_is_stopped():
+    assert not tracemalloc.is_tracing()
+    profiling.enable(memory=True)
+    with profiling.span('alloc'):
+        block = [0] * 100_000
+    spans = profiling.disable()
+    assert not tracemalloc.is_tracing()
+    assert spans[0]['mem'] > 0
+    del block
+
+
+def test_callers_memory_tracing_is_left_running():
+    tracemalloc.start()
+    try:
+        profiling.enable(memory=True)
+        with profiling.span('alloc'):
+            block = [0] * 100_000
+        spans = profiling.disable()
+        assert tracemalloc.is_tracing()
+        assert spans[0]['mem'] > 0
+        del block
+    finally:
+        tracemalloc.stop()
@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+import confluence_stub
+from publish import MANIFEST_NAME, ConfluenceClient, UploadError, find_assets, publish
+
+PAGE = '42'
+
+
+@pytest.fixture
+def server():
+    server = confluence_stub.serve()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def charts(tmp_path):
+    for name, body in [('a.svg', '<svg>a</svg>'), ('b.svg', '<svg>b</svg>'), ('a.json', '{}')]:
+        (tmp_path / name).write_text(body)
+    return tmp_path
+
+
+def run(server, charts, **kwargs):
+    client = ConfluenceClient(server.url, backoff=0)
+    try:
+        return publish(client, PAGE, find_assets([str(charts)]), str(charts / MANIFEST_NAME),
+                       jobs=kwargs.pop('jobs', 2), **kwargs)
+    finally:
+        client.close()
+
+
+def test_uploads_only_changed_files(server, charts):
+    uploaded, unchanged, failed = run(server, charts)
+    assert len(uploaded) == 3 and not unchanged and not failed
+    manifest = json.loads((charts / MANIFEST_NAME).read_text())[PAGE]
+    assert sorted(manifest) == ['a.json', 'a.svg', 'b.svg']       # not the manifest itself
+    assert manifest['a.svg']['version'] == 1
+
+    requests = server.requests
+    uploaded, unchanged, failed = run(server, charts)
+    assert not uploaded and len(unchanged) == 3 and not failed
+    assert server.requests == requests                            # nothing sent
+
+    (charts / 'a.svg').write_text('<svg>a2</svg>')
+    uploaded, unchanged, failed = run(server, charts)
+    assert [(p.rsplit('/', 1)[-1], v) for p, v in uploaded] == [('a.svg', 2)]
+    assert server.pages[PAGE]['a.svg']['data'] == b'<svg>a2</svg>'
+    assert json.loads((charts / MANIFEST_NAME).read_text())[PAGE]['a.svg']['version'] == 2
+
+
+def test_retries_5xx_and_429(server, charts):
+    server.fail_next = [503, 429, 502]
+    uploaded, _, failed = run(server, charts, jobs=1)
+    assert len(uploaded) == 3 and not failed
+    assert server.requests == 6
+
+
+def test_gives_up_after_retries(server, charts):
+    server.fail_rate = 1.0
+    client = ConfluenceClient(server.url, retries=1, backoff=0)
+    _, _, failed = publish(client, PAGE, [str(charts / 'a.svg')], str(charts / MANIFEST_NAME))
+    client.close()
+    assert len(failed) == 1 and 'after 2 attempts' in failed[0][1]
+    assert server.requests == 2
+
+
+def test_other_errors_are_recorded_per_file(server, charts, monkeypatch):
+    upload = ConfluenceClient.upload
+
+    def flaky(self, page_id, name, content, comment=None):
+        if name == 'b.svg':
+            raise KeyError('results')       # an unexpected response shape
+        return upload(self, page_id, name, content, comment)
+
+    monkeypatch.setattr(ConfluenceClient, 'upload', flaky)
+    paths = find_assets([str(charts)]) + [str(charts / 'missing.svg')]
+    client = ConfluenceClient(server.url, backoff=0)
+    uploaded, _, failed = publish(client, PAGE, paths, str(charts / MANIFEST_NAME))
+    client.close()
+    assert len(uploaded) == 2
+    assert sorted(p.rsplit('/', 1)[-1] for p, _ in failed) == ['b.svg', 'missing.svg']
+    assert sorted(json.loads((charts / MANIFEST_NAME).read_text())[PAGE]) == ['a.json', 'a.svg']
+
+
+def test_non_retryable_status_fails_at_once(server):
+    server.fail_next = [404]
+    client = ConfluenceClient(server.url, backoff=0)
+    with pytest.raises(UploadError, match='HTTP 404'):
+        client.attachments(PAGE)
+    client.close()
+    assert server.requests == 1
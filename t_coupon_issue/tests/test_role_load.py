@@ -0,0 +1,59 @@
+import random
+
+import numpy as np
+import pytest
+
+from role_load import load_matrix, plan_load
+
+
+def brute_force(tasks, n_roles, n_weeks):
+    """Each task's MD spread over its bar, summed week by week."""
+    load = np.zeros((n_roles, n_weeks))
+    for role, md, start, end in tasks:
+        if end <= start:
+            continue
+        for k in range(1, n_weeks + 1):
+            overlap = min(end, k + 1) - max(start, k)
+            if overlap > 0:
+                load[role, k - 1] += md / (end - start) * overlap
+    return load
+
+
+def arrays(tasks):
+    role, md, start, end = zip(*tasks)
+    return np.array(role, dtype=np.intp), np.array(md, float), np.array(start, float), np.array(end, float)
+
+
+@pytest.mark.parametrize('seed', range(100))
+def test_matches_brute_force(seed):
+    rng = random.Random(seed)
+    n_roles, n_weeks = rng.randrange(1, 6), rng.randrange(1, 20)
+    tasks = []
+    for _ in range(rng.randrange(1, 40)):
+        # Quarter-week starts and ends, some before W1 or past the last week
+        start = rng.randrange(0, 4 * n_weeks + 4) / 4
+        end = start + rng.randrange(0, 4 * n_weeks) / 4
+        if rng.random() < 0.2:
+            end = n_weeks + 1          # ends with the last week
+        tasks.append((rng.randrange(n_roles), rng.choice((0, 0.5, 1, 3, 8)), start, end))
+    got = load_matrix(*arrays(tasks), n_roles, n_weeks)
+    np.testing.assert_allclose(got, brute_force(tasks, n_roles, n_weeks), atol=1e-9)
+
+
+def test_week_edges():
+    tasks = [(0, 4, 1, 3),            # two whole weeks
+             (0, 3, 2.5, 4),          # half of W2, all of W3
+             (1, 2, 3.25, 4.25)]      # ends a quarter into the last week
+    np.testing.assert_allclose(load_matrix(*arrays(tasks), 2, 4),
+                               [[2, 3, 2, 0], [0, 0, 1.5, 0.5]])
+
+
+def test_plan_load_flags_over_capacity():
+    plan = {'phases': [{'tasks': [('BE', 'a', 10, 1, 2, False), ('BE', 'b', 4, 2, 3, False),
+                                  ('DBA', 'c', 6, 1, 3, False)]}],
+            'week_labels': ['W1', 'W2'], 'capacity': {'DBA': 2}}
+    load = plan_load(plan, known_roles=('DBA',))
+    assert load['roles'] == ['DBA', 'BE']
+    np.testing.assert_allclose(load['load'], [[3, 3], [10, 4]])
+    assert load['over_weeks'] == [1, 2]
+    assert load['over'].tolist() == [[True, True], [True, False]]
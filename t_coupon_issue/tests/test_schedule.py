@@ -0,0 +1,52 @@
+import pytest
+
+import timeline_gantt
+from schedule import critical_path, schedule
+
+BUILTIN_CRITICAL = {
+    ('BE-1', '벤치마크·리뷰'), ('BE-1', 'gate_keeper Lua'), ('BE-1', 'compensate·FF'),
+    ('BE-2', 'MC통합'), ('BE-1', 'Shadow운영'), ('BE-1', 'MC 100%전환'), ('DBA', '인덱스6개삭제'),
+}
+
+
+def test_builtin_plan_critical_set():
+    assert timeline_gantt.normalize_plan(timeline_gantt.PLAN)['critical'] == BUILTIN_CRITICAL
+
+
+def test_forward_pass_keeps_planned_start():
+    tasks = [('A', 'design', 1, 1, 2, False),
+             ('A', 'build', 1, 3, 4, False, ['design'])]      # planned a week after design ends
+    s = schedule(tasks)
+    assert s[1]['es'] == 3 and s[1]['ef'] == 4
+    assert s[0]['slack'] == pytest.approx(1)
+    assert critical_path([{'tasks': tasks}]) == {('A', 'build')}
+
+
+def test_longest_chain_is_critical():
+    tasks = [('A', 'start', 1, 1, 2, False),
+             ('A', 'long', 1, 2, 5, False, ['start']),
+             ('B', 'short', 1, 2, 3, False, ['start']),
+             ('A', 'finish', 1, 5, 6, False, ['long', 'short'])]
+    assert critical_path([{'tasks': tasks}]) == {('A', 'start'), ('A', 'long'), ('A', 'finish')}
+
+
+def test_role_qualified_dependency():
+    tasks = [('A', 'prep', 1, 1, 3, False),
+             ('B', 'prep', 1, 1, 2, False),
+             ('B', 'run', 1, 2, 2.5, False, ['B/prep'])]
+    assert critical_path([{'tasks': tasks}]) == {('A', 'prep')}
+    tasks[2] = tasks[2][:6] + (['prep'],)       # a bare name waits for both
+    assert critical_path([{'tasks': tasks}]) == {('A', 'prep'), ('B', 'run')}
+
+
+def test_unknown_dependency_and_cycle():
+    with pytest.raises(ValueError, match='unknown task'):
+        schedule([('A', 'x', 1, 1, 2, False, ['nope'])])
+    with pytest.raises(ValueError, match='cycle'):
+        schedule([('A', 'x', 1, 1, 2, False, ['y']), ('A', 'y', 1, 2, 3, False, ['x'])])
+
+
+def test_flags_without_dependencies():
+    tasks = [('A', 'x', 1, 1, 2, True), ('A', 'y', 1, 2, 3, False)]
+    assert critical_path([{'tasks': tasks}]) == {('A', 'x')}
+    assert critical_path([{'tasks': tasks}], names={'y'}, flagged=False) == {('A', 'y')}
@@ -0,0 +1,105 @@
+import io
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from svg_optimize import HREF, SVG_NS, optimize_svg
+
+HEAD = f'<svg xmlns="{SVG_NS}" xmlns:xlink="http://www.w3.org/1999/xlink" width="200" height="100">'
+
+
+def svg(body):
+    return f'{HEAD}{body}</svg>'
+
+
+def elements(text, tag):
+    return list(ET.fromstring(text).iter(f'{{{SVG_NS}}}{tag}'))
+
+
+def pixels(text):
+    """RGBA bytes of an SVG string, rasterised with resvg."""
+    resvg_py = pytest.importorskip('resvg_py')
+    from PIL import Image
+    return Image.open(io.BytesIO(bytes(resvg_py.svg_to_bytes(svg_string=text)))).tobytes()
+
+
+def assert_same_drawing(before, after):
+    assert pixels(after) == pixels(before)
+
+
+CLIP = '<defs><clipPath id="c"><rect x="0" y="0" width="150" height="100"/></clipPath></defs>'
+
+
+def test_hoists_translated_copies_into_use():
+    text = svg(''.join(f'<path d="M{x} {y}L{x + 10} {y}L{x + 10} {y + 10}Z" style="fill:#f00"/>'
+                       for x, y in ((10, 10), (40.5, 20), (70, 55.25))))
+    out = optimize_svg(text)
+    shared = [p for p in elements(out, 'path') if p.get('id')]
+    assert len(shared) == 1 and shared[0].get('d') == 'M0 0L10 0L10 10Z'
+    uses = elements(out, 'use')
+    assert [(u.get('x'), u.get('y')) for u in uses] == [('10', '10'), ('40.5', '20'), ('70', '55.25')]
+    assert {u.get(HREF) for u in uses} == {f"#{shared[0].get('id')}"}
+    assert_same_drawing(text, out)
+
+
+def test_rounds_coordinates():
+    text = svg('<rect x="10.123456" y="-0.0001" width="20.5" height="30.999" style="fill:#00f"/>'
+               '<path d="M 1.23456 2.5 L 30.001 40 Z" style="stroke:#000"/>')
+    out = optimize_svg(text, precision=2)
+    rect, = elements(out, 'rect')
+    assert (rect.get('x'), rect.get('y'), rect.get('height')) == ('10.12', '0', '31')
+    assert elements(out, 'path')[0].get('d') == 'M1.23 2.5L30 40Z'
+
+
+def test_repeated_styles_become_classes():
+    text = svg('<rect x="0" y="0" width="5" height="5" style="fill: #0f0; stroke: none"/>' * 3
+               + '<rect x="9" y="9" width="5" height="5" style="fill:#00f"/>')
+    out = optimize_svg(text)
+    rects = elements(out, 'rect')
+    assert [r.get('class') for r in rects[:3]] == ['c0'] * 3
+    assert rects[3].get('style') == 'fill:#00f' and rects[3].get('class') is None
+    assert '.c0{fill:#0f0;stroke:none}' in elements(out, 'style')[0].text
+    assert_same_drawing(text, out)
+
+
+def test_lifts_a_shared_clip_onto_the_group():
+    text = svg(CLIP + '<g><rect x="0" y="0" width="200" height="40" clip-path="url(#c)"/>'
+                      '<rect x="0" y="60" width="200" height="40" clip-path="url(#c)"/></g>')
+    out = optimize_svg(text)
+    g, = elements(out, 'g')
+    assert g.get('clip-path') == 'url(#c)'
+    assert all(r.get('clip-path') is None for r in g)
+    assert_same_drawing(text, out)
+
+
+def test_keeps_clips_on_transformed_children():
+    text = svg(CLIP + '<g><rect transform="translate(100 0)" x="0" y="0" width="40" height="40"'
+                      ' clip-path="url(#c)" style="fill:#f00"/>'
+                      '<rect transform="translate(100 0)" x="0" y="50" width="40" height="40"'
+                      ' clip-path="url(#c)" style="fill:#f00"/></g>')
+    out = optimize_svg(text)
+    g, = elements(out, 'g')
+    assert g.get('clip-path') is None
+    assert [r.get('clip-path') for r in g] == ['url(#c)'] * 2
+    assert_same_drawing(text, out)
+
+
+def test_hoisted_transformed_path_keeps_its_clip_space():
+    path = '<path transform="translate(100 0)" d="M{0} 10L{1} 10L{1} 40Z" clip-path="url(#c)"/>'
+    text = svg(CLIP + path.format(20, 60) + path.format(-10, 30))
+    out = optimize_svg(text)
+    assert len(elements(out, 'use')) == 2
+    assert_same_drawing(text, out)
+
+
+def test_generated_names_skip_existing_ones():
+    text = svg('<style>.c0{fill:#00f}</style>'
+               '<g id="s0" class="c1">'
+               '<path d="M0 0L0 10L20 10Z" style="fill:#f00"/>'
+               '<path d="M30 0L30 10L50 10Z" style="fill:#f00"/>'
+               '</g><use xlink:href="#s0" x="0" y="50"/>')
+    out = optimize_svg(text)
+    ids = [el.get('id') for el in ET.fromstring(out).iter() if el.get('id')]
+    assert len(ids) == len(set(ids)) and 's0' in ids and 's1' in ids
+    assert [el.get('class') for el in elements(out, 'use')] == ['c2', 'c2', None]
+    assert_same_drawing(text, out)
@@ -0,0 +1,57 @@
+import json
+import os
+
+import milestone_timeline
+import timeline_gantt
+from watch import Watcher
+
+PLAN = {'title': 'plan', 'gantt': timeline_gantt.PLAN, 'milestone_timeline': milestone_timeline.PLAN}
+
+
+def write_plan(path, plan):
+    path.write_text(json.dumps(plan))
+    # A distinct mtime even on coarse file systems, so the poll sees the save
+    stamp = os.stat(path).st_mtime_ns + 10 ** 9
+    os.utime(path, ns=(stamp, stamp))
+
+
+def outputs(out_dir):
+    return sorted(os.listdir(out_dir))
+
+
+def test_removed_plans_and_sections_lose_their_charts(tmp_path, capsys):
+    plans, out = tmp_path / 'plans', tmp_path / 'out'
+    plans.mkdir()
+    write_plan(plans / 'a.json', PLAN)
+    write_plan(plans / 'b.json', {'gantt': timeline_gantt.PLAN})
+    watcher = Watcher(str(plans), str(out), gantt_backend='svg')
+    watcher.poll()
+    assert outputs(out) == ['a_gantt.svg', 'a_load.svg', 'a_milestone.svg', 'b_gantt.svg', 'b_load.svg']
+
+    write_plan(plans / 'a.json', {'milestone_timeline': milestone_timeline.PLAN})
+    watcher.poll()
+    assert outputs(out) == ['a_milestone.svg', 'b_gantt.svg', 'b_load.svg']
+    assert str(out / 'a_gantt.svg') not in watcher.keys
+
+    os.remove(plans / 'b.json')
+    assert watcher.poll() == []
+    assert outputs(out) == ['a_milestone.svg']
+    assert set(watcher.keys) == {str(out / 'a_milestone.svg')}
+    assert f"removed: {out / 'b_gantt.svg'}" in capsys.readouterr().out
+
+    # Bringing a section back renders it again
+    write_plan(plans / 'a.json', PLAN)
+    assert len(watcher.poll()) == 2
+    assert outputs(out) == ['a_gantt.svg', 'a_load.svg', 'a_milestone.svg']
+
+
+def test_charts_of_a_plan_with_the_same_stem_are_kept(tmp_path):
+    plans, out = tmp_path / 'plans', tmp_path / 'out'
+    plans.mkdir()
+    write_plan(plans / 'a.json', {'gantt': timeline_gantt.PLAN})
+    write_plan(plans / 'a.yml', {'gantt': timeline_gantt.PLAN})
+    watcher = Watcher(str(plans), str(out), gantt_backend='svg')
+    watcher.poll()
+    os.remove(plans / 'a.json')
+    watcher.poll()
+    assert outputs(out) == ['a_gantt.svg', 'a_load.svg']
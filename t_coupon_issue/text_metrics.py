@@ -0,0 +1,149 @@
+"""Glyph advance widths for label fitting.
+
+The chart font's advance widths are read once from the font file with
+fontTools and cached on disk as JSON, keyed on the file's path, size
+and mtime. Widths are in em, so a string's width in points is the sum
+of its advances times the font size.
+
+Labels get a prefix-sum width array (memoized per string), so the
+longest prefix that fits a given width is a binary search instead of
+re-measuring every candidate cut. wrap() breaks text into lines the
+same way and memoizes the result per (text, width, size), so the same
+card text is measured once per process however often it is laid out.
+
+The font is the first installed family of the chart's font chain (see
+fonts.py; found with fontTools, matplotlib is not imported). Characters
+it lacks, or every character when no chain font or fontTools is
+available, get the old CJK / non-CJK estimate.
+"""
+import bisect
+import functools
+import hashlib
+import itertools
+import json
+import os
+
+from profiling import span
+
+CACHE_DIR = os.path.join(
+    os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')),
+    'confluence-assets')
+
+# Fallback advances (em): text_width_est's 0.062 / 0.040 data units per
+# 8.5 pt character on the Gantt x-scale.
+_GANTT_PT_PER_UNIT = 1339.2 / 14.1
+FALLBACK_CJK = 0.062 * _GANTT_PT_PER_UNIT / 8.5
+FALLBACK_OTHER = 0.040 * _GANTT_PT_PER_UNIT / 8.5
+
+
+def _fallback_advance(ch):
+    return FALLBACK_CJK if ord(ch) > 0x2E7F else FALLBACK_OTHER
+
+
+def find_font_file():
+    """Path of the chart font's file: CHART_FONT_FILE, else the chain's first installed font.
+
+    None when no chain font can be found (or fontTools is missing).
+    """
+    env = os.environ.get('CHART_FONT_FILE')
+    if env:
+        return env
+    import fonts
+    found = fonts.resolve()
+    return found[0][1] if found else None
+
+
+def _read_advances(path):
+    """{codepoint: advance in em} for every glyph mapped in the font."""
+    from fontTools.ttLib import TTFont
+    font = TTFont(path, fontNumber=0, lazy=True)
+    upm = font['head'].unitsPerEm
+    hmtx = font['hmtx'].metrics
+    cmap = font.getBestCmap()
+    font.close()
+    return {cp: round(hmtx[glyph][0] / upm, 4) for cp, glyph in cmap.items()}
+
+
+def load_advances(path):
+    """Advance table for path, read from the disk cache when still valid."""
+    st = os.stat(path)
+    key = hashlib.sha1(f'{os.path.abspath(path)}:{st.st_size}:{st.st_mtime_ns}'.encode()).hexdigest()[:16]
+    cache_file = os.path.join(CACHE_DIR, f'glyph-widths-{key}.json')
+    try:
+        with open(cache_file, encoding='utf-8') as f:
+            return {int(cp): adv for cp, adv in json.load(f).items()}
+    except (OSError, ValueError):
+        pass
+
+    advances = _read_advances(path)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = f'{cache_file}.{os.getpid()}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(advances, f, separators=(',', ':'))
+    os.replace(tmp, cache_file)
+    return advances
+
+
+class GlyphWidths:
+    """Per-character advance widths (em) with memoized prefix sums."""
+
+    def __init__(self, advances=None):
+        self.advances = advances or {}
+        self.prefix_widths = functools.lru_cache(maxsize=4096)(self._prefix_widths)
+        self.wrap = functools.lru_cache(maxsize=4096)(self._wrap)
+
+    def char_width(self, ch):
+        adv = self.advances.get(ord(ch))
+        return adv if adv is not None else _fallback_advance(ch)
+
+    def _prefix_widths(self, text):
+        """Cumulative widths: [0, w(text[:1]), ..., w(text)] in em."""
+        return tuple(itertools.accumulate(map(self.char_width, text), initial=0.0))
+
+    def width(self, text, fontsize):
+        """Width of text in points."""
+        return self.prefix_widths(text)[-1] * fontsize
+
+    def fit(self, text, max_width, fontsize, suffix='..'):
+        """Longest cut >= 1 with width(text[:cut] + suffix) <= max_width, else 0."""
+        limit = max_width / fontsize - self.prefix_widths(suffix)[-1]
+        return max(bisect.bisect_right(self.prefix_widths(text), limit) - 1, 0)
+
+    def _wrap(self, text, max_width, fontsize):
+        """text broken into lines of at most max_width points, as a tuple.
+
+        Lines break at spaces; a word wider than a line (e.g. a long run
+        of Hangul without spaces) breaks between characters instead.
+        """
+        widths = self.prefix_widths(text)
+        limit = max_width / fontsize
+        lines = []
+        start, n = 0, len(text)
+        while start < n:
+            while start < n and text[start] == ' ':
+                start += 1
+            if start == n:
+                break
+            end = bisect.bisect_right(widths, widths[start] + limit) - 1
+            if end >= n:
+                lines.append(text[start:])
+                break
+            space = text.rfind(' ', start, end + 1)
+            if space > start:
+                end = space
+            lines.append(text[start:max(end, start + 1)].rstrip(' '))
+            start = max(end, start + 1)
+        return tuple(lines)
+
+
+@functools.lru_cache(maxsize=None)
+def chart_metrics():
+    """GlyphWidths for the chart font (heuristic fallback if unavailable)."""
+    path = find_font_file()
+    if path is None:
+        return GlyphWidths()
+    try:
+        with span('fonts.glyph_widths'):
+            return GlyphWidths(load_advances(path))
+    except ImportError:
+        return GlyphWidths()
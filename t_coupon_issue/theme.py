@@ -0,0 +1,41 @@
+"""Shared matplotlib theme for the chart scripts.
+
+setup_matplotlib() imports pyplot on the Agg backend, applies the
+rcParams and resolves the font chain (see fonts.py) once per process, so
+batch runs pay for the cold start a single time.
+"""
+import fonts
+from profiling import span
+
+HASH_SALT = 'confluence-assets'   # svg.hashsalt: clip-path/glyph ids from content, not uuid4
+
+_plt = None
+
+def setup_matplotlib():
+    """Return pyplot with the chart theme applied (cached per process)."""
+    global _plt
+    if _plt is None:
+        with span('matplotlib.import'):
+            import matplotlib
+            matplotlib.use('Agg')
+            import matplotlib.pyplot as plt
+            from matplotlib import font_manager
+
+        # ── Font & Global ──
+        # Register resolved files matplotlib hasn't listed, then pass only names it knows
+        with span('fonts.resolve'):
+            listed = {f.fname for f in font_manager.fontManager.ttflist}
+            for _, path in fonts.resolve():
+                if path not in listed:
+                    font_manager.fontManager.addfont(path)
+            known = {f.name for f in font_manager.fontManager.ttflist}
+            plt.rcParams['font.family'] = [f for f in fonts.families() if f in known] or [fonts.LAST_RESORT]
+        plt.rcParams['svg.fonttype'] = 'none'
+        plt.rcParams['axes.unicode_minus'] = False
+        plt.rcParams['svg.hashsalt'] = HASH_SALT
+
+        # Warm the font lookup cache so the first chart doesn't pay for it
+        with span('fonts.findfont'):
+            font_manager.findfont(font_manager.FontProperties(family=plt.rcParams['font.family']))
+        _plt = plt
+    return _plt
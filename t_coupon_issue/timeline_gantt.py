@@ -1,13 +1,16 @@
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-from matplotlib.patches import FancyBboxPatch
-import numpy as np
+import argparse
+import heapq
+import itertools
+import math
+import os
 
-# ── Font & Global ──
-plt.rcParams['font.family'] = 'Apple SD Gothic Neo'
-plt.rcParams['svg.fonttype'] = 'none'
-plt.rcParams['axes.unicode_minus'] = False
+import profiling
+from export import dpi_spec, export_figure, output_paths, parse_dpi, parse_formats
+from profiling import span, stages
+from schedule import critical_path
+from text_metrics import chart_metrics
+
+OUT_PATH = '/tmp/agent_c_gantt.svg'
 
 # ── Color System ──
 C = {
@@ -44,24 +47,20 @@ PHASE_TINTS = {
     '후속': '#f9fafb',            # gray-50
 }
 
-WEEK_LABELS = ['W1\n4/1', 'W2\n4/7', 'W3\n4/14', 'W4\n4/21', 'W5\n4/28',
-               'W6\n5/5', 'W7\n5/12', 'W8\n5/19', 'W9\n5/26', 'W10\n6/2']
-
 def w(n):
     """Convert week number to x position (W1=0)."""
     return n - 1
 
+# Points per x data unit on the 10-week chart (axes width / x-range)
+PT_PER_UNIT = 1339.2 / 14.1
+
 def text_width_est(text, fontsize=8.5):
-    """CJK-aware text width estimation in data units."""
-    total = 0
-    for ch in text:
-        if ord(ch) > 0x2E7F:
-            total += 0.062
-        else:
-            total += 0.040
-    return total * (fontsize / 8.5)
+    """Text width in data units, from the chart font's glyph advances."""
+    return chart_metrics().width(text, fontsize) / PT_PER_UNIT
 
 # ── Data ──
+# The critical path is kept by hand (sixth element): the planned dates
+# leave float that finish-to-start dependencies would report.
 phases = [
     {
         'name': 'P0 설계확정',
@@ -137,57 +136,152 @@ milestones = [
     ('M5', '삭제완료', 10, False),
 ]
 
-critical_tasks = {'벤치마크·리뷰', 'gate_keeper Lua', 'compensate·FF', 'MC통합',
-                  'Shadow운영', 'MC 100%전환', '인덱스6개삭제'}
+PLAN = {
+    'title': 't_coupon_issue INSERT 부하 개선',
+    'phases': phases,
+    'milestones': milestones,
+    'start': '2025-04-01',      # W1; week labels come from the calendar
+}
+
+def normalize_plan(plan):
+    """Fill defaults for a Gantt plan (e.g. one loaded from JSON/YAML).
+
+    'critical' is the set of (role, name) on the critical path, computed
+    from task dependencies (see schedule.py); plans without any still
+    name it by hand in 'critical_tasks' or the tasks' sixth element.
+
+    'capacity' ({role: MD per week}) is only read by the load histogram
+    (see role_load.py).
+
+    With a 'start' date (and optional 'holidays'), task starts/ends and
+    milestone weeks may be ISO dates, a task's end being its last working
+    day, and week_labels default to the calendar's (see plan_calendar.py).
+    Without one they default to plain W1..Wn.
+    """
+    phases, milestones = plan['phases'], plan.get('milestones', [])
+    cal = None
+    if plan.get('start'):
+        from plan_calendar import calendar_for
+        cal = calendar_for(plan)
+        phases, milestones = place_dates(cal, phases, milestones)
+    critical = plan.get('critical')
+    if critical is None:
+        critical = critical_path(phases, plan.get('critical_tasks', ()))
+    week_labels = plan.get('week_labels')
+    if week_labels is None:
+        n_weeks = plan_weeks(phases, milestones)
+        week_labels = cal.week_labels(n_weeks) if cal else [f'W{k}' for k in range(1, n_weeks + 1)]
+    return {
+        'title': plan.get('title', ''),
+        'phases': phases,
+        'milestones': milestones,
+        'critical': set(map(tuple, critical)),
+        'week_labels': week_labels,
+        'total_md': plan.get('total_md', sum(p['md'] for p in plan['phases'])),
+        'capacity': plan.get('capacity', {}),
+        'start': plan.get('start'),
+        'holidays': list(plan.get('holidays', ())),
+    }
+
+def plan_weeks(phases, milestones):
+    """Weeks needed to show every task bar and milestone."""
+    last_end = max((t[4] for p in phases for t in p['tasks']), default=2)
+    return max(math.ceil(last_end) - 1, max((m[2] for m in milestones), default=1), 1)
+
+def place_dates(cal, phases, milestones):
+    """phases and milestones with their ISO date fields turned into weeks.
+
+    Every date of the plan is converted in one vectorized call per field.
+    """
+    from plan_calendar import dates, is_date
+
+    starts = [t[3] for p in phases for t in p['tasks'] if is_date(t[3])]
+    ends = [t[4] for p in phases for t in p['tasks'] if is_date(t[4])]
+    marks = [m[2] for m in milestones if is_date(m[2])]
+    if not (starts or ends or marks):
+        return phases, milestones
+    start_week = dict(zip(starts, cal.weeks(starts).tolist()))
+    # an end date is the task's last working day: the bar runs to the day after
+    end_week = dict(zip(ends, cal.weeks(dates(ends) + 1).tolist()))
+    mark_week = dict(zip(marks, cal.week_of(marks).tolist()))
+
+    phases = [{**p, 'tasks': [(*t[:3], start_week.get(t[3], t[3]), end_week.get(t[4], t[4]), *t[5:])
+                              for t in p['tasks']]}
+              for p in phases]
+    milestones = [(*m[:2], mark_week.get(m[2], m[2]), *m[3:]) for m in milestones]
+    return phases, milestones
 
 # ── Build row layout ──
-def build_rows(phases):
-    rows = []
-    role_order = ['BE-1', 'BE-2', 'DBA', 'SRE', 'QA']
+ROLE_ORDER = ['BE-1', 'BE-2', 'DBA', 'SRE', 'QA']
+
+def pack_lanes(tasks):
+    """Pack tasks into the fewest sub-rows with no overlapping bars.
+
+    Interval partitioning over tasks sorted by start: a min-heap of busy
+    lanes keyed on end time and a min-heap of free lane indices. Each task
+    takes the lowest-numbered free lane, which is the lane the old
+    first-fit scan picked, in O(n log n) instead of O(n^2).
+
+    A zero-length bar (start == end) blocks nothing, and like in the scan
+    it may also go in a lane whose only running bars start with it.
+    """
+    lanes = []
+    busy = []       # (end, lane index)
+    free = []       # indices of lanes whose last task has ended
+    claimed = []    # lanes taken by bars starting at group_start
+    group_start = None
+    for t in sorted(tasks, key=lambda x: x[3]):
+        while busy and busy[0][0] <= t[3]:
+            heapq.heappush(free, heapq.heappop(busy)[1])
+        if t[3] != group_start:
+            group_start, claimed = t[3], []
+        if t[4] > t[3]:
+            i = heapq.heappop(free) if free else len(lanes)
+            heapq.heappush(busy, (t[4], i))
+            heapq.heappush(claimed, i)
+        else:
+            i = min(free[:1] + claimed[:1], default=len(lanes))
+            if i == len(lanes):
+                heapq.heappush(free, i)
+        if i == len(lanes):
+            lanes.append([])
+        lanes[i].append(t)
+    return lanes
+
+def iter_rows(phases):
+    """Gantt rows, phase by phase: one per packed lane of each role.
+
+    A generator, so a streaming renderer holds one phase's rows at a time.
+    """
     for phase in phases:
         role_tasks = {}
         for t in phase['tasks']:
             role_tasks.setdefault(t[0], []).append(t)
 
-        phase_row_start = len(rows)
+        first = True
+        # Known roles first, then any others in order of appearance
+        role_order = ROLE_ORDER + [r for r in role_tasks if r not in ROLE_ORDER]
         for role in role_order:
             if role not in role_tasks:
                 continue
-            tasks = role_tasks[role]
-            sub_rows = []
-            for t in sorted(tasks, key=lambda x: x[3]):
-                placed = False
-                for sr in sub_rows:
-                    if all(t[3] >= existing[4] or t[4] <= existing[3] for existing in sr):
-                        sr.append(t)
-                        placed = True
-                        break
-                if not placed:
-                    sub_rows.append([t])
-
+            sub_rows = pack_lanes(role_tasks[role])
             for i, sr in enumerate(sub_rows):
-                rows.append({
+                row = {
                     'role': role,
                     'role_label': role if i == 0 else '',
                     'tasks': sr,
                     'phase_name': phase['name'],
-                })
-
-        if len(rows) > phase_row_start:
-            rows[phase_row_start]['phase_start'] = True
-            rows[phase_row_start]['phase_data'] = phase
-
-    return rows
-
-all_rows = build_rows(phases)
-n_rows = len(all_rows)
+                }
+                if first:
+                    row['phase_start'] = True
+                    row['phase_data'] = phase
+                    first = False
+                yield row
 
-# ── Figure ──
-fig, ax = plt.subplots(figsize=(24, 16))
-fig.set_facecolor(C['bg'])
-ax.set_facecolor(C['bg'])
+def build_rows(phases):
+    return list(iter_rows(phases))
 
-# Layout
+# ── Layout ──
 HEADER_Y = 2.0          # y of header baseline
 ROW_H = 0.68
 BAR_H = 0.48
@@ -195,213 +289,393 @@ LEFT_COL_W = 1.6        # width for role labels
 CHART_LEFT = 0          # x=0 is W1 start
 CHART_RIGHT = 10.0      # x=10 is W10 end
 
-ax.set_xlim(-LEFT_COL_W - 0.5, CHART_RIGHT + 2.0)
-bottom_y = HEADER_Y - 0.8 - n_rows * ROW_H - 0.8
-ax.set_ylim(bottom_y, HEADER_Y + 1.8)
-ax.axis('off')
-
-# ── Title ──
-ax.text(-LEFT_COL_W, HEADER_Y + 1.4,
-        't_coupon_issue INSERT 부하 개선',
-        fontsize=22, fontweight='bold', color=C['text1'],
-        va='bottom', ha='left')
-ax.text(-LEFT_COL_W, HEADER_Y + 1.05,
-        'Implementation Gantt Chart',
-        fontsize=13, color=C['text2'], va='bottom', ha='left')
-
-total_md = sum(p['md'] for p in phases)
-ax.text(CHART_RIGHT + 1.3, HEADER_Y + 1.4,
-        f'Total {total_md} MD',
-        fontsize=14, fontweight='bold', color=C['text1'],
-        va='bottom', ha='right')
-ax.text(CHART_RIGHT + 1.3, HEADER_Y + 1.05,
-        '10 Weeks  /  5 Roles',
-        fontsize=11, color=C['text2'], va='bottom', ha='right')
-
-# ── Week column headers ──
-for i, label in enumerate(WEEK_LABELS):
-    x = i
-    # Alternating column shading (very subtle, full height)
-    if i % 2 == 0:
-        ax.fill_between([x, x + 1],
-                        HEADER_Y + 0.6, bottom_y + 0.5,
-                        color=C['divider_light'], alpha=0.5, zorder=0)
-    ax.text(x + 0.5, HEADER_Y + 0.25, label,
-            fontsize=9, color=C['text2'], ha='center', va='center',
-            fontweight='medium', linespacing=1.3)
-
-# Header bottom border
-ax.plot([-0.05, 10.05], [HEADER_Y - 0.05, HEADER_Y - 0.05],
-        color=C['divider'], linewidth=1.2, zorder=2)
-
-# ── Milestone diamonds at header ──
-for m_name, m_label, m_week, is_gate in milestones:
-    x = w(m_week) + 0.5
-    color = C['critical'] if is_gate else C['accent']
-    diamond_y = HEADER_Y + 0.7
-    ax.plot(x, diamond_y, marker='D', markersize=7, color=color,
-            markeredgecolor='white', markeredgewidth=1.5, zorder=5)
-    ax.text(x, diamond_y + 0.22, m_name,
-            fontsize=7.5, color=color, ha='center', va='bottom',
-            fontweight='bold')
-    # Subtle vertical line through entire chart
-    ax.plot([x, x], [HEADER_Y - 0.05, bottom_y + 0.5],
-            color=color, alpha=0.10, linestyle='--', linewidth=0.8, zorder=0)
-
-# ── Draw rows ──
-for idx, row in enumerate(all_rows):
-    y_center = HEADER_Y - 0.5 - idx * ROW_H
-    y_top = y_center + ROW_H / 2
-    y_bottom = y_center - ROW_H / 2
-
-    # Phase separator
-    if row.get('phase_start'):
-        pd = row['phase_data']
-        sep_y = y_top + 0.15
-        # Phase separator line
-        ax.plot([-LEFT_COL_W - 0.1, CHART_RIGHT + 1.3], [sep_y, sep_y],
-                color=C['divider'], linewidth=0.7, zorder=1)
-        # Phase name
-        ax.text(-LEFT_COL_W, sep_y + 0.04,
-                pd['name'],
-                fontsize=10.5, fontweight='bold', color=C['text1'],
-                va='bottom', ha='left')
-        # MD badge
-        if pd['md'] > 0:
-            md_x = -LEFT_COL_W + sum(0.11 if ord(c) > 0x2E7F else 0.07 for c in pd['name']) + 0.65
-            ax.text(md_x, sep_y + 0.04,
-                    f"{pd['md']} MD",
-                    fontsize=8.5, color=C['text3'],
-                    va='bottom', ha='left')
-
-    # Alternating row bg
-    if idx % 2 == 1:
-        ax.fill_between([-0.05, 10.05], y_top - 0.02, y_bottom + 0.02,
-                        color=C['row_alt'], alpha=0.4, zorder=0)
-
-    # Role label
-    if row['role_label']:
-        role = row['role']
-        ax.text(-0.15, y_center,
-                row['role_label'],
-                fontsize=9.5, fontweight='bold',
-                color=ROLE_COLORS.get(role, C['text2']),
-                va='center', ha='right')
-
-    # Task bars - sorted for collision detection
-    sorted_tasks = sorted(row['tasks'], key=lambda t: t[3])
-    for ti, task in enumerate(sorted_tasks):
-        role, name, md, start, end, _ = task
-        x_bar = w(start)
-        bar_width = end - start
-        color = ROLE_COLORS.get(role, C['accent'])
-        is_crit = name in critical_tasks
-
-        # Rounded bar
-        fancy = FancyBboxPatch(
-            (x_bar, y_center - BAR_H / 2),
-            bar_width, BAR_H,
-            boxstyle="round,pad=0,rounding_size=0.07",
-            facecolor=color, edgecolor='none', alpha=0.85, zorder=3
-        )
-        ax.add_patch(fancy)
-
-        # Build label
+# Figure size follows the plan so a data unit is the same size on every
+# chart; the reference 10-week, 25-row plan fills 24x16 in.
+REF_FIGSIZE = (24, 16)
+REF_SPAN = (14.1, 20.4)
+
+def x_limits(n_weeks):
+    return -LEFT_COL_W - 0.5, n_weeks + 2.0
+
+def y_limits(n_rows):
+    return chart_bottom(n_rows), HEADER_Y + 1.8
+
+def figure_size(n_weeks, n_rows):
+    """Figure (width, height) in inches for n_weeks columns and n_rows rows."""
+    (x0, x1), (y0, y1) = x_limits(n_weeks), y_limits(n_rows)
+    return (round(REF_FIGSIZE[0] * (x1 - x0) / REF_SPAN[0], 4),
+            round(REF_FIGSIZE[1] * (y1 - y0) / REF_SPAN[1], 4))
+
+def row_center(idx):
+    """y center of the idx-th row."""
+    return HEADER_Y - 0.5 - idx * ROW_H
+
+def chart_bottom(n_rows):
+    """Lowest y of the chart area (legend sits just above it)."""
+    return HEADER_Y - 0.8 - n_rows * ROW_H - 0.8
+
+def _row_labels(idx, row, critical, bars, items, outside):
+    """[(task, label)] for one row; appends its bars and outside labels to the lists."""
+    y_center = row_center(idx)
+    placed = []
+    for task in sorted(row['tasks'], key=lambda t: t[3]):
+        role, name, md, start, end = task[:5]
+        box = (w(start), y_center - BAR_H / 2, w(end), y_center + BAR_H / 2)
+        bars.append(box)
+        is_crit = (role, name) in critical
+
         md_str = ''
         if md > 0:
             md_val = int(md) if md == int(md) else md
             md_str = f' ({md_val})'
-
-        full_label = name + md_str
-        text_est = text_width_est(full_label, 8.5)
-
-        if bar_width >= text_est + 0.15:
-            # ── Text INSIDE bar ──
-            tx = x_bar + bar_width / 2
+        text = name + md_str
+        text_est = text_width_est(text, 8.5)
+        label = {'inside': end - start >= text_est + 0.15, 'text': text, 'text_est': text_est,
+                 'x': box[0] + (end - start) / 2, 'y': y_center, 'dot': None, 'leader': None}
+        if label['inside']:
             if is_crit:
-                dot_offset = text_est / 2 + 0.12
-                ax.text(tx - dot_offset, y_center, '\u25CF',
-                        fontsize=5, color=C['critical'],
-                        va='center', ha='center', zorder=4)
-            ax.text(tx, y_center, full_label,
-                    fontsize=8.5, color='white', va='center', ha='center',
-                    fontweight='medium', zorder=4)
+                label['dot'] = label['x'] - (text_est / 2 + 0.12)
         else:
-            # ── Text OUTSIDE bar (right) with collision detection ──
-            tx = x_bar + bar_width + 0.08
-            crit_offset = 0.12 if is_crit else 0
-
-            # Available space before next bar
-            if ti + 1 < len(sorted_tasks):
-                next_start = w(sorted_tasks[ti + 1][3])
-                avail = next_start - tx - crit_offset - 0.08
-            else:
-                avail = CHART_RIGHT + 1.5 - tx - crit_offset
-
-            display_label = full_label
-            label_w = text_width_est(full_label, 8)
-            if label_w > avail > 0.25:
-                for cut in range(len(full_label), 0, -1):
-                    candidate = full_label[:cut] + '..'
-                    if text_width_est(candidate, 8) <= avail:
-                        display_label = candidate
-                        break
-            elif avail <= 0.25:
-                display_label = ''
-
-            if display_label:
-                if is_crit:
-                    ax.text(tx, y_center, '\u25CF',
-                            fontsize=5, color=C['critical'],
-                            va='center', ha='left', zorder=4)
-                    tx += crit_offset
-                ax.text(tx, y_center, display_label,
-                        fontsize=8, color=C['text1'], va='center', ha='left',
-                        zorder=4,
-                        bbox=dict(boxstyle='round,pad=0.04', facecolor='white',
-                                  edgecolor='none', alpha=0.85))
-
-# ── Legend bar ──
-leg_y = bottom_y + 0.15
-leg_x = -LEFT_COL_W
-
-# Thin separator
-ax.plot([-LEFT_COL_W - 0.1, CHART_RIGHT + 1.3], [leg_y + 0.35, leg_y + 0.35],
-        color=C['divider'], linewidth=0.7, zorder=1)
-
-spacing = 1.5
-for i, (role, color) in enumerate(ROLE_COLORS.items()):
-    x_pos = leg_x + i * spacing
-    # Small rounded rect
-    r = FancyBboxPatch((x_pos, leg_y - 0.06), 0.28, 0.16,
-                       boxstyle="round,pad=0,rounding_size=0.04",
-                       facecolor=color, edgecolor='none', alpha=0.85, zorder=3)
-    ax.add_patch(r)
-    ax.text(x_pos + 0.36, leg_y + 0.02, role,
-            fontsize=9, color=C['text1'], va='center')
-
-# Critical path
-cp_x = leg_x + 5 * spacing + 0.3
-ax.text(cp_x, leg_y + 0.02, '\u25CF', fontsize=6, color=C['critical'],
-        va='center', ha='left')
-ax.text(cp_x + 0.14, leg_y + 0.02, 'Critical Path',
-        fontsize=9, color=C['text1'], va='center')
-
-# Milestone
-ml_x = cp_x + 1.6
-ax.plot(ml_x + 0.06, leg_y + 0.02, 'D', markersize=6,
-        color=C['accent'], markeredgecolor='white', markeredgewidth=1)
-ax.text(ml_x + 0.22, leg_y + 0.02, 'Milestone',
-        fontsize=9, color=C['text1'], va='center')
-
-# Gate
-gl_x = ml_x + 1.4
-ax.plot(gl_x + 0.06, leg_y + 0.02, 'D', markersize=6,
-        color=C['critical'], markeredgecolor='white', markeredgewidth=1)
-ax.text(gl_x + 0.22, leg_y + 0.02, 'GATE',
-        fontsize=9, color=C['text1'], va='center')
-
-plt.savefig('/tmp/agent_c_gantt.svg', format='svg', bbox_inches='tight',
-            facecolor=C['bg'], edgecolor='none', dpi=150)
-plt.close()
-print("OK: /tmp/agent_c_gantt.svg")
+            dot_w = 0.12 if is_crit else 0
+            items.append({'bar': box, 'width': dot_w + text_width_est(text, 8),
+                          'gutters': (y_center + ROW_H / 2, y_center - ROW_H / 2),
+                          'priority': 0 if is_crit else 1})
+            outside.append((label, dot_w))
+        placed.append((task, label))
+    return placed
+
+def _place_outside(bars, items, outside, milestones, chart_right):
+    """Fill in the outside labels' positions; returns place_labels' spots."""
+    from label_layout import place_labels
+
+    guides = [w(m[2]) + 0.5 for m in milestones]
+    spots = place_labels(bars, items, 0.0, chart_right + 1.5, guides)
+    for (label, dot_w), spot in zip(outside, spots):
+        if spot is None:
+            label['text'] = ''
+            continue
+        x0, y0, x1, y1 = spot['box']
+        if dot_w:
+            label['dot'] = x0
+        label['x'], label['y'], label['leader'] = x0 + dot_w, (y0 + y1) / 2, spot['leader']
+        if spot['mode'] == 'clipped':
+            cut = chart_metrics().fit(label['text'], (x1 - label['x']) * PT_PER_UNIT, 8, suffix='..')
+            label['text'] = label['text'][:cut] + '..' if cut else ''
+    return spots
+
+def bar_labels(all_rows, critical, milestones, chart_right=CHART_RIGHT):
+    """Where every bar's label goes: one [(task, label)] list per row, tasks by start.
+
+    A label that fits is drawn centred in its bar in white. The rest are
+    placed together by label_layout.place_labels: right or left of the
+    bar, in the gutter above or below with a leader line, or cut short.
+    label is {'inside', 'text', 'text_est', 'x', 'y', 'dot', 'leader'}:
+    x is the text's centre (inside) or left edge (outside), dot the x of
+    the critical-path marker or None, and text is '' when there is no room.
+    """
+    bars, items, outside = [], [], []
+    label_rows = [_row_labels(idx, row, critical, bars, items, outside)
+                  for idx, row in enumerate(all_rows)]
+    _place_outside(bars, items, outside, milestones, chart_right)
+    return label_rows
+
+LABEL_CHUNK = 256       # rows placed together by iter_bar_labels
+
+def iter_bar_labels(rows, critical, milestones, chart_right=CHART_RIGHT, chunk=LABEL_CHUNK):
+    """(row, [(task, label)]) for each row of an iterable, placed chunk rows at a time.
+
+    Labels only meet labels of another row in the gutter two rows share,
+    so each chunk is placed on its own, seeing the labels the previous
+    chunk left in the gutter above its first row. Memory is bounded by
+    the chunk, not the plan. Plans of at most chunk rows come out the
+    same as with bar_labels(); longer ones can differ where labels
+    compete for the shared gutter at a chunk boundary.
+    """
+    rows = iter(rows)
+    start, carry = 0, []
+    while True:
+        block = list(itertools.islice(rows, chunk))
+        if not block:
+            return
+        bars, items, outside = list(carry), [], []
+        label_rows = [_row_labels(start + i, row, critical, bars, items, outside)
+                      for i, row in enumerate(block)]
+        spots = _place_outside(bars, items, outside, milestones, chart_right)
+        start += len(block)
+        edge = row_center(start - 1) - BAR_H / 2
+        carry = [spot['box'] for spot in spots if spot is not None and spot['box'][1] < edge]
+        yield from zip(block, label_rows)
+
+# ── Render (matplotlib) ──
+def build_figure(plan=PLAN):
+    """Draw the Gantt chart for plan into a new matplotlib figure."""
+    from theme import setup_matplotlib
+    plt = setup_matplotlib()
+    from matplotlib.patches import FancyBboxPatch, Rectangle
+    from draw_batch import PatchBatch, TextLayer
+
+    stage = stages('gantt')
+    plan = normalize_plan(plan)
+    all_rows = build_rows(plan['phases'])
+    n_rows = len(all_rows)
+    critical = plan['critical']
+    chart_right = float(len(plan['week_labels']))
+    n_roles = len({t[0] for p in plan['phases'] for t in p['tasks']})
+    stage.mark('layout', rows=n_rows)
+
+    # ── Figure ──
+    n_weeks = len(plan['week_labels'])
+    fig, ax = plt.subplots(figsize=figure_size(n_weeks, n_rows))
+    fig.set_facecolor(C['bg'])
+    ax.set_facecolor(C['bg'])
+
+    ax.set_xlim(*x_limits(n_weeks))
+    bottom_y = chart_bottom(n_rows)
+    ax.set_ylim(*y_limits(n_rows))
+    ax.axis('off')
+
+    # Batched layers: one collection per z-level, one artist per text level
+    shading = PatchBatch(zorder=0)
+    bars = PatchBatch(zorder=3)
+    texts = TextLayer(ax, zorder=3)
+    labels = TextLayer(ax, zorder=4)
+
+    # ── Title ──
+    texts.text(-LEFT_COL_W, HEADER_Y + 1.4,
+               plan['title'],
+               fontsize=22, fontweight='bold', color=C['text1'],
+               va='bottom', ha='left')
+    texts.text(-LEFT_COL_W, HEADER_Y + 1.05,
+               'Implementation Gantt Chart',
+               fontsize=13, color=C['text2'], va='bottom', ha='left')
+
+    texts.text(chart_right + 1.3, HEADER_Y + 1.4,
+               f'Total {plan["total_md"]} MD',
+               fontsize=14, fontweight='bold', color=C['text1'],
+               va='bottom', ha='right')
+    texts.text(chart_right + 1.3, HEADER_Y + 1.05,
+               f'{len(plan["week_labels"])} Weeks  /  {n_roles} Roles',
+               fontsize=11, color=C['text2'], va='bottom', ha='right')
+
+    # ── Week column headers ──
+    for i, label in enumerate(plan['week_labels']):
+        x = i
+        # Alternating column shading (very subtle, full height)
+        if i % 2 == 0:
+            shading.add(Rectangle((x, bottom_y + 0.5), 1, HEADER_Y + 0.6 - (bottom_y + 0.5),
+                                  facecolor=C['divider_light'], edgecolor=C['divider_light'],
+                                  alpha=0.5))
+        texts.text(x + 0.5, HEADER_Y + 0.25, label,
+                   fontsize=9, color=C['text2'], ha='center', va='center',
+                   fontweight='medium', linespacing=1.3)
+
+    # Header bottom border
+    ax.plot([-0.05, chart_right + 0.05], [HEADER_Y - 0.05, HEADER_Y - 0.05],
+            color=C['divider'], linewidth=1.2, zorder=2)
+
+    # ── Milestone diamonds at header ──
+    for m_name, m_label, m_week, is_gate in plan['milestones']:
+        x = w(m_week) + 0.5
+        color = C['critical'] if is_gate else C['accent']
+        diamond_y = HEADER_Y + 0.7
+        ax.plot(x, diamond_y, marker='D', markersize=7, color=color,
+                markeredgecolor='white', markeredgewidth=1.5, zorder=5)
+        texts.text(x, diamond_y + 0.22, m_name,
+                   fontsize=7.5, color=color, ha='center', va='bottom',
+                   fontweight='bold')
+        # Subtle vertical line through entire chart
+        ax.plot([x, x], [HEADER_Y - 0.05, bottom_y + 0.5],
+                color=color, alpha=0.10, linestyle='--', linewidth=0.8, zorder=0)
+
+    stage.mark('header')
+
+    label_rows = bar_labels(all_rows, critical, plan['milestones'], chart_right)
+    stage.mark('labels')
+
+    # ── Draw rows, one span per phase ──
+    starts = [i for i, row in enumerate(all_rows) if row.get('phase_start')] + [n_rows]
+    for first, stop in zip(starts, starts[1:]):
+        with span('gantt.phase', phase=all_rows[first]['phase_data']['name'], rows=stop - first):
+            for idx in range(first, stop):
+                row = all_rows[idx]
+                y_center = row_center(idx)
+                y_top = y_center + ROW_H / 2
+                y_bottom = y_center - ROW_H / 2
+
+                # Phase separator
+                if row.get('phase_start'):
+                    pd = row['phase_data']
+                    sep_y = y_top + 0.15
+                    # Phase separator line
+                    ax.plot([-LEFT_COL_W - 0.1, chart_right + 1.3], [sep_y, sep_y],
+                            color=C['divider'], linewidth=0.7, zorder=1)
+                    # Phase name
+                    texts.text(-LEFT_COL_W, sep_y + 0.04,
+                               pd['name'],
+                               fontsize=10.5, fontweight='bold', color=C['text1'],
+                               va='bottom', ha='left')
+                    # MD badge
+                    if pd['md'] > 0:
+                        md_x = -LEFT_COL_W + sum(0.11 if ord(c) > 0x2E7F else 0.07 for c in pd['name']) + 0.65
+                        texts.text(md_x, sep_y + 0.04,
+                                   f"{pd['md']} MD",
+                                   fontsize=8.5, color=C['text3'],
+                                   va='bottom', ha='left')
+
+                # Alternating row bg
+                if idx % 2 == 1:
+                    shading.add(Rectangle((-0.05, y_bottom + 0.02), chart_right + 0.1,
+                                          (y_top - 0.02) - (y_bottom + 0.02),
+                                          facecolor=C['row_alt'], edgecolor=C['row_alt'], alpha=0.4))
+
+                # Role label
+                if row['role_label']:
+                    role = row['role']
+                    texts.text(-0.15, y_center,
+                               row['role_label'],
+                               fontsize=9.5, fontweight='bold',
+                               color=ROLE_COLORS.get(role, C['text2']),
+                               va='center', ha='right')
+
+                # Task bars, labels as placed by bar_labels()
+                for task, label in label_rows[idx]:
+                    role, name, md, start, end = task[:5]
+                    color = ROLE_COLORS.get(role, C['accent'])
+
+                    # Rounded bar
+                    fancy = FancyBboxPatch(
+                        (w(start), y_center - BAR_H / 2),
+                        end - start, BAR_H,
+                        boxstyle="round,pad=0,rounding_size=0.07",
+                        facecolor=color, edgecolor='none', alpha=0.85
+                    )
+                    bars.add(fancy)
+
+                    if label['inside']:
+                        # ── Text INSIDE bar ──
+                        if label['dot'] is not None:
+                            labels.text(label['dot'], y_center, '\u25CF',
+                                        fontsize=5, color=C['critical'],
+                                        va='center', ha='center')
+                        labels.text(label['x'], y_center, label['text'],
+                                    fontsize=8.5, color='white', va='center', ha='center',
+                                    fontweight='medium')
+                    elif label['text']:
+                        # ── Text OUTSIDE bar (right, left or in a gutter) ──
+                        if label['leader']:
+                            (lx0, ly0), (lx1, ly1) = label['leader']
+                            ax.plot([lx0, lx1], [ly0, ly1], color=C['text3'],
+                                    linewidth=0.6, zorder=4)
+                        if label['dot'] is not None:
+                            labels.text(label['dot'], label['y'], '\u25CF',
+                                        fontsize=5, color=C['critical'],
+                                        va='center', ha='left')
+                        labels.text(label['x'], label['y'], label['text'],
+                                    fontsize=8, color=C['text1'], va='center', ha='left',
+                                    bbox=dict(boxstyle='round,pad=0.04', facecolor='white',
+                                              edgecolor='none', alpha=0.85))
+
+    stage.mark('rows')
+
+    # ── Legend bar ──
+    leg_y = bottom_y + 0.15
+    leg_x = -LEFT_COL_W
+
+    # Thin separator
+    ax.plot([-LEFT_COL_W - 0.1, chart_right + 1.3], [leg_y + 0.35, leg_y + 0.35],
+            color=C['divider'], linewidth=0.7, zorder=1)
+
+    spacing = 1.5
+    for i, (role, color) in enumerate(ROLE_COLORS.items()):
+        x_pos = leg_x + i * spacing
+        # Small rounded rect
+        r = FancyBboxPatch((x_pos, leg_y - 0.06), 0.28, 0.16,
+                           boxstyle="round,pad=0,rounding_size=0.04",
+                           facecolor=color, edgecolor='none', alpha=0.85)
+        bars.add(r)
+        texts.text(x_pos + 0.36, leg_y + 0.02, role,
+                   fontsize=9, color=C['text1'], va='center')
+
+    # Critical path
+    cp_x = leg_x + 5 * spacing + 0.3
+    texts.text(cp_x, leg_y + 0.02, '\u25CF', fontsize=6, color=C['critical'],
+               va='center', ha='left')
+    texts.text(cp_x + 0.14, leg_y + 0.02, 'Critical Path',
+               fontsize=9, color=C['text1'], va='center')
+
+    # Milestone
+    ml_x = cp_x + 1.6
+    ax.plot(ml_x + 0.06, leg_y + 0.02, 'D', markersize=6,
+            color=C['accent'], markeredgecolor='white', markeredgewidth=1)
+    texts.text(ml_x + 0.22, leg_y + 0.02, 'Milestone',
+               fontsize=9, color=C['text1'], va='center')
+
+    # Gate
+    gl_x = ml_x + 1.4
+    ax.plot(gl_x + 0.06, leg_y + 0.02, 'D', markersize=6,
+            color=C['critical'], markeredgecolor='white', markeredgewidth=1)
+    texts.text(gl_x + 0.22, leg_y + 0.02, 'GATE',
+               fontsize=9, color=C['text1'], va='center')
+
+    stage.mark('legend')
+
+    # ── Batched layers onto the axes ──
+    shading.add_to(ax)
+    bars.add_to(ax)
+    for layer in (texts, labels):
+        ax.add_artist(layer)
+    stage.mark('layers')
+    stage.close()
+
+    return fig
+
+
+def render(plan=PLAN, out_path=OUT_PATH, formats=None, dpi=None):
+    """Draw the Gantt chart for plan with matplotlib; returns the paths written.
+
+    Saves out_path's format, or each of formats (see export.export_figure)
+    from the one figure.
+    """
+    from theme import setup_matplotlib
+    with span('gantt.build_figure'):
+        fig = build_figure(plan)
+    paths = export_figure(fig, out_path, formats, dpi, facecolor=C['bg'], edgecolor='none')
+    setup_matplotlib().close(fig)
+    return paths
+
+
+def render_formats(plan=PLAN, out_path=OUT_PATH, formats=None, dpi=None, backend='matplotlib'):
+    """render() with a choice of SVG backend; returns the paths written.
+
+    The direct 'svg' backend only writes SVG, so any other formats still
+    go through matplotlib.
+    """
+    formats = formats or parse_formats(os.path.splitext(out_path)[1].lstrip('.'))
+    paths = []
+    if backend == 'svg' and 'svg' in formats:
+        from gantt_svg import render_svg
+        svg_path = output_paths(out_path, ['svg'])[0]
+        render_svg(plan, svg_path)
+        paths.append(svg_path)
+        formats = [f for f in formats if f != 'svg']
+    if formats:
+        paths += render(plan, out_path, formats, dpi)
+    return paths
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Render the implementation Gantt chart.')
+    parser.add_argument('-o', '--output', default=OUT_PATH)
+    parser.add_argument('--backend', choices=['matplotlib', 'svg'], default='matplotlib',
+                        help="'svg' writes SVG directly without importing matplotlib")
+    parser.add_argument('-f', '--formats', type=parse_formats,
+                        help='comma-separated formats, e.g. svg,png,pdf (default: from -o)')
+    parser.add_argument('--dpi', action='append', type=dpi_spec, metavar='FMT=DPI',
+                        help='per-format resolution, e.g. png=300 (repeatable)')
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+
+    with profiling.session(args):
+        paths = render_formats(PLAN, args.output, args.formats, parse_dpi(args.dpi), args.backend)
+    for path in paths:
+        print(f"OK: {path}")
@@ -0,0 +1,171 @@
+"""Watch plan files and re-render their charts in one warm process.
+
+matplotlib, the theme and the font are set up once at start. The plan
+directory is then polled (stat only, no extra dependency). When a plan
+file changes, each chart it defines gets its build cache key computed
+again (see render_all.job_key). A chart is redrawn only when its key
+changed, so editing a task in 'phases' re-renders the Gantt chart and
+leaves the milestone timeline alone. Going back to an earlier version
+of a plan copies the files from the build cache instead of drawing.
+
+A plan that fails to load (say, saved half-way) or a chart that fails
+to draw is reported, its previous output is left in place, and the plan
+is picked up again on its next save. When a plan file is deleted, or a
+section is dropped from a plan, the charts it had are deleted too.
+
+    python watch.py plans/ -o out/ [--gantt-backend svg] [--optimize] [-f svg,png]
+"""
+import argparse
+import os
+import time
+
+from build_cache import CACHE_DIR, BuildCache
+from export import dpi_spec, output_paths, parse_dpi, parse_formats
+from render_all import find_plans, job_key, plan_jobs, render_job
+from svg_optimize import report
+from text_metrics import chart_metrics
+from theme import setup_matplotlib
+
+POLL_INTERVAL = 0.2     # seconds between directory scans
+
+
+def snapshot(plan_dir):
+    """{plan path: (mtime_ns, size)} for every plan file under plan_dir."""
+    stamps = {}
+    for path in find_plans(plan_dir):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            continue
+        stamps[path] = (st.st_mtime_ns, st.st_size)
+    return stamps
+
+
+class Watcher:
+    """Re-renders the charts of changed plan files, skipping unchanged charts."""
+
+    def __init__(self, plan_dir, out_dir, gantt_backend='matplotlib', precision=None,
+                 formats=('svg',), dpi=None, cache=None, embed_fonts=False):
+        self.plan_dir = plan_dir
+        self.out_dir = out_dir
+        self.opts = (gantt_backend, precision, tuple(formats), dpi, embed_fonts)
+        self.cache = cache
+        self.stamps = {}
+        self.keys = {}      # out_path -> key of the chart last written there
+        self.charts = {}    # plan path -> out_paths of the charts it defines
+        os.makedirs(out_dir, exist_ok=True)
+
+    def poll(self):
+        """Rebuild every plan changed since the last poll; returns the charts written."""
+        stamps = snapshot(self.plan_dir)
+        changed = [path for path, stamp in stamps.items() if self.stamps.get(path) != stamp]
+        for path in self.stamps.keys() - stamps.keys():
+            self.remove(self.charts.pop(path, ()))
+        self.stamps = stamps
+        written = []
+        for path in changed:
+            written += self.rebuild(path)
+        if written and self.cache is not None:
+            self.cache.evict()
+        return written
+
+    def rebuild(self, plan_path):
+        """Render the charts of plan_path whose key changed; returns [(paths, seconds, how)]."""
+        t0 = time.perf_counter()
+        try:
+            jobs = plan_jobs([plan_path], self.out_dir)
+            keys = {job: job_key(job, data, *self.opts) for job, data in jobs.items()}
+        except Exception as e:     # half-saved YAML/JSON, bad fields: wait for the next save
+            print(f"error: {plan_path}: {type(e).__name__}: {e}", flush=True)
+            return []
+        charts = {job[2] for job in jobs}
+        dropped = self.charts.get(plan_path, set()) - charts
+        self.charts[plan_path] = charts
+        self.remove(dropped)
+
+        written = []
+        for job, data in jobs.items():
+            out_path, key = job[2], keys[job]
+            if self.keys.get(out_path) == key:
+                continue
+            paths = output_paths(out_path, self.opts[2])
+            if self.cache is not None and self.cache.fetch(key, paths):
+                how, sizes = 'cached', None
+            else:
+                try:
+                    paths, _, sizes = render_job(job, data, *self.opts)
+                except Exception as e:     # e.g. a colour or date matplotlib rejects
+                    print(f"error: {plan_path}: {out_path}: {type(e).__name__}: {e}", flush=True)
+                    t0 = time.perf_counter()
+                    continue
+                how = 'rendered'
+                if self.cache is not None:
+                    self.cache.store(key, paths)
+            self.keys[out_path] = key
+            written.append((paths, time.perf_counter() - t0, how))
+            if sizes:
+                report(paths[0], *sizes)
+            t0 = time.perf_counter()
+        return written
+
+    def remove(self, out_paths):
+        """Delete the files of charts whose plan or section is gone.
+
+        A chart another plan still defines (same file stem) is kept.
+        """
+        kept = set().union(*self.charts.values())
+        for out_path in sorted(set(out_paths) - kept):
+            self.keys.pop(out_path, None)
+            removed = []
+            for path in output_paths(out_path, self.opts[2]):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    continue
+                removed.append(path)
+            if removed:
+                print(f"removed: {', '.join(removed)}", flush=True)
+
+    def run(self, interval=POLL_INTERVAL, once=False):
+        """Poll until interrupted (or one pass with once=True)."""
+        while True:
+            for paths, secs, how in self.poll():
+                print(f"OK: {', '.join(paths)} ({how}, {secs * 1000:.0f} ms)", flush=True)
+            if once:
+                return
+            time.sleep(interval)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Re-render charts whenever their plan files change.')
+    parser.add_argument('plan_dir')
+    parser.add_argument('-o', '--out-dir', default='/tmp/agent_c_charts')
+    parser.add_argument('--gantt-backend', choices=['matplotlib', 'svg'], default='matplotlib')
+    parser.add_argument('-f', '--formats', type=parse_formats, default=['svg'],
+                        help='comma-separated formats, e.g. svg,png,pdf (default: svg)')
+    parser.add_argument('--dpi', action='append', type=dpi_spec, metavar='FMT=DPI',
+                        help='per-format resolution, e.g. png=300 (repeatable)')
+    parser.add_argument('--optimize', action='store_true', help='optimize each SVG after rendering')
+    parser.add_argument('--precision', type=int, default=2,
+                        help='decimal places kept by --optimize (default: 2)')
+    parser.add_argument('--embed-fonts', action='store_true',
+                        help='inline subsets of the chart fonts into each SVG')
+    parser.add_argument('--cache-dir', default=CACHE_DIR)
+    parser.add_argument('--no-cache', action='store_true', help='never copy charts from the cache')
+    parser.add_argument('--interval', type=float, default=POLL_INTERVAL,
+                        help=f'seconds between scans (default: {POLL_INTERVAL})')
+    parser.add_argument('--once', action='store_true', help='render what is stale, then exit')
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    setup_matplotlib()
+    chart_metrics()
+    print(f"warm in {time.perf_counter() - t0:.2f}s; watching {args.plan_dir}", flush=True)
+    watcher = Watcher(args.plan_dir, args.out_dir, args.gantt_backend,
+                      args.precision if args.optimize else None, args.formats,
+                      parse_dpi(args.dpi), None if args.no_cache else BuildCache(args.cache_dir),
+                      args.embed_fonts)
+    try:
+        watcher.run(args.interval, args.once)
+    except KeyboardInterrupt:
+        pass